@@ -1,6 +1,7 @@
 import streamlit as st
-import base64
-import time
+from components.assets import set_page_bg
+from components.chrome import DATASCIENTIST_CHROME, EXPLORER_CHROME, HOME_CHROME, apply_chrome
+from components.navigation import play_entry_transition, record_time_to_interactive, start_transition
 from components.explorer import show_explorer_view
 from components.datascientist import show_datascientist_view
 
@@ -10,96 +11,19 @@ st.set_page_config(
     layout="wide"
 )
 
-st.markdown(
-    """
-    <style>
-    [data-testid="stSidebarNav"] { display: none !important; }
-    nav[aria-label="Page navigation"] { display: none !important; }
-    section[data-testid="stSidebar"] { display: none !important; }
-    [data-testid="collapsedControl"],
-    [data-testid="stSidebarCollapsedControl"],
-    [data-testid="sidebar-collapsed-control"],
-    button[title="Toggle sidebar"],
-    button[aria-label="Toggle sidebar"],
-    button[aria-label="Open sidebar"],
-    button[aria-label="Close sidebar"] { display: none !important; }
-    [data-testid="stToolbar"],
-    header [data-testid="baseButton-header"],
-    header [data-testid="baseLink-logo"] { display: none !important; }
-    [data-testid="stHeader"] { display: none !important; }
-    .block-container { padding-top: 0 !important; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-def set_page_bg(image_file):
-    with open(image_file, "rb") as f:
-        img_data = f.read()
-    b64_encoded = base64.b64encode(img_data).decode()
-    style = f"""
-        <style>
-        .stApp {{
-            background-image: url(data:image/jpeg;base64,{b64_encoded});
-            background-size: cover;
-        }}
-        </style>
-    """
-    st.markdown(style, unsafe_allow_html=True)
-
-
 if 'role' not in st.session_state:
     st.session_state.role = None
-if 'transitioning' not in st.session_state:
-    st.session_state.transitioning = False
 if 'transition_target' not in st.session_state:
     st.session_state.transition_target = None
-if 'transition_start' not in st.session_state:
-    st.session_state.transition_start = None
-if 'buttons_disabled' not in st.session_state:
-    st.session_state.buttons_disabled = False
 
 
 def set_role(role_name):
     st.session_state.role = role_name
 
 
-def start_transition(target_role: str):
-    """Begin the zoom-right transition before switching to target_role."""
-    st.session_state.transitioning = True
-    st.session_state.transition_target = target_role
-    st.session_state.transition_start = time.time()
-    st.session_state.buttons_disabled = True
-
-
-TRANSITION_DURATION_SEC = 0.85
-if st.session_state.transitioning:
-    set_page_bg("assets/backgrounds/home.jpeg")
-
-    st.markdown(
-        """
-        <style>
-        .stApp { 
-            animation: zoomRight 0.85s ease forwards; 
-            transform-origin: center right;
-        }
-        @keyframes zoomRight {
-            from { transform: scale(1) translateX(0); }
-            to { transform: scale(2) translateX(4vw); }
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    st.empty()
-
-    time.sleep(TRANSITION_DURATION_SEC)
+if st.session_state.transition_target:
     target = st.session_state.transition_target
-    st.session_state.transitioning = False
     st.session_state.transition_target = None
-    st.session_state.transition_start = None
-    st.session_state.buttons_disabled = False
 
     try:
         if target == 'explorer':
@@ -110,10 +34,10 @@ if st.session_state.transitioning:
             raise RuntimeError("Unknown target")
     except Exception:
         st.session_state.role = target
-        st.rerun()
 
-elif st.session_state.role is None:
-    set_page_bg("assets/backgrounds/home.jpeg")
+if st.session_state.role is None:
+    apply_chrome(HOME_CHROME)
+    set_page_bg("backgrounds/home.jpeg")
 
     st.markdown(
         "<h1 style='text-align:center; margin-top:10%; color:white; font-size:clamp(48px, 8vw, 120px);'>Exodetect</h1>",
@@ -149,84 +73,32 @@ elif st.session_state.role is None:
         unsafe_allow_html=True,
     )
 
-    st.markdown(
-        """
-        <style>
-        .stButton > button {
-            background: rgba(255,255,255,0.92) !important;
-            color: #0b1736 !important;
-            border: 1px solid rgba(6, 78, 59, 0.35) !important;
-            border-radius: 10px !important;
-            padding: 0.6rem 1rem !important;
-            font-weight: 600 !important;
-            box-shadow:
-                0 6px 16px rgba(6, 78, 59, 0.55),
-                0 2px 6px rgba(6, 78, 59, 0.35) !important;
-            backdrop-filter: blur(2px);
-            transition: transform .12s ease,
-                        box-shadow .12s ease,
-                        border-color .12s ease,
-                        background-color .12s ease !important;
-        }
-
-        .stButton > button:hover {
-            box-shadow:
-                0 8px 22px rgba(6, 78, 59, 0.65),
-                0 4px 10px rgba(6, 78, 59, 0.45) !important;
-            transform: translateY(-1px);
-        }
-
-        .stButton > button:active {
-            border-color: rgba(22, 163, 74, 0.8) !important;
-            box-shadow:
-                0 5px 12px rgba(6, 78, 59, 0.50),
-                0 2px 6px rgba(6, 78, 59, 0.35) !important;
-            transform: translateY(0) scale(0.99);
-        }
-
-        .stButton > button:focus,
-        .stButton > button:focus-visible {
-            outline: none !important;
-            border-color: rgba(34, 197, 94, 0.85) !important;
-            box-shadow:
-                0 0 0 3px rgba(34, 197, 94, 0.28),
-                0 10px 24px rgba(6, 78, 59, 0.30) !important;
-        }
-
-        .stButton > button:disabled,
-        .stButton > button[disabled] {
-            background: rgba(255,255,255,0.6) !important;
-            color: rgba(11,23,54,0.6) !important;
-            border-color: rgba(6, 78, 59, 0.25) !important;
-            box-shadow: none !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
     col1, col2, col3, col4 = st.columns([1, 2, 2, 1])
     with col2:
         st.button(
             "Data Scientist",
             on_click=start_transition,
             args=('datascientist',),
-            use_container_width=True,
-            disabled=st.session_state.buttons_disabled,
+            width="stretch",
         )
     with col3:
         st.button(
             "Explorer",
             on_click=start_transition,
             args=('explorer',),
-            use_container_width=True,
-            disabled=st.session_state.buttons_disabled,
+            width="stretch",
         )
 
 elif st.session_state.role == 'datascientist':
-    set_page_bg("assets/backgrounds/background.jpeg")
+    apply_chrome(DATASCIENTIST_CHROME)
+    set_page_bg("backgrounds/background.jpeg")
+    play_entry_transition()
     show_datascientist_view()
+    record_time_to_interactive()
 
 elif st.session_state.role == 'explorer':
-    set_page_bg("assets/backgrounds/background.jpeg")
+    apply_chrome(EXPLORER_CHROME)
+    set_page_bg("backgrounds/background.jpeg")
+    play_entry_transition()
     show_explorer_view()
+    record_time_to_interactive()
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+
+from components.assets import STATIC_DIR
+
+
+BUILD_DIR = os.path.join(STATIC_DIR, "_build")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+SOURCE_EXTENSIONS = (".jpeg", ".jpg", ".png")
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+_build_lock = threading.Lock()
+
+
+def content_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _avif_supported() -> bool:
+    from PIL import features
+
+    return bool(features.check("avif"))
+
+
+def source_assets() -> list:
+    """Asset names (relative to static/) of every source image, excluding build output."""
+    names = []
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != BUILD_DIR]
+        for file in files:
+            if file.lower().endswith(SOURCE_EXTENSIONS):
+                names.append(os.path.relpath(os.path.join(root, file), STATIC_DIR).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def build_variants(name: str, digest: str = None) -> dict:
+    """
+    Write downscaled WebP (and AVIF, when Pillow has it) variants of one
+    asset into static/_build/, named by content hash so unchanged images are
+    never re-encoded. Returns its manifest entry.
+    """
+    from PIL import Image
+
+    source = os.path.join(STATIC_DIR, name)
+    digest = digest or content_hash(source)
+    stem = os.path.splitext(name)[0].replace("/", "__")
+    formats = [("webp", WEBP_QUALITY)] + ([("avif", AVIF_QUALITY)] if _avif_supported() else [])
+    os.makedirs(BUILD_DIR, exist_ok=True)
+
+    with Image.open(source) as image:
+        width, height = image.size
+        image = image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+        widths = sorted({w for w in VARIANT_WIDTHS if w < width} | {width})
+        variants = []
+        for w in widths:
+            resized = None
+            for fmt, quality in formats:
+                file_name = f"{stem}-{digest}-{w}.{fmt}"
+                out = os.path.join(BUILD_DIR, file_name)
+                if not os.path.exists(out):
+                    if resized is None:
+                        h = max(1, round(height * w / width))
+                        resized = image if w == width else image.resize((w, h), Image.LANCZOS)
+                    tmp = f"{out}.tmp"
+                    resized.save(tmp, format=fmt.upper(), quality=quality)
+                    os.replace(tmp, out)
+                variants.append({
+                    "width": w,
+                    "format": fmt,
+                    "name": f"_build/{file_name}",
+                    "bytes": os.path.getsize(out),
+                })
+
+    return {"hash": digest, "width": width, "height": height, "variants": variants}
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_all(names: list = None) -> dict:
+    """Build variants for every source asset (or just `names`) and rewrite the manifest."""
+    with _build_lock:
+        manifest = load_manifest()
+        for name in names or source_assets():
+            digest = content_hash(os.path.join(STATIC_DIR, name))
+            if manifest.get(name, {}).get("hash") != digest:
+                manifest[name] = build_variants(name, digest)
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        tmp = f"{MANIFEST_PATH}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, MANIFEST_PATH)
+        return manifest
@@ -0,0 +1,174 @@
+import base64
+import html
+import json
+import mimetypes
+import os
+import threading
+
+import streamlit as st
+
+
+# Images live under static/, which Streamlit serves at app/static/ when
+# server.enableStaticServing is on (see .streamlit/config.toml). The browser
+# then fetches and caches each image once instead of receiving it inline.
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+
+
+def asset_path(name: str) -> str:
+    """Filesystem path of an asset, e.g. asset_path("backgrounds/home.jpeg")."""
+    return os.path.join(STATIC_DIR, name)
+
+
+@st.cache_resource(show_spinner=False)
+def _data_uri(path: str, mtime: float) -> str:
+    """Base64 data URI of a file, encoded once per process (per file version)."""
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def asset_url(name: str) -> str:
+    """
+    URL for an asset: a static-file reference when static serving is on,
+    otherwise a (process-cached) inline data URI.
+    """
+    if st.get_option("server.enableStaticServing"):
+        return f"{STATIC_URL}/{name}"
+    path = asset_path(name)
+    return _data_uri(path, os.path.getmtime(path))
+
+
+class _VariantIndex:
+    """
+    Built image variants (see components/asset_pipeline.py), checked against
+    the current sources once per process. Missing or stale entries are
+    rebuilt on a background thread; until then the originals are served.
+    """
+
+    def __init__(self):
+        from components.asset_pipeline import content_hash, load_manifest, source_assets
+
+        manifest = load_manifest()
+        stale = [n for n in source_assets() if manifest.get(n, {}).get("hash") != content_hash(asset_path(n))]
+        self.manifest = {n: entry for n, entry in manifest.items() if n not in stale}
+        if stale:
+            threading.Thread(target=self._build, args=(stale,), name="exo-asset-build", daemon=True).start()
+
+    def _build(self, names: list):
+        from components.asset_pipeline import build_all
+
+        try:
+            self.manifest = build_all(names)
+        except Exception:
+            pass
+
+
+@st.cache_resource(show_spinner=False)
+def _variant_index() -> _VariantIndex:
+    return _VariantIndex()
+
+
+def image_variants(name: str, fmt: str = "webp") -> list:
+    """[(width, url), ...] of the built variants of an asset in one format, narrowest first."""
+    if not st.get_option("server.enableStaticServing"):
+        return []
+    entry = _variant_index().manifest.get(name, {})
+    return sorted(
+        (v["width"], f"{STATIC_URL}/{v['name']}") for v in entry.get("variants", []) if v["format"] == fmt
+    )
+
+
+def smallest_variant(name: str, min_width: int, fmt: str = "webp") -> str:
+    """URL of the narrowest variant at least `min_width` px wide (the widest one if none is)."""
+    variants = image_variants(name, fmt)
+    if not variants:
+        return asset_url(name)
+    for width, url in variants:
+        if width >= min_width:
+            return url
+    return variants[-1][1]
+
+
+def srcset(name: str, fmt: str = "webp") -> str:
+    return ", ".join(f"{url} {width}w" for width, url in image_variants(name, fmt))
+
+
+def picture_html(name: str, alt: str = "", sizes: str = "100vw", attrs: str = "") -> str:
+    """
+    <picture> for an asset: AVIF/WebP srcsets the browser picks from by
+    rendered size, the original as fallback, and lazy loading.
+    """
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{srcset(name, fmt)}" sizes="{sizes}">'
+        for fmt in ("avif", "webp")
+        if image_variants(name, fmt)
+    )
+    return (
+        f'<picture>{sources}<img src="{asset_url(name)}" alt="{html.escape(alt)}" '
+        f'loading="lazy" decoding="async" {attrs}></picture>'
+    )
+
+
+def background_css(name: str, selector: str = ".stApp") -> str:
+    """
+    CSS that sets an asset as `selector`'s cover background, switching to
+    the smallest WebP variant that still covers the viewport (at 1x and 2x
+    pixel density) through media queries.
+    """
+    original = asset_url(name)
+    rules = [f"{selector} {{ background-image: url({original}); background-size: cover; }}"]
+    variants = image_variants(name)
+    if not variants:
+        return "\n".join(rules)
+
+    entry = _variant_index().manifest[name]
+    aspect = entry["height"] / entry["width"]
+
+    def image_set(viewport: int) -> str:
+        one_x = smallest_variant(name, viewport)
+        two_x = smallest_variant(name, 2 * viewport)
+        return f"image-set(url({one_x}) 1x, url({two_x}) 2x)"
+
+    rules.append(f"{selector} {{ background-image: {image_set(variants[-1][0])}; }}")
+    # "cover" needs the image to span both viewport axes, so a variant only
+    # qualifies when the viewport fits inside its width and scaled height.
+    for width, _ in reversed(variants[:-1]):
+        query = f"(max-width: {width}px) and (max-height: {int(width * aspect)}px)"
+        rules.append(f"@media {query} {{ {selector} {{ background-image: {image_set(width)}; }} }}")
+    return "\n".join(rules)
+
+
+def inject_head_style(style_id: str, css: str):
+    """
+    Put `css` into a <style id=...> in the page <head>, replacing any
+    previous content under that id. The style outlives the element that
+    injected it, so callers only need to send it again when it changes.
+    """
+    js_css = json.dumps(css).replace("</", "<\\/")
+    st.html(
+        f"""<script>
+        (function() {{
+          var el = document.getElementById("{style_id}");
+          if (!el) {{
+            el = document.createElement("style");
+            el.id = "{style_id}";
+            document.head.appendChild(el);
+          }}
+          el.textContent = {js_css};
+        }})();
+        </script>""",
+        unsafe_allow_javascript=True,
+    )
+
+
+def set_page_bg(name: str):
+    """Use an asset as the page background, sending CSS only when the background changes."""
+    try:
+        css = background_css(name)
+    except OSError:
+        return
+    if st.session_state.get("_page_bg") == css:
+        return
+    st.session_state["_page_bg"] = css
+    inject_head_style("exo-page-bg", css)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from components.backend import PAYLOAD_FIELDS
+from components.uncertainty import FIELD_BOUNDS
+
+
+# Local finite-difference attribution: each field is nudged by ±δ with the
+# others held at the candidate's values, all 2 x 12 payloads are scored in one
+# batched call, and fields are ranked by how far the model probability moves
+# across their interval.
+RELATIVE_STEP = 0.05
+MIN_STEP = 1e-3
+# a percentage of an epoch or a sky position is meaningless; these get a fixed step
+ABSOLUTE_STEPS = {"t0": 0.01, "ra_deg": 0.01, "dec_deg": 0.01}
+
+
+def field_step(field: str, value: float) -> float:
+    if field in ABSOLUTE_STEPS:
+        return ABSOLUTE_STEPS[field]
+    return max(RELATIVE_STEP * abs(value), MIN_STEP)
+
+
+def perturbed_rows(payload: dict) -> list:
+    """
+    Two payloads per field, in PAYLOAD_FIELDS order: the field at value - δ
+    and at value + δ, each end clipped to the field's physical range.
+    """
+    rows = []
+    for field in PAYLOAD_FIELDS:
+        value = float(payload[field])
+        step = field_step(field, value)
+        low, high = FIELD_BOUNDS[field]
+        rows.append({**payload, field: max(value - step, low)})
+        rows.append({**payload, field: min(value + step, high)})
+    return rows
+
+
+def attribute(payload: dict, responses: list, probability: float, threshold: float = 0.5) -> list:
+    """
+    Per-field sensitivity from the responses to perturbed_rows(payload),
+    largest |change| first: the probability at both ends, the change from
+    -δ to +δ, and whether either end crosses `threshold` relative to the
+    candidate's own `probability`. Fields whose payloads failed sort last.
+    """
+    rows = perturbed_rows(payload)
+    entries = []
+    for i, field in enumerate(PAYLOAD_FIELDS):
+        ends = [r.get("probability", np.nan) if "error" not in r else np.nan for r in responses[2 * i:2 * i + 2]]
+        entries.append({
+            "field": field,
+            "value": float(payload[field]),
+            "low": rows[2 * i][field],
+            "high": rows[2 * i + 1][field],
+            "p_low": ends[0],
+            "p_high": ends[1],
+            "change": ends[1] - ends[0],
+            "flips": any(np.isfinite(p) and (p >= threshold) != (probability >= threshold) for p in ends),
+        })
+    return sorted(entries, key=lambda e: -abs(e["change"]) if np.isfinite(e["change"]) else np.inf)
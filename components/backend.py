@@ -0,0 +1,185 @@
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from components.cache import MODEL_VERSION, get_prediction_cache, payload_key
+from components.fanout import FANOUT_CONCURRENCY, map_concurrent
+from components.singleflight import get_single_flight
+
+
+HTTP_POOL_SIZE = int(os.environ.get("EXODETECT_HTTP_POOL_SIZE", "16"))
+HTTP_RETRIES = int(os.environ.get("EXODETECT_HTTP_RETRIES", "3"))
+HTTP_BACKOFF_SEC = float(os.environ.get("EXODETECT_HTTP_BACKOFF_SEC", "0.3"))
+
+PREDICT_TIMEOUT_SEC = 30
+
+PAYLOAD_FIELDS = (
+    "period_days",
+    "t0",
+    "duration_hours",
+    "transit_depth_ppm",
+    "radius_earth",
+    "teq_K",
+    "S_earth",
+    "teff_star_K",
+    "logg_cgs",
+    "rstar_rsun",
+    "ra_deg",
+    "dec_deg",
+)
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session(pool_size: int = max(HTTP_POOL_SIZE, FANOUT_CONCURRENCY)) -> requests.Session:
+    """
+    One keep-alive session per process, shared by every Streamlit session.
+    Connections to the tunnel are pooled, so repeated submits skip the
+    TCP/TLS handshake. Only idempotent methods are retried, with backoff.
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_SEC,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def build_headers(api_token: str = "") -> dict:
+    headers = {"Content-Type": "application/json"}
+    if api_token:
+        headers["X-API-Key"] = api_token
+    return headers
+
+
+def post_predict(api_url: str, payload: dict, headers: dict, timeout: float = PREDICT_TIMEOUT_SEC) -> dict:
+    """POST one candidate to /predict and return the decoded JSON response."""
+    resp = get_http_session().post(
+        f"{api_url.rstrip('/')}/predict", json=payload, headers=headers, timeout=timeout
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _send(breaker, fn, *args, **kwargs):
+    """One request, through the endpoint's circuit breaker when there is one."""
+    return breaker.call(fn, *args, **kwargs) if breaker is not None else fn(*args, **kwargs)
+
+
+def predict(api_url: str, payload: dict, headers: dict, model_version: str = MODEL_VERSION,
+            cache_scope: str = None, breaker=None) -> dict:
+    """
+    Score one candidate, answering from the persistent prediction cache when
+    possible. Responses are cached under `cache_scope` (default: the URL), so
+    replicas of one backend can share entries. Requests that do go out are
+    counted by `breaker` (a CircuitBreaker), if given.
+    """
+    key = payload_key(payload, cache_scope or api_url, model_version)
+    cached = get_prediction_cache().get(key)
+    if cached is not None:
+        return cached
+    return _fetch_shared(api_url, payload, headers, key, breaker=breaker)
+
+
+def _fetch_shared(api_url: str, payload: dict, headers: dict, key: str,
+                  timeout: float = PREDICT_TIMEOUT_SEC, breaker=None) -> dict:
+    """
+    Call /predict once per distinct key across all sessions: concurrent
+    identical payloads wait on the in-flight request and share its response,
+    which the caller that sent it also writes to the cache.
+    """
+    def fetch():
+        data = _send(breaker, post_predict, api_url, payload, headers, timeout=timeout)
+        get_prediction_cache().put(key, data)
+        return data
+
+    return get_single_flight().do(key, fetch)
+
+
+# Backends we already know have no /predict_batch route (404/405), so later
+# chunks go straight to the per-row fallback instead of probing again.
+_NO_BATCH_ENDPOINT = set()
+
+
+def post_predict_batch(api_url: str, rows: list, headers: dict, timeout: float = PREDICT_TIMEOUT_SEC) -> list:
+    """
+    POST a chunk of candidates to /predict_batch as {"rows": [...]}.
+    Returns one response dict per row, in order.
+    """
+    resp = get_http_session().post(
+        f"{api_url.rstrip('/')}/predict_batch", json={"rows": rows}, headers=headers, timeout=timeout
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    results = data.get("results", []) if isinstance(data, dict) else data
+    if len(results) != len(rows):
+        raise ValueError(f"/predict_batch returned {len(results)} results for {len(rows)} rows")
+    return results
+
+
+def predict_rows(api_url: str, rows: list, headers: dict, model_version: str = MODEL_VERSION,
+                 cache_scope: str = None, breaker=None) -> list:
+    """
+    Score a chunk of candidates. Cached rows are answered locally; the rest
+    go out in one /predict_batch round trip, falling back to one /predict
+    call per row when the backend has no batch route. Per-row failures are
+    returned as {"error": "..."} entries and are not cached. `breaker` counts
+    every request, so in the fallback a dead backend opens it after a few
+    rows and the rest of the chunk is refused without waiting out timeouts.
+    """
+    cache = get_prediction_cache()
+    keys = [payload_key(row, cache_scope or api_url, model_version) for row in rows]
+    results = cache.get_many(keys, count_misses=True)
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    base = api_url.rstrip("/")
+    if base not in _NO_BATCH_ENDPOINT:
+        try:
+            fresh = _send(breaker, post_predict_batch, api_url, [rows[i] for i in pending], headers)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in (404, 405):
+                raise
+            _NO_BATCH_ENDPOINT.add(base)
+        else:
+            for i, response in zip(pending, fresh):
+                results[i] = response
+                if "error" not in response:
+                    cache.put(keys[i], response)
+            return results
+
+    fresh = predict_many(api_url, [rows[i] for i in pending], headers, [keys[i] for i in pending], breaker=breaker)
+    for i, response in zip(pending, fresh):
+        results[i] = response
+    return results
+
+
+def predict_many(api_url: str, rows: list, headers: dict, keys: list,
+                 concurrency: int = FANOUT_CONCURRENCY, timeout: float = PREDICT_TIMEOUT_SEC, breaker=None) -> list:
+    """
+    One /predict call per row, many in flight at once; results come back in
+    row order. Rows go through the shared single-flight layer (and land in
+    the cache) under `keys`, which the caller builds with payload_key for its
+    model version and cache scope.
+    """
+    return map_concurrent(
+        lambda item: _fetch_shared(api_url, item[0], headers, item[1], timeout=timeout, breaker=breaker),
+        list(zip(rows, keys)),
+        concurrency=concurrency,
+        timeout=timeout,
+    )
@@ -0,0 +1,149 @@
+import csv
+import math
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from components.backend import PAYLOAD_FIELDS
+from components.physics import derive_quantities
+from components.prescreen import describe, prescreen
+from components.skyindex import get_sky_index
+
+
+BATCH_CHUNK_ROWS = 500
+# scored results are spooled to CSV files here; files older than the TTL
+# (left behind by ended sessions) are removed whenever a new one is started
+BATCH_SPOOL_DIR = os.environ.get("EXODETECT_BATCH_SPOOL_DIR", ".cache/batch_results")
+BATCH_SPOOL_TTL_SEC = float(os.environ.get("EXODETECT_BATCH_SPOOL_TTL_SEC", str(24 * 3600)))
+
+DERIVED_COLUMNS = ("period_days", "transit_depth_ppm", "S_earth", "duration_hours")
+
+KNOWN_COLUMNS = ("known_match", "known_sep_arcsec")
+
+RESULT_COLUMNS = ("row", "probability", "threshold", "verdict", "error", "prescreen") + tuple(
+    f"derived_{c}" for c in DERIVED_COLUMNS
+) + KNOWN_COLUMNS
+
+
+def iter_candidate_chunks(uploaded_file, chunk_rows: int = BATCH_CHUNK_ROWS):
+    """
+    Yield DataFrames of at most `chunk_rows` candidates with exactly the
+    payload columns, reading CSV or Parquet incrementally so only one chunk
+    is ever parsed into memory.
+    """
+    name = getattr(uploaded_file, "name", "") or ""
+    if name.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(uploaded_file)
+        missing = [c for c in PAYLOAD_FIELDS if c not in pf.schema_arrow.names]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        for record_batch in pf.iter_batches(batch_size=chunk_rows, columns=list(PAYLOAD_FIELDS)):
+            yield record_batch.to_pandas()
+        return
+
+    reader = pd.read_csv(uploaded_file, chunksize=chunk_rows)
+    for chunk in reader:
+        missing = [c for c in PAYLOAD_FIELDS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        yield chunk[list(PAYLOAD_FIELDS)]
+
+
+def numeric_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a chunk to float64; blank or non-numeric cells become 0.0, like untouched form fields."""
+    return chunk.apply(pd.to_numeric, errors="coerce").astype("float64").fillna(0.0)
+
+
+def chunk_to_payloads(chunk: pd.DataFrame) -> list:
+    """Convert a numeric chunk into /predict payload dicts."""
+    return chunk.to_dict(orient="records")
+
+
+def derived_rows(chunk: pd.DataFrame) -> list:
+    """Physics-derived quantities for every row of a numeric chunk, computed column-wise."""
+    derived = derive_quantities(chunk)
+    return pd.DataFrame({f"derived_{c}": derived[c] for c in DERIVED_COLUMNS}).to_dict(orient="records")
+
+
+def known_rows(chunk: pd.DataFrame) -> list:
+    """Nearest known planet or KOI within the cross-match radius of every row, from one vectorized search."""
+    names, seps = get_sky_index().nearest_matches(chunk["ra_deg"].to_numpy(), chunk["dec_deg"].to_numpy())
+    return [{"known_match": name, "known_sep_arcsec": float(sep)} for name, sep in zip(names, seps)]
+
+
+def prescreen_flags(chunk: pd.DataFrame, tolerances: dict) -> list:
+    """Per-row pre-screen findings for a numeric chunk; empty string where the row is consistent."""
+    screen = prescreen(chunk, tolerances)
+    flags = [""] * len(chunk)
+    for i in screen["inconsistent"].nonzero()[0]:
+        flags[i] = describe(screen, i)
+    return flags
+
+
+def result_row(row_index: int, response: dict, flag: str = "") -> dict:
+    """Flatten one backend response (or a local pre-screen rejection) into a results-table row."""
+    if "error" in response:
+        return {"row": row_index, "probability": math.nan, "threshold": math.nan,
+                "verdict": "error", "error": response["error"], "prescreen": flag}
+    if "probability" not in response and flag:
+        return {"row": row_index, "probability": math.nan, "threshold": math.nan,
+                "verdict": "Inconsistent", "error": "", "prescreen": flag}
+    probability = float(response.get("probability", 0.0))
+    threshold = float(response.get("threshold", 0.5))
+    verdict = "Promising" if probability >= threshold else "Unlikely"
+    return {"row": row_index, "probability": probability, "threshold": threshold,
+            "verdict": verdict, "error": "", "prescreen": flag}
+
+
+def new_spool_path(previous: str = None) -> str:
+    """
+    A fresh results file in BATCH_SPOOL_DIR. The session's `previous` file
+    and any file past BATCH_SPOOL_TTL_SEC are deleted first.
+    """
+    os.makedirs(BATCH_SPOOL_DIR, exist_ok=True)
+    cutoff = time.time() - BATCH_SPOOL_TTL_SEC
+    for entry in os.scandir(BATCH_SPOOL_DIR):
+        try:
+            if entry.path == previous or entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:  # removed by another session meanwhile
+            pass
+    fd, path = tempfile.mkstemp(prefix="exodetect-batch-", suffix=".csv", dir=BATCH_SPOOL_DIR)
+    os.close(fd)
+    return path
+
+
+def read_spool(path: str) -> bytes:
+    """A results file's contents (empty if it has been pruned)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+
+class ResultSpool:
+    """Append-only CSV of batch results on disk, so scored rows never pile up in session memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.promising = 0
+        self.errors = 0
+        self.skipped = 0
+        self.known = 0
+        with open(self.path, "w", newline="") as f:
+            csv.DictWriter(f, fieldnames=RESULT_COLUMNS).writeheader()
+
+    def extend(self, rows: list):
+        with open(self.path, "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=RESULT_COLUMNS).writerows(rows)
+        self.rows += len(rows)
+        self.promising += sum(r["verdict"] == "Promising" for r in rows)
+        self.errors += sum(r["verdict"] == "error" for r in rows)
+        self.skipped += sum(r["verdict"] == "Inconsistent" for r in rows)
+        self.known += sum(bool(r.get("known_match")) for r in rows)
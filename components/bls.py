@@ -0,0 +1,213 @@
+import numpy as np
+
+
+# Box Least Squares (Kovacs, Zucker & Mazeh 2002) transit search.
+#
+# The light curve is first averaged onto a uniform time grid, so folding one
+# trial period costs one pass over the grid whatever the cadence. A coarse
+# pass scans a log-spaced period grid on bins as wide as a work budget
+# requires; the strongest distinct peaks are then searched again on a fine
+# grid, with bins a fraction of the transit duration, around their coarse period.
+
+DEFAULT_DURATIONS_HOURS = (1.0, 1.5, 2.0, 3.0, 4.5, 6.0, 8.0, 10.0, 13.0)
+MIN_PERIOD_DAYS = 0.5
+MIN_TRANSITS = 3
+MAX_DUTY_CYCLE = 0.15
+COARSE_BUDGET = 1.5e8  # (trial period x grid cell) folds in the coarse pass
+COARSE_BOX_STEP = 0.25  # coarse pass starts a box every quarter of its length
+REFINE_PEAKS = 5
+FINE_PERIODS = 300
+FINE_BINS_PER_DURATION = 6
+_CHUNK_CELLS = 4_000_000
+
+
+def _grid(t, flux, inv_var, dt):
+    """
+    Average a light curve onto bins of width `dt` (days from t[0]). Returns
+    (bin times relative to t[0], normalised weight, weight x mean-subtracted
+    flux) for the bins that hold data.
+    """
+    weights = inv_var / inv_var.sum()
+    residual = flux - np.dot(weights, flux)
+    index = ((t - t[0]) / dt).astype("int64")
+    w = np.bincount(index, weights=weights)
+    wy = np.bincount(index, weights=weights * residual)
+    keep = w > 0
+    times = (np.arange(len(w)) + 0.5) * dt
+    return times[keep], w[keep], wy[keep]
+
+
+def _fold_chunk(times, w, wy, periods, dt, durations_bins, shortest, box_step):
+    """
+    BLS for a chunk of trial periods at once: fold every grid cell into phase
+    bins of width `dt` with one bincount, then slide a box of each duration
+    over the wrapped phase profile using cumulative sums, starting a box every
+    `box_step` of its length (1 = every phase bin). `shortest` is the shortest
+    requested duration each box length stands for, which is what the duty
+    cycle limit applies to when bins are wider than a transit.
+    Returns per period: (power, depth, mid-transit phase in days, duration in days).
+    """
+    n_periods = len(periods)
+    rows = np.arange(n_periods)
+    n_phase = np.ceil(periods / dt).astype("int64")
+    offsets = np.concatenate([[0], np.cumsum(n_phase)[:-1]])
+
+    # floor-based modulo: same bins as np.mod, several times faster
+    phase = times[None, :] * (1.0 / periods)[:, None]
+    phase -= np.floor(phase)
+    phase *= (periods / dt)[:, None]
+    phase_bin = phase.astype("int64")
+    np.minimum(phase_bin, n_phase[:, None] - 1, out=phase_bin)
+    phase_bin += offsets[:, None]
+    total = int(n_phase.sum())
+    prof_w = np.bincount(phase_bin.ravel(), weights=np.tile(w, n_periods), minlength=total)
+    prof_wy = np.bincount(phase_bin.ravel(), weights=np.tile(wy, n_periods), minlength=total)
+
+    k_max = int(durations_bins.max())
+    width = int(n_phase.max())
+    # each period's profile followed by its first k_max bins again (wrap-around), padded to a common width
+    gather = offsets[:, None] + np.mod(np.arange(width + k_max)[None, :], n_phase[:, None])
+    cum_w = np.zeros((n_periods, width + k_max + 1))
+    cum_wy = np.zeros((n_periods, width + k_max + 1))
+    np.cumsum(prof_w[gather], axis=1, out=cum_w[:, 1:])
+    np.cumsum(prof_wy[gather], axis=1, out=cum_wy[:, 1:])
+    padding = np.arange(width)[None, :] >= n_phase[:, None]
+
+    best_power = np.zeros(n_periods)
+    best_depth = np.zeros(n_periods)
+    best_mid = np.zeros(n_periods)
+    best_duration = np.zeros(n_periods)
+    for k, duration in zip(durations_bins, shortest):
+        stride = max(1, int(k * box_step))
+        r = cum_w[:, k:k + width:stride] - cum_w[:, :width:stride]
+        s = cum_wy[:, k:k + width:stride] - cum_wy[:, :width:stride]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            power = np.where((s < 0) & (r > 0) & (r < 1), s * s / (r * (1.0 - r)), 0.0)
+        power[padding[:, ::stride] | (duration > MAX_DUTY_CYCLE * periods)[:, None]] = 0.0
+        j = power.argmax(axis=1)
+        p = power[rows, j]
+        better = p > best_power
+        if not better.any():
+            continue
+        r_j, s_j = r[rows, j][better], s[rows, j][better]
+        best_power[better] = p[better]
+        best_depth[better] = -s_j / (r_j * (1.0 - r_j))
+        best_mid[better] = np.mod((j[better] * stride + k / 2.0) * dt, periods[better])
+        best_duration[better] = k * dt
+    return best_power, best_depth, best_mid, best_duration
+
+
+def _scan(times, w, wy, periods, dt, durations_days, box_step=0.0):
+    """BLS power and best box for every trial period, in memory-bounded chunks."""
+    durations_days = np.sort(np.asarray(durations_days, dtype="float64"))
+    box_bins = np.maximum(np.round(durations_days / dt).astype("int64"), 1)
+    durations_bins, first = np.unique(box_bins, return_index=True)
+    shortest = durations_days[first]
+    per_period = len(times) + int(np.ceil(periods.max() / dt) + durations_bins.max()) * 4
+    rows = max(1, _CHUNK_CELLS // per_period)
+    out = [np.zeros(len(periods)) for _ in range(4)]
+    for start in range(0, len(periods), rows):
+        chunk = periods[start:start + rows]
+        for column, values in zip(out, _fold_chunk(times, w, wy, chunk, dt, durations_bins, shortest, box_step)):
+            column[start:start + len(chunk)] = values
+    return out
+
+
+def _distinct_peaks(grid, power, count, min_separation):
+    """Indices of the `count` highest peaks at least `min_separation` apart on `grid`."""
+    chosen = []
+    for i in np.argsort(power)[::-1]:
+        if power[i] <= 0 or len(chosen) == count:
+            break
+        if all(abs(grid[i] - grid[c]) >= min_separation for c in chosen):
+            chosen.append(i)
+    return chosen
+
+
+def bls_search(time, flux, flux_err=None, period_min: float = MIN_PERIOD_DAYS, period_max: float = None,
+               durations_hours=DEFAULT_DURATIONS_HOURS, coarse_budget: float = COARSE_BUDGET) -> dict:
+    """
+    Find the strongest box-shaped dip in a light curve (time in days, flux
+    normalised to ~1). Returns the best period, mid-transit epoch (in the
+    input time system), duration, depth and SNR, plus the coarse periodogram.
+    """
+    time = np.asarray(time, dtype="float64")
+    flux = np.asarray(flux, dtype="float64")
+    ok = np.isfinite(time) & np.isfinite(flux)
+    if flux_err is not None:
+        flux_err = np.asarray(flux_err, dtype="float64")
+        ok &= np.isfinite(flux_err) & (flux_err > 0)
+    t, f, sigma = time, flux, flux_err
+    # stored light curves are already clean and sorted: use them as they are
+    if not ok.all():
+        t, f = t[ok], f[ok]
+        sigma = sigma[ok] if sigma is not None else None
+    if np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind="stable")
+        t, f = t[order], f[order]
+        sigma = sigma[order] if sigma is not None else None
+    if len(t) < 10:
+        raise ValueError("Need at least 10 valid points for a transit search.")
+    if sigma is None:
+        # robust per-point scatter when no uncertainties are given
+        sigma = np.full(len(f), 1.4826 * np.median(np.abs(f - np.median(f))) or 1e-6)
+    inv_var = 1.0 / sigma ** 2
+
+    baseline = t[-1] - t[0]
+    period_max = min(period_max or np.inf, baseline / MIN_TRANSITS)
+    if period_max <= period_min:
+        raise ValueError(f"Light curve spans {baseline:.2f} days, too short for periods above {period_min} days.")
+    durations = np.asarray(durations_hours, dtype="float64") / 24.0
+    cadence = float(np.median(np.diff(t))) if len(t) > 1 else durations[0]
+
+    # coarse pass: a log period grid whose steps drift the phase by one time bin
+    # across the baseline, with bins as fine as the budget allows -- cadence for
+    # a TESS sector, a few hours for four years of Kepler
+    span = np.log(period_max / period_min)
+    dt_coarse = max(cadence, baseline * np.sqrt(span / coarse_budget))
+    times, w, wy = _grid(t, f, inv_var, dt_coarse)
+    n_coarse = int(max(200, np.ceil(span * baseline / dt_coarse)))
+    log_periods = np.linspace(np.log(period_min), np.log(period_max), n_coarse)
+    coarse_periods = np.exp(log_periods)
+    coarse_power, _, _, coarse_duration = _scan(
+        times, w, wy, coarse_periods, dt_coarse, durations, box_step=COARSE_BOX_STEP
+    )
+
+    # fine pass around the best distinct coarse peaks, at up to twice the coarse duration
+    best = None
+    fine_grids = {}
+    step = log_periods[1] - log_periods[0]
+    for i in _distinct_peaks(log_periods, coarse_power, REFINE_PEAKS, 3 * step):
+        near = durations[durations <= max(coarse_duration[i], dt_coarse) * 2.0]
+        near = near if len(near) else durations
+        dt_fine = max(cadence, near.min() / FINE_BINS_PER_DURATION)
+        if dt_fine not in fine_grids:
+            fine_grids[dt_fine] = _grid(t, f, inv_var, dt_fine)
+        times, w, wy = fine_grids[dt_fine]
+        # enough periods that the phase drifts by at most half a fine bin across the baseline
+        n_fine = int(np.clip(3 * step / (dt_fine / (2.0 * baseline)), 20, FINE_PERIODS))
+        periods = np.exp(log_periods[i] + np.linspace(-1.5 * step, 1.5 * step, n_fine))
+        periods = periods[(periods >= period_min) & (periods <= period_max)]
+        power, depth, mid, duration = _scan(times, w, wy, periods, dt_fine, near)
+        j = int(power.argmax())
+        if best is None or power[j] > best["power"]:
+            best = {"power": float(power[j]), "period": float(periods[j]), "depth": float(depth[j]),
+                    "mid": float(mid[j]), "duration": float(duration[j])}
+    if best is None or best["power"] <= 0:
+        raise ValueError("No transit-like dip found.")
+
+    period = best["period"]
+    in_transit = np.abs(np.mod(t - t[0] - best["mid"] + period / 2.0, period) - period / 2.0) < best["duration"] / 2.0
+    r = inv_var[in_transit].sum() / inv_var.sum()
+    depth_err = np.sqrt(1.0 / (inv_var.sum() * r * (1.0 - r))) if 0 < r < 1 else np.inf
+    n_transits = len(np.unique(np.floor((t[in_transit] - t[0] - best["mid"]) / period + 0.5)))
+    return {
+        "period_days": period,
+        "t0": t[0] + best["mid"],
+        "duration_hours": best["duration"] * 24.0,
+        "depth_ppm": best["depth"] * 1e6,
+        "snr": best["depth"] / depth_err,
+        "n_transits": n_transits,
+        "periods": coarse_periods,
+        "power": coarse_power,
+    }
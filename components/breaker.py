@@ -0,0 +1,138 @@
+import os
+import threading
+from time import monotonic
+
+import requests
+import streamlit as st
+
+
+# Circuit breaker per backend endpoint, shared by every session: after
+# BREAKER_FAILURES consecutive failed calls the circuit opens and calls are
+# refused on the spot instead of each waiting out a timeout; after
+# BREAKER_RESET_SEC one trial call is let through (half-open), and its outcome
+# closes the circuit or opens it for another period.
+BREAKER_FAILURES = int(os.environ.get("EXODETECT_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SEC = float(os.environ.get("EXODETECT_BREAKER_RESET_SEC", "30"))
+# gateway errors from a tunnel whose backend is gone: the endpoint failed, not the request
+FAILOVER_STATUS = (502, 503, 504, 530)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+def endpoint_failed(error: Exception) -> bool:
+    """Whether a call's exception means the endpoint is failing (unreachable, timed out, gateway error)."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.exceptions.HTTPError) and getattr(response, "status_code", None) in FAILOVER_STATUS
+
+
+class CircuitBreaker:
+    """Closed / open / half-open state machine for one endpoint."""
+
+    def __init__(self, url: str, failures: int = BREAKER_FAILURES, reset_sec: float = BREAKER_RESET_SEC):
+        self.url = url
+        self.max_failures = failures
+        self.reset_sec = reset_sec
+        self.failures = 0  # consecutive
+        self.opened_at = None
+        self.trial = False  # a half-open trial call is in flight
+        self.rejected = 0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if monotonic() - self.opened_at >= self.reset_sec else "open"
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_sec - (monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one trial call at a time does."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial:
+                self.trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.max_failures:
+                if self.opened_at is None:
+                    self.trips += 1
+                self.opened_at = monotonic()
+            self.trial = False
+
+    def skip(self) -> bool:
+        """True (counting the refusal) while the circuit is open; a half-open trial is left to call()."""
+        with self._lock:
+            if self.state != "open":
+                return False
+            self.rejected += 1
+            return True
+
+    def open_error(self) -> CircuitOpenError:
+        return CircuitOpenError(f"{self.url} is failing; calls are paused for {self.retry_in():.0f}s (circuit open)")
+
+    def check(self):
+        """allow(), raising CircuitOpenError when the call may not go out."""
+        if not self.allow():
+            raise self.open_error()
+
+    def call(self, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) as one request to this endpoint: refused while
+        the circuit is open, counted as a failure when the endpoint failed
+        and as a success when it answered (even with an error).
+        """
+        self.check()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if endpoint_failed(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+
+class CircuitBreakers:
+    """One breaker per endpoint URL, created on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        url = url.strip().rstrip("/")
+        with self._lock:
+            if url not in self._breakers:
+                self._breakers[url] = CircuitBreaker(url)
+            return self._breakers[url]
+
+
+@st.cache_resource(show_spinner=False)
+def get_circuit_breakers() -> CircuitBreakers:
+    """Process-wide breakers shared by every session."""
+    return CircuitBreakers()
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+
+CACHE_PATH = os.environ.get("EXODETECT_CACHE_PATH", ".cache/predictions.sqlite3")
+CACHE_TTL_SEC = float(os.environ.get("EXODETECT_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.environ.get("EXODETECT_CACHE_MAX_ENTRIES", "50000"))
+MODEL_VERSION = os.environ.get("EXODETECT_MODEL_VERSION", "default")
+# eviction (a TTL delete plus a count) runs every this many puts or seconds,
+# not on each put; reads skip expired entries in between
+CACHE_EVICT_EVERY = 1000
+CACHE_EVICT_INTERVAL_SEC = 60.0
+
+
+def _canonical_value(value):
+    """Round numbers to the form's %.5f precision so equal-looking inputs share a key."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if not math.isfinite(number):
+        return str(number)
+    text = f"{number:.5f}"
+    return "0.00000" if text == "-0.00000" else text
+
+
+def payload_key(payload: dict, api_url: str, model_version: str = MODEL_VERSION) -> str:
+    """Stable cache key for a payload scored by a given backend and model version."""
+    canonical = {
+        "url": api_url.rstrip("/"),
+        "model": model_version,
+        "payload": {k: _canonical_value(v) for k, v in payload.items()},
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """
+    SQLite-backed store of /predict responses that survives restarts.
+    Entries expire after `ttl_sec`; beyond `max_entries` the least recently
+    read ones are evicted (checked every CACHE_EVICT_EVERY puts, so the
+    table can briefly run that far over). Hit/miss counters are kept for
+    this process.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl_sec: float = CACHE_TTL_SEC,
+                 max_entries: int = CACHE_MAX_ENTRIES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0  # since the last eviction
+        self._evicted = time.monotonic()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL without an fsync per put: a crash loses at most the last few entries
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions(accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS predictions_created ON predictions(created)")
+
+    def get(self, key: str):
+        """Return the cached response dict, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM predictions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_sec:
+                if row is not None:
+                    self._db.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE predictions SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def get_many(self, keys: list, count_misses: bool = False, chunk: int = 500) -> list:
+        """
+        Cached responses for many keys (None where absent or expired), a few
+        hundred keys per query. Misses are counted only with `count_misses`:
+        a caller that only peeks leaves them to whoever scores those rows.
+        """
+        now = time.time()
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), chunk):
+                part = unique[start:start + chunk]
+                marks = ",".join("?" * len(part))
+                rows = self._db.execute(
+                    f"SELECT key, response FROM predictions WHERE key IN ({marks}) AND created >= ?",
+                    (*part, now - self.ttl_sec),
+                ).fetchall()
+                found.update(rows)
+                if rows:
+                    self._db.execute(
+                        f"UPDATE predictions SET accessed = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        (now, *(key for key, _ in rows)),
+                    )
+            hits = sum(key in found for key in keys)
+            self.hits += hits
+            if count_misses:
+                self.misses += len(keys) - hits
+        return [json.loads(found[key]) if key in found else None for key in keys]
+
+    def put(self, key: str, response: dict):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO predictions (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now),
+            )
+            self._puts += 1
+            if self._puts >= CACHE_EVICT_EVERY or time.monotonic() - self._evicted >= CACHE_EVICT_INTERVAL_SEC:
+                self._evict()
+
+    def _evict(self):
+        self._puts = 0
+        self._evicted = time.monotonic()
+        self._db.execute("DELETE FROM predictions WHERE created < ?", (time.time() - self.ttl_sec,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM predictions")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count}
+
+
+@st.cache_resource(show_spinner=False)
+def get_prediction_cache() -> PredictionCache:
+    """Process-wide cache instance shared by every session."""
+    return PredictionCache()
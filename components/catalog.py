@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# Planets shown in the Explorer gallery. The shipped file holds the featured
+# planets; tools/import_catalog.py merges them into a full NASA Exoplanet
+# Archive export (5,000+ confirmed planets).
+CATALOG_PATH = os.environ.get("EXODETECT_CATALOG_PATH", os.path.join("data", "planets.csv"))
+TEXT_COLUMNS = ("name", "host", "title", "method", "image", "summary")
+NUMERIC_COLUMNS = ("disc_year", "radius_earth", "period_days", "teq_K", "ra_deg", "dec_deg")
+CATALOG_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+
+@st.cache_resource(show_spinner=False)
+def load_catalog(path: str, mtime: float) -> pd.DataFrame:
+    """
+    The catalog, parsed once per process (per file version) and shared by
+    every session, so callers must treat it as read-only.
+    """
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    for column in CATALOG_COLUMNS:
+        if column not in df:
+            df[column] = "" if column in TEXT_COLUMNS else np.nan
+    for column in NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    df = df[list(CATALOG_COLUMNS)].reset_index(drop=True)
+    df["search_text"] = (df["name"] + " " + df["host"]).str.lower()
+    return df
+
+
+def get_catalog(path: str = CATALOG_PATH) -> pd.DataFrame:
+    return load_catalog(path, os.path.getmtime(path))
+
+
+def search(catalog: pd.DataFrame, query: str) -> pd.DataFrame:
+    """Rows whose planet or host name contains every word of `query` (case-insensitive)."""
+    mask = np.ones(len(catalog), dtype=bool)
+    for word in query.lower().split():
+        mask &= catalog["search_text"].str.contains(word, regex=False).to_numpy()
+    return catalog[mask]
@@ -0,0 +1,198 @@
+import json
+import re
+
+import streamlit as st
+
+
+# Page chrome shared by app.py and the pages. Each stylesheet is minified
+# once per process and written into the document <head> at most once per
+# page, instead of being re-sent as a <style> element on every rerun.
+
+BASE_CSS = """
+[data-testid="stSidebarNav"] { display: none !important; }
+nav[aria-label="Page navigation"] { display: none !important; }
+[data-testid="stToolbar"],
+header [data-testid="baseButton-header"],
+header [data-testid="baseLink-logo"] { display: none !important; }
+[data-testid="stHeader"] { display: none !important; }
+.block-container { padding-top: 0 !important; }
+"""
+
+# Home and Explorer have no use for the sidebar; the Data Scientist page
+# keeps it for its backend controls.
+NO_SIDEBAR_CSS = """
+section[data-testid="stSidebar"] { display: none !important; }
+[data-testid="collapsedControl"],
+[data-testid="stSidebarCollapsedControl"],
+[data-testid="sidebar-collapsed-control"],
+button[title="Toggle sidebar"],
+button[aria-label="Toggle sidebar"],
+button[aria-label="Open sidebar"],
+button[aria-label="Close sidebar"] { display: none !important; }
+"""
+
+HOME_BUTTONS_CSS = """
+.stButton > button {
+    background: rgba(255,255,255,0.92) !important;
+    color: #0b1736 !important;
+    border: 1px solid rgba(6, 78, 59, 0.35) !important;
+    border-radius: 10px !important;
+    padding: 0.6rem 1rem !important;
+    font-weight: 600 !important;
+    box-shadow:
+        0 6px 16px rgba(6, 78, 59, 0.55),
+        0 2px 6px rgba(6, 78, 59, 0.35) !important;
+    backdrop-filter: blur(2px);
+    transition: transform .12s ease,
+                box-shadow .12s ease,
+                border-color .12s ease,
+                background-color .12s ease !important;
+}
+
+.stButton > button:hover {
+    box-shadow:
+        0 8px 22px rgba(6, 78, 59, 0.65),
+        0 4px 10px rgba(6, 78, 59, 0.45) !important;
+    transform: translateY(-1px);
+}
+
+.stButton > button:active {
+    border-color: rgba(22, 163, 74, 0.8) !important;
+    box-shadow:
+        0 5px 12px rgba(6, 78, 59, 0.50),
+        0 2px 6px rgba(6, 78, 59, 0.35) !important;
+    transform: translateY(0) scale(0.99);
+}
+
+.stButton > button:focus,
+.stButton > button:focus-visible {
+    outline: none !important;
+    border-color: rgba(34, 197, 94, 0.85) !important;
+    box-shadow:
+        0 0 0 3px rgba(34, 197, 94, 0.28),
+        0 10px 24px rgba(6, 78, 59, 0.30) !important;
+}
+
+.stButton > button:disabled,
+.stButton > button[disabled] {
+    background: rgba(255,255,255,0.6) !important;
+    color: rgba(11,23,54,0.6) !important;
+    border-color: rgba(6, 78, 59, 0.25) !important;
+    box-shadow: none !important;
+}
+"""
+
+EXPLORER_CSS = """
+.title-container {
+  height: 85vh;
+  display: flex;
+  flex-direction: column;
+  align-items: center;
+  justify-content: center;
+  text-align: center;
+}
+.big-title {
+  font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
+  font-size: 3.5rem;
+  font-weight: 100;
+  letter-spacing: 2px;
+  color: white;
+  text-shadow: 0 2px 8px rgba(0,0,0,0.7);
+  margin: 0;
+  padding: 0;
+}
+.subtitle {
+  font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
+  font-size: 1.1rem;
+  font-weight: 300;
+  color: rgba(255, 255, 255, 0.8);
+  margin-top: 10px;
+  margin-bottom: 40px;
+}
+[data-testid="stExpander"] {
+  border: none;
+  box-shadow: 0 2px 8px rgba(0,0,0,0.3);
+}
+[data-testid="stExpander"] > details > summary {
+  background-color: #1a1a2e;
+  color: #ffffff;
+  border-radius: 10px;
+}
+[data-testid="stExpander"] > details > div {
+  background-color: #0e1117;
+  border-radius: 0 0 10px 10px;
+  padding: 1rem;
+}
+
+.exo-divider {
+  height: 3px;
+  border: 0;
+  margin: .25rem 0 1rem 0;
+  border-radius: 999px;
+  background: linear-gradient(
+    90deg,
+    rgba(16,185,129,0) 0%,
+    rgba(16,185,129,1) 15%,
+    rgba(5,150,105,1) 50%,
+    rgba(16,185,129,1) 85%,
+    rgba(16,185,129,0) 100%
+  );
+  box-shadow: 0 0 10px rgba(16,185,129,.35);
+}
+"""
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+STYLESHEETS = {
+    "exo-base": minify_css(BASE_CSS),
+    "exo-no-sidebar": minify_css(NO_SIDEBAR_CSS),
+    "exo-home-buttons": minify_css(HOME_BUTTONS_CSS),
+    "exo-explorer": minify_css(EXPLORER_CSS),
+}
+
+HOME_CHROME = ("exo-base", "exo-no-sidebar", "exo-home-buttons")
+EXPLORER_CHROME = ("exo-base", "exo-no-sidebar", "exo-explorer")
+DATASCIENTIST_CHROME = ("exo-base",)
+
+
+def apply_chrome(sheets: tuple):
+    """
+    Make exactly `sheets` (ids from STYLESHEETS) active for the current page.
+    Only sheets the browser doesn't have yet are sent and sheets left over
+    from the previous page are removed; when nothing changed, nothing is sent.
+    """
+    active = st.session_state.get("_chrome_sheets", ())
+    if tuple(sheets) == active:
+        return
+    st.session_state["_chrome_sheets"] = tuple(sheets)
+    added = {sid: STYLESHEETS[sid] for sid in sheets if sid not in active}
+    js_keep = json.dumps(list(sheets))
+    js_added = json.dumps(added).replace("</", "<\\/")
+    st.html(
+        f"""<script>
+        (function() {{
+          var keep = {js_keep}, added = {js_added};
+          document.querySelectorAll("style[data-exo-chrome]").forEach(function(el) {{
+            if (keep.indexOf(el.id) < 0) el.remove();
+          }});
+          Object.keys(added).forEach(function(id) {{
+            var el = document.getElementById(id);
+            if (!el) {{
+              el = document.createElement("style");
+              el.id = id;
+              el.setAttribute("data-exo-chrome", "");
+              document.head.appendChild(el);
+            }}
+            el.textContent = added[id];
+          }});
+        }})();
+        </script>""",
+        unsafe_allow_javascript=True,
+    )
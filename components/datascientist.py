@@ -1,75 +1,74 @@
 import streamlit as st
-import math
+import os
+from functools import partial
+from time import monotonic
 import requests
+import numpy as np
+import pandas as pd
+import altair as alt
+
+from components.backend import PAYLOAD_FIELDS
+from components.cache import MODEL_VERSION, get_prediction_cache
+from components.health import BACKEND_URLS, HEALTH_INTERVAL_SEC, get_health_monitor
+from components.predictors import LOCAL_MODEL_PATH, LocalPredictor, RateLimitedPredictor, RoutedPredictor
+from components.breaker import get_circuit_breakers
+from components.ratelimit import get_global_bucket, get_session_bucket
+from components.singleflight import get_single_flight
+from components.batch import (
+    ResultSpool, chunk_to_payloads, derived_rows, iter_candidate_chunks, known_rows, new_spool_path, numeric_chunk,
+    prescreen_flags, read_spool, result_row,
+)
+from components.attribution import RELATIVE_STEP, attribute, perturbed_rows
+from components.bls import bls_search
+from components.detrend import DETREND_WINDOW_DAYS, detrend
+from components.lcstore import get_light_curve_store
+from components.lightcurve import read_light_curve
+from components.phasefold import transit_view
+from components.physics import derive_quantities
+from components.uncertainty import (
+    MC_DRAWS, MC_MAX_DRAWS, draw_samples, probability_distribution, propagate, sample_rows,
+)
+from components.sweep import SWEEP_MAX_STEPS, Sweep
+from components.skyindex import CROSSMATCH_RADIUS_ARCSEC, get_sky_index
+from components.prescreen import (
+    CHECK_LABELS, DEFAULT_TOLERANCES, PRESCREEN_MODES, describe, get_prescreen_stats, prescreen,
+)
+
+
+FORM_FIELDS = [
+    ("Orbital period (days)",               dict(min_value=0.0, step=0.1,  format="%.5f", key="P_days")),
+    ("Transit epoch (e.g., BJD_TDB)",       dict(step=0.1,                 format="%.5f", key="t0")),
+    ("Transit duration (hours)",            dict(min_value=0.0, step=0.1,  format="%.5f", key="dur_hours")),
+    ("Transit depth (ppm)",                 dict(min_value=0.0, step=10.0, format="%.5f", key="depth_val")),
+    ("Planetary radius (Earth radii)",      dict(min_value=0.0, step=0.1,  format="%.5f", key="Rp_Re")),
+    ("Equilibrium temperature (K)",         dict(min_value=0.0, step=10.0, format="%.5f", key="Teq_K")),
+    ("Earth flux",                          dict(min_value=0.0, step=0.1,  format="%.5f", key="S_earth")),
+    ("Stellar effective temperature (K)",   dict(min_value=0.0, step=10.0, format="%.5f", key="Teff_K")),
+    ("Stellar surface gravity log g (cgs)", dict(min_value=0.0, step=0.01, format="%.5f", key="logg")),
+    ("Stellar radius (Solar radii)",        dict(min_value=0.0, step=0.01, format="%.5f", key="Rstar_Rsun")),
+    ("Right ascension (deg, 0–360)",        dict(min_value=0.0, max_value=360.0, step=0.1, format="%.5f", key="RA_deg")),
+    ("Declination (deg, -90–+90)",          dict(min_value=-90.0, max_value=90.0, step=0.1, format="%.5f", key="Dec_deg")),
+]
+
+# form widget key -> payload field
+FORM_KEYS = {
+    "P_days": "period_days",
+    "t0": "t0",
+    "dur_hours": "duration_hours",
+    "depth_val": "transit_depth_ppm",
+    "Rp_Re": "radius_earth",
+    "Teq_K": "teq_K",
+    "S_earth": "S_earth",
+    "Teff_K": "teff_star_K",
+    "logg": "logg_cgs",
+    "Rstar_Rsun": "rstar_rsun",
+    "RA_deg": "ra_deg",
+    "Dec_deg": "dec_deg",
+}
+# payload field -> form label
+FIELD_LABELS = {FORM_KEYS[kwargs["key"]]: label for label, kwargs in FORM_FIELDS}
 
 
-G_cgs = 6.67430e-8             # cm^3 g^-1 s^-2
-R_sun_cm = 6.957e10            # cm
-R_sun_AU = 0.00465047          # AU
-M_sun_g = 1.98847e33           # g
-sigma_sb_cgs = 5.670374419e-5  # erg cm^-2 s^-1 K^-4
-T_sun_K = 5772.0
-
-def _stellar_mass_from_logg_R(logg_cgs: float, R_solar: float) -> float:
-    """Return stellar mass in solar masses from log g (cgs) and radius in solar radii."""
-    g = 10 ** logg_cgs              # cm s^-2
-    R_cm = R_solar * R_sun_cm
-    M_g = g * R_cm**2 / G_cgs
-    return M_g / M_sun_g
-
-def _a_from_Teq_Teff_Rstar(Teq_K: float, Teff_K: float, R_solar: float) -> float:
-    """
-    Equilibrium temperature (A=0, full redistribution):
-    Teq = Teff * sqrt(R*/(2a))  => a = R*/[2*(Teq/Teff)^2]
-    Returns a in AU.
-    """
-    if Teq_K <= 0 or Teff_K <= 0 or R_solar <= 0:
-        return float("nan")
-    ratio = Teq_K / Teff_K
-    a_over_Rstar = 1.0 / (2.0 * ratio * ratio)   # a / R*
-    a_AU = a_over_Rstar * (R_solar * R_sun_AU)
-    return a_AU
-
-def _period_from_kepler(a_AU: float, M_star_solar: float) -> float:
-    """Kepler's 3rd law in solar units: P[yr]^2 = a[AU]^3 / M[Msun]"""
-    if a_AU <= 0 or M_star_solar <= 0:
-        return float("nan")
-    P_years = math.sqrt((a_AU**3) / M_star_solar)
-    return P_years * 365.25  # days
-
-def _depth_from_radii(Rp_Re: float, Rstar_Rsun: float) -> float:
-    """Transit depth (fraction) ≈ (Rp/R*)^2 using Earth & Solar radii."""
-    if Rp_Re <= 0 or Rstar_Rsun <= 0:
-        return float("nan")
-    R_earth_over_R_sun = 6371e5 / R_sun_cm
-    Rp_over_Rstar = (Rp_Re * R_earth_over_R_sun) / Rstar_Rsun
-    return (Rp_over_Rstar ** 2)
-
-def _flux_rel_earth(Teff_K: float, Rstar_Rsun: float, a_AU: float) -> float:
-    """S/S_earth = (L*/Lsun) / a^2 with L ∝ R^2 T^4."""
-    if Teff_K <= 0 or Rstar_Rsun <= 0 or a_AU <= 0:
-        return float("nan")
-    L_rel = (Rstar_Rsun*2) * ((Teff_K / T_sun_K) * 4)
-    return L_rel / (a_AU ** 2)
-
-def _central_transit_duration_hours(P_days: float, a_AU: float, Rstar_Rsun: float) -> float:
-    """
-    Approx central transit duration for b≈0, small Rp:
-    T ≈ (P/π) * arcsin(R*/a)  ~ (P/π)(R/a) for small angles.
-    Returns hours.
-    """
-    if P_days <= 0 or a_AU <= 0 or Rstar_Rsun <= 0:
-        return float("nan")
-    Rstar_AU = Rstar_Rsun * R_sun_AU
-    x = min(1.0, Rstar_AU / a_AU)
-    T_days = (P_days / math.pi) * math.asin(x)
-    return T_days * 24.0
-
-def _rel_err(x, y):
-    if not (math.isfinite(x) and math.isfinite(y)) or y == 0:
-        return float("inf")
-    return abs(x - y) / abs(y)
-
 def _go_home():
     """Navigate back to the main role-selection page."""
     try:
@@ -78,6 +77,806 @@ def _go_home():
         st.session_state.update(role=None)
         st.rerun()
 
+def _render_cache_stats():
+    stats = get_prediction_cache().stats()
+    flights = get_single_flight()
+    st.caption(
+        f"Prediction cache: {stats['hits']:,} hits · {stats['misses']:,} misses · {stats['entries']:,} entries  \n"
+        f"Backend calls: {flights.executed:,} sent · {flights.coalesced:,} shared with another session"
+    )
+
+
+def _prescreen_settings():
+    """Sidebar controls for the local physical-consistency pre-screen."""
+    with st.expander("Physical pre-screen"):
+        st.selectbox("Mode", PRESCREEN_MODES, index=1, key="prescreen_mode")
+        for field, default in DEFAULT_TOLERANCES.items():
+            st.number_input(
+                f"Max relative error: {CHECK_LABELS[field]}",
+                min_value=0.0, value=default, step=0.05, format="%.2f", key=f"tol_{field}",
+            )
+
+
+def _prescreen_config():
+    """(mode, tolerances) as last set in the sidebar."""
+    mode = st.session_state.get("prescreen_mode", PRESCREEN_MODES[1])
+    tolerances = {
+        field: st.session_state.get(f"tol_{field}", default) for field, default in DEFAULT_TOLERANCES.items()
+    }
+    return mode, tolerances
+
+
+def _make_predictor():
+    """Build the predictor selected in the sidebar, or return (None, reason) when it can't be used."""
+    if st.session_state.get("predictor_kind") == "Local model":
+        local_path = st.session_state.get("local_model_path", LOCAL_MODEL_PATH).strip()
+        if not os.path.exists(local_path):
+            return None, (f"Local model file not found: {local_path}. "
+                          "Train one with `python tools/train_local_model.py <KOI table CSV>`.")
+        return LocalPredictor(local_path), ""
+    api_urls = _backend_urls()
+    if not api_urls:
+        return None, "Setează URL-ul backendului în sidebar."
+    model_version = st.session_state.get("model_version", MODEL_VERSION).strip()
+    return RoutedPredictor(api_urls, st.session_state.get("api_token", ""), model_version), ""
+
+
+def _rate_limited(predictor):
+    """Multi-row scoring goes through this session's and the process-wide row-rate limits; the local model is exempt."""
+    if isinstance(predictor, LocalPredictor):
+        return predictor
+    return RateLimitedPredictor(predictor, [get_session_bucket(), get_global_bucket()])
+
+
+def _backend_urls() -> list:
+    """The backend replicas entered in the sidebar (comma-separated)."""
+    return [url.strip() for url in st.session_state.get("api_url", "").split(",") if url.strip()]
+
+
+# The view is split into keyed fragments so an interaction only reruns (and
+# re-sends) its own region: the sidebar settings, the backend health (which
+# also refreshes itself), the sidebar counters, the light-curve search, the
+# candidate form, the results panel and the parameter sweep. Settings reach
+# the other fragments through their widget keys in session state.
+
+@st.fragment(key="ds_backend")
+def _backend_controls():
+    st.text_input(
+        "Backend URL (Colab/Cloudflare; comma-separate replicas)",
+        value=", ".join(BACKEND_URLS) or "https://olympic-mathematics-fork-covers.trycloudflare.com",
+        key="api_url",
+    )
+    st.text_input("API token (optional)", type="password", key="api_token")
+    st.text_input("Model version (cache key)", value=MODEL_VERSION, key="model_version")
+    kind = st.radio("Predictor", ["Remote (HTTP)", "Local model"], key="predictor_kind")
+    if kind == "Local model":
+        st.text_input("Local model file (.npz)", value=LOCAL_MODEL_PATH, key="local_model_path")
+
+    if kind == "Remote (HTTP)":
+        _health_panel()
+
+    _prescreen_settings()
+
+
+HEALTH_ICONS = {"up": "🟢", "degraded": "🟡", "unknown": "⚪", "down": "🔴"}
+
+
+@st.fragment(key="ds_health", run_every=HEALTH_INTERVAL_SEC)
+def _health_panel():
+    """Latest background probes of the entered replicas; reading them never touches the network."""
+    monitor = get_health_monitor()
+    urls = _backend_urls()
+    monitor.watch(urls)
+    lines = []
+    for endpoint in monitor.snapshot(urls):
+        line = f"{HEALTH_ICONS[endpoint['state']]} {endpoint['url']}"
+        if np.isfinite(endpoint["latency_ms"]):
+            line += f" · {endpoint['latency_ms']:.0f} ms · {endpoint['error_rate']:.0%} errors"
+        if np.isfinite(endpoint["age_sec"]):
+            line += f" · checked {endpoint['age_sec']:.0f}s ago"
+        if endpoint["error"]:
+            line += f" · {endpoint['error']}"
+        lines.append(line)
+    if lines:
+        st.caption("  \n".join(lines))
+    st.button("Ping backend", on_click=monitor.probe_now, help="Probe every replica now, in the background.",
+              key="ping_backend")
+
+
+BREAKER_ICONS = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}
+
+
+def _render_guard_stats():
+    """Circuit state of each entered replica and what the row-rate limits have turned away."""
+    if st.session_state.get("predictor_kind") == "Local model":
+        return
+    lines = []
+    for url in _backend_urls():
+        breaker = get_circuit_breakers().get(url)
+        line = f"{BREAKER_ICONS[breaker.state]} Circuit {breaker.state} · {breaker.rejected:,} calls refused"
+        if breaker.state == "open":
+            line += f" · trial call in {breaker.retry_in():.0f}s"
+        lines.append(f"{line} · {breaker.url}")
+    session, shared = get_session_bucket(), get_global_bucket()
+    lines.append(
+        f"Row rate limit: {session.rate:,.0f} rows/s per session ({session.rejected:,} rows rejected) · "
+        f"{shared.rate:,.0f} rows/s overall ({shared.rejected:,} rows rejected)"
+    )
+    st.caption("  \n".join(lines))
+
+
+@st.fragment(key="ds_stats")
+def _stats_panel():
+    stats = get_prescreen_stats()
+    st.caption(f"Screened {stats.checked:,} candidates · {stats.skipped:,} backend calls saved")
+    _render_cache_stats()
+    _render_guard_stats()
+    st.button("Clear prediction cache", on_click=get_prediction_cache().clear)
+
+
+def _show_batch_mode():
+    """Score an uploaded CSV/Parquet of candidates chunk by chunk, showing results as they arrive."""
+    uploaded = st.file_uploader(
+        "Candidates file (CSV or Parquet)", type=["csv", "parquet", "pq"], key="batch_file"
+    )
+    st.caption("Required columns: " + ", ".join(PAYLOAD_FIELDS))
+
+    if uploaded is not None and st.button("Score file"):
+        predictor, unavailable = _make_predictor()
+        screen_mode, tolerances = _prescreen_config()
+        if predictor is None:
+            st.error(unavailable)
+            return
+        predictor = _rate_limited(predictor)
+
+        path = new_spool_path(st.session_state.get("batch_results_path"))
+        spool = ResultSpool(path)
+        st.session_state["batch_results_path"] = path
+
+        summary = st.empty()
+        latest = st.empty()
+        chunks = iter_candidate_chunks(uploaded)
+        while True:
+            try:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                chunk = numeric_chunk(chunk)
+            except ValueError as e:
+                st.error(f"Could not read file: {e}")
+                return
+            payloads = chunk_to_payloads(chunk)
+            if screen_mode == "Off":
+                flags = [""] * len(payloads)
+            else:
+                flags = prescreen_flags(chunk, tolerances)
+            skip = screen_mode == "Skip backend for inconsistent"
+            send = [i for i, flag in enumerate(flags) if not (skip and flag)]
+            responses = [{} for _ in payloads]
+            if send:
+                try:
+                    scored = predictor.predict_rows([payloads[i] for i in send])
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    # the backend failed this chunk (e.g. a short /predict_batch reply): error rows, keep going
+                    scored = [{"error": str(e)}] * len(send)
+                for i, response in zip(send, scored):
+                    responses[i] = response
+            if screen_mode != "Off":
+                get_prescreen_stats().record(len(payloads), len(payloads) - len(send))
+            rows = [
+                {**result_row(spool.rows + i, r, f), **d, **k}
+                for i, (r, f, d, k) in enumerate(zip(responses, flags, derived_rows(chunk), known_rows(chunk)))
+            ]
+            spool.extend(rows)
+            summary.markdown(
+                f"**Scored {spool.rows:,} rows** · {spool.promising:,} promising · {spool.errors:,} errors"
+                f" · {spool.skipped:,} rejected locally by the pre-screen · {spool.known:,} already known"
+            )
+            latest.dataframe(rows, width="stretch", hide_index=True)
+
+    path = st.session_state.get("batch_results_path")
+    if path and os.path.exists(path):
+        # read from disk only when clicked, not on every rerun
+        st.download_button("Download results (CSV)", partial(read_spool, path), file_name="exodetect_results.csv",
+                           mime="text/csv", on_click="ignore")
+
+
+# payload field -> form label, min and max
+SWEEP_FIELDS = {
+    FORM_KEYS[kwargs["key"]]: (label, kwargs.get("min_value"), kwargs.get("max_value"))
+    for label, kwargs in FORM_FIELDS
+}
+SWEEP_REDRAW_SEC = 0.5
+
+
+def _sweep_axis(axis: str, field: str, value: float, default_steps: int):
+    """
+    Range and step-count inputs for one sweep axis; defaults to ±50% around
+    the base value. An inverted range is swapped; an empty one (From == To)
+    gives None.
+    """
+    field_label, low_limit, high_limit = SWEEP_FIELDS[field]
+    low, high = (value * 0.5, value * 1.5) if value > 0 else (value - 1.0, value + 1.0)
+    if low_limit is not None:
+        low = max(low, low_limit)
+    if high_limit is not None:
+        high = min(high, high_limit)
+    cols = st.columns(3)
+    bounds = dict(min_value=low_limit, max_value=high_limit, format="%.5f")
+    # keyed by field, so picking another field starts from that field's defaults
+    start = cols[0].number_input("From", value=float(low), key=f"sweep_{axis}_from_{field}", **bounds)
+    stop = cols[1].number_input("To", value=float(high), key=f"sweep_{axis}_to_{field}", **bounds)
+    steps = cols[2].number_input("Steps", min_value=2, max_value=SWEEP_MAX_STEPS, value=default_steps,
+                                 key=f"sweep_{axis}_steps")
+    if start == stop:
+        st.error(f"{field_label}: From and To must differ.")
+        return None
+    return np.linspace(min(start, stop), max(start, stop), int(steps))
+
+
+def _sweep_chart(sweep: Sweep):
+    """Heatmap of the probability over a two-field grid, or a line for a one-field sweep; unscored cells are blank."""
+    frame = sweep.frame()
+    x_label = SWEEP_FIELDS[sweep.x_field][0]
+    probability = alt.Scale(domain=[0, 1])
+    tooltip = [alt.Tooltip(f"{sweep.x_field}:Q", title=x_label, format=".5g")]
+    if sweep.y_field:
+        y_label = SWEEP_FIELDS[sweep.y_field][0]
+        tooltip += [alt.Tooltip(f"{sweep.y_field}:Q", title=y_label, format=".5g"),
+                    alt.Tooltip("probability:Q", format=".1%")]
+        return alt.Chart(frame).mark_rect().encode(
+            x=alt.X("x_low:Q", title=x_label, scale=alt.Scale(zero=False, nice=False)), x2="x_high:Q",
+            y=alt.Y("y_low:Q", title=y_label, scale=alt.Scale(zero=False, nice=False)), y2="y_high:Q",
+            color=alt.Color("probability:Q", scale=alt.Scale(scheme="viridis", domain=[0, 1])),
+            tooltip=tooltip,
+        ).properties(height=420)
+    tooltip.append(alt.Tooltip("probability:Q", format=".1%"))
+    chart = alt.Chart(frame).mark_line(point=True, color="#FFB347").encode(
+        x=alt.X(f"{sweep.x_field}:Q", title=x_label, scale=alt.Scale(zero=False)),
+        y=alt.Y("probability:Q", scale=probability, axis=alt.Axis(format="%")),
+        tooltip=tooltip,
+    )
+    if np.isfinite(sweep.threshold):
+        threshold = pd.DataFrame({"threshold": [sweep.threshold]})
+        chart += alt.Chart(threshold).mark_rule(color="#BBBBBB", strokeDash=[4, 4]).encode(y="threshold:Q")
+    return chart.properties(height=320)
+
+
+def _sweep_status(sweep: Sweep) -> str:
+    duplicates = sweep.cells - sweep.unique
+    status = (
+        f"**{sweep.done:,} / {sweep.unique:,}** distinct payloads · {sweep.cached:,} from cache · "
+        f"{sweep.scored:,} scored · {sweep.failed:,} failed"
+    )
+    if duplicates:
+        status += f" · {duplicates:,} grid cells repeat another payload"
+    return status
+
+
+@st.fragment(key="ds_sweep")
+def _sweep_panel():
+    """Vary one or two fields of the last checked candidate and map the model probability over the grid."""
+    base = st.session_state.get("ds_payload")
+    if not base:
+        st.info("Check a candidate in **Single candidate** mode first; the sweep varies its fields around it.")
+        return
+    fields = list(SWEEP_FIELDS)
+    label = {field: entry[0] for field, entry in SWEEP_FIELDS.items()}
+
+    x_field = st.selectbox("Vary", fields, index=fields.index("radius_earth"), format_func=label.get, key="sweep_x")
+    x_values = _sweep_axis("x", x_field, float(base[x_field]), 30)
+    y_choices = [None] + [field for field in fields if field != x_field]
+    y_field = st.selectbox("Against", y_choices, index=y_choices.index("teq_K") if x_field != "teq_K" else 0,
+                           format_func=lambda field: "(nothing: one-field sweep)" if field is None else label[field],
+                           key="sweep_y")
+    y_values = _sweep_axis("y", y_field, float(base[y_field]), 30) if y_field else None
+    if x_values is None or (y_field and y_values is None):
+        return
+
+    status, progress, chart = st.empty(), st.empty(), st.empty()
+    if st.button("Run sweep", type="primary"):
+        predictor, unavailable = _make_predictor()
+        if predictor is None:
+            st.error(unavailable)
+            return
+        predictor = _rate_limited(predictor)
+        sweep = Sweep(base, x_field, x_values, y_field, y_values)
+        st.session_state["ds_sweep"] = sweep
+        drawn = 0.0
+        for sweep in sweep.run(predictor):
+            progress.progress(sweep.done / max(sweep.unique, 1))
+            if monotonic() - drawn >= SWEEP_REDRAW_SEC:
+                status.markdown(_sweep_status(sweep))
+                chart.altair_chart(_sweep_chart(sweep), width="stretch")
+                drawn = monotonic()
+        progress.empty()
+
+    sweep = st.session_state.get("ds_sweep")
+    if sweep is None:
+        return
+    status.markdown(_sweep_status(sweep))
+    chart.altair_chart(_sweep_chart(sweep), width="stretch")
+    if sweep.error:
+        st.warning(f"Some payloads could not be scored: {sweep.error}")
+
+
+# keys of the form fields a light-curve fit fills in -> transit search result key
+LIGHT_CURVE_FIELDS = {
+    "P_days": "period_days",
+    "t0": "t0",
+    "dur_hours": "duration_hours",
+    "depth_val": "depth_ppm",
+}
+PERIODOGRAM_POINTS = 1500
+PREVIEW_POINTS = 2000
+
+
+def _apply_light_curve_fit():
+    """Button callback: copy the transit search result into the form fields and redraw the form."""
+    fit = st.session_state["lc_result"]
+    for key, field in LIGHT_CURVE_FIELDS.items():
+        st.session_state[key] = float(fit[field])
+    st.rerun(["ds_form", "ds_lightcurve"])
+
+
+def _periodogram_frame(periods, power):
+    """The coarse periodogram max-pooled to about PERIODOGRAM_POINTS points, so peaks survive the downsampling."""
+    block = max(1, -(-len(periods) // PERIODOGRAM_POINTS))
+    n = len(periods) // block * block
+    pooled = power[:n].reshape(-1, block)
+    peak = pooled.argmax(axis=1) + np.arange(0, n, block)
+    return pd.DataFrame({"period (days)": periods[peak], "BLS power": power[peak]}).set_index("period (days)")
+
+
+def _store_upload(uploaded):
+    """Write a newly uploaded light curve to the shared store once and select it."""
+    file_id = getattr(uploaded, "file_id", uploaded.name)
+    if st.session_state.get("lc_stored_file") == file_id:
+        return
+    target_id = st.session_state.get("lc_new_target", "").strip() or os.path.splitext(uploaded.name)[0]
+    try:
+        time, flux, flux_err = read_light_curve(uploaded)
+    except ValueError as e:
+        st.error(f"Could not read light curve: {e}")
+        return
+    get_light_curve_store().put(target_id, time, flux, flux_err, source=uploaded.name)
+    st.session_state["lc_stored_file"] = file_id
+    st.session_state["lc_target"] = target_id
+
+
+def _detrended_curve(curve, window_days: float):
+    """The detrended, clipped version of a stored light curve, computed once per raw upload and window."""
+    store = get_light_curve_store()
+    key = f"{curve.target_id} · detrended {window_days:g} d"
+    raw_written = curve.meta.get("written", "")
+    derived = store.get(key)
+    if derived is not None and derived.meta.get("raw_written") == raw_written:
+        return derived
+    time, flux, flux_err = detrend(curve.time, curve.flux, curve.flux_err, window_days=window_days)
+    return store.put(key, time, flux, flux_err, source=curve.source, derived_from=curve.target_id,
+                     meta={"raw_written": raw_written})
+
+
+@st.fragment(key="ds_lightcurve")
+def _light_curve_search():
+    with st.expander("Fit transit parameters from a light curve"):
+        st.text_input("Target ID for the upload (defaults to the file name)", key="lc_new_target")
+        uploaded = st.file_uploader(
+            "Light curve (CSV or Parquet with time [days], flux and optional flux_err columns)",
+            type=["csv", "parquet", "pq"], key="lc_file",
+        )
+        if uploaded is not None:
+            _store_upload(uploaded)
+
+        store = get_light_curve_store()
+        targets = store.targets()
+        if not targets:
+            return
+        if st.session_state.get("lc_target") not in targets:
+            st.session_state["lc_target"] = targets[0]
+        target_id = st.selectbox("Stored light curve", targets, key="lc_target")
+        curve = store.get(target_id)
+        if curve is None:
+            st.info(f"{target_id} was just removed from the store (replaced or over its size/age cap).")
+            return
+        step = max(1, len(curve) // PREVIEW_POINTS)
+        st.caption(f"{len(curve):,} points · {curve.time[-1] - curve.time[0]:.1f} days · from {curve.source}")
+        st.line_chart(pd.DataFrame({"time": curve.time[::step], "flux": curve.flux[::step]}).set_index("time"), height=180)
+
+        cols = st.columns(2)
+        use_detrend = cols[0].checkbox("Detrend before searching (rolling median, clip flares)", value=True,
+                                       key="lc_detrend")
+        window = cols[1].number_input("Detrend window (days, ~3x the longest transit)", min_value=0.1,
+                                      value=DETREND_WINDOW_DAYS, step=0.25, key="lc_window")
+        if st.button("Run transit search"):
+            try:
+                with st.spinner(f"Searching {len(curve):,} points for periodic transits…"):
+                    series = _detrended_curve(curve, window) if use_detrend else curve
+                    fit = bls_search(series.time, series.flux, series.flux_err)
+            except ValueError as e:
+                st.error(f"Transit search failed: {e}")
+                return
+            periodogram = _periodogram_frame(fit.pop("periods"), fit.pop("power"))
+            st.session_state["lc_result"] = {"target_id": target_id, "periodogram": periodogram, **fit}
+
+        fit = st.session_state.get("lc_result")
+        if not fit or fit["target_id"] != target_id:
+            return
+        cols = st.columns(5)
+        cols[0].metric("Period (days)", f"{fit['period_days']:.5f}")
+        cols[1].metric("Epoch", f"{fit['t0']:.4f}")
+        cols[2].metric("Duration (h)", f"{fit['duration_hours']:.2f}")
+        cols[3].metric("Depth (ppm)", f"{fit['depth_ppm']:.0f}")
+        cols[4].metric("SNR", f"{fit['snr']:.1f}", help=f"{fit['n_transits']} transits in the light curve")
+        st.line_chart(fit["periodogram"], height=220)
+        st.button("Use these values", on_click=_apply_light_curve_fit)
+
+
+def _submit_candidate():
+    """Form callback: snapshot the payload and rerun only the results and counters."""
+    st.session_state["ds_payload"] = {field: st.session_state.get(key, 0.0) for key, field in FORM_KEYS.items()}
+    st.session_state["ds_sigmas"] = {
+        field: st.session_state.get(f"{key}_sigma", 0.0) for key, field in FORM_KEYS.items()
+        if st.session_state.get(f"{key}_sigma", 0.0) > 0
+    }
+    st.session_state["ds_explain"] = st.session_state.get("explain", True)
+    st.session_state["ds_result"] = None
+    st.rerun(["ds_results", "ds_stats"])
+
+
+@st.fragment(key="ds_form")
+def _candidate_form():
+    with st.form("exo_form", clear_on_submit=False):
+        cols = st.columns(2)
+        for i, (label, kwargs) in enumerate(FORM_FIELDS):
+            with cols[i % 2]:
+                st.number_input(label, **kwargs)
+
+        with st.expander("Uncertainties (1σ, optional)"):
+            st.caption("Fields with an error bar are sampled (Monte Carlo) to propagate it to the derived "
+                       "quantities and the model probability.")
+            cols = st.columns(2)
+            for i, (label, kwargs) in enumerate(FORM_FIELDS):
+                with cols[i % 2]:
+                    st.number_input(f"± {label}", min_value=0.0, step=kwargs["step"], format=kwargs["format"],
+                                    key=f"{kwargs['key']}_sigma")
+            st.number_input("Monte Carlo draws", min_value=100, max_value=MC_MAX_DRAWS, value=MC_DRAWS, step=500,
+                            key="mc_draws")
+
+        st.checkbox("Explain the verdict (rank the fields by how much they move the probability)", value=True,
+                    key="explain")
+        st.form_submit_button("Check parameters", on_click=_submit_candidate)
+
+
+def _score_candidate(payload: dict) -> dict:
+    """Pre-screen and predict one candidate; the outcome is kept so later reruns only redraw it."""
+    result = {
+        "reasons": "", "skipped": False, "data": None, "error": "",
+        "known": get_sky_index().cone(payload["ra_deg"], payload["dec_deg"]),
+        "mc": None, "attribution": None,
+    }
+    sigmas = st.session_state.get("ds_sigmas") or {}
+    if sigmas:
+        draws = int(st.session_state.get("mc_draws", MC_DRAWS))
+        samples = draw_samples(payload, sigmas, draws)
+        result["mc"] = {"draws": draws, "fields": sorted(sigmas), "derived": propagate(samples), "probability": None}
+    screen_mode, tolerances = _prescreen_config()
+    if screen_mode != "Off":
+        result["reasons"] = describe(prescreen(payload, tolerances))
+        result["skipped"] = bool(result["reasons"]) and screen_mode == "Skip backend for inconsistent"
+        get_prescreen_stats().record(1, int(result["skipped"]))
+        if result["skipped"]:
+            return result
+
+    predictor, unavailable = _make_predictor()
+    if predictor is None:
+        result["error"] = unavailable
+        return result
+
+    try:
+        with st.spinner("Contacting backend…"):
+            result["data"] = predictor.predict(payload)
+    except requests.exceptions.RequestException as e:
+        result["error"] = f"API error: {e}"
+        return result
+
+    # the multi-row passes below draw on the same row-rate limits as the batch modes
+    limited = _rate_limited(predictor)
+    if st.session_state.get("ds_explain", True):
+        # all 24 ±δ payloads in one batched call: about one round trip, not one per field
+        data = result["data"]
+        try:
+            with st.spinner("Ranking the fields behind the verdict…"):
+                responses = limited.predict_rows(perturbed_rows(payload))
+            if all("error" in r for r in responses):
+                result["error"] = f"Could not rank the fields: {responses[0]['error']}"
+            else:
+                result["attribution"] = attribute(
+                    payload, responses, data.get("probability", 0.0), data.get("threshold", 0.5),
+                )
+        except (requests.exceptions.RequestException, ValueError) as e:
+            result["error"] = f"Could not rank the fields: {e}"
+
+    if result["mc"]:
+        # every draw in one batched call: one /predict_batch round trip (or one matrix for the local model)
+        try:
+            with st.spinner(f"Scoring {result['mc']['draws']:,} Monte Carlo draws…"):
+                responses = limited.predict_rows(sample_rows(samples))
+            if all("error" in r for r in responses):
+                result["mc"]["error"] = f"Could not score the draws: {responses[0]['error']}"
+            else:
+                result["mc"]["probability"] = probability_distribution(responses)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            result["mc"]["error"] = f"Could not score the draws: {e}"
+    return result
+
+
+def _phase_fold_source():
+    """The light curve selected in the light-curve panel (detrended if that is switched on), or None."""
+    target_id = st.session_state.get("lc_target")
+    curve = get_light_curve_store().get(target_id) if target_id else None
+    if curve is None:
+        return None
+    if st.session_state.get("lc_detrend", True):
+        curve = _detrended_curve(curve, st.session_state.get("lc_window", DETREND_WINDOW_DAYS))
+    return curve
+
+
+def _phase_fold_chart(profile, points, half, duration_hours):
+    ppm = alt.Axis(title="relative flux (ppm)")
+    x = alt.X("hours:Q", title="hours from mid-transit", scale=alt.Scale(domain=[-half, half]))
+    window = alt.Chart(pd.DataFrame({"start": [-duration_hours / 2], "end": [duration_hours / 2]})).mark_rect(
+        color="#A0C0FF", opacity=0.15,
+    ).encode(x="start:Q", x2="end:Q")
+    raw = alt.Chart(points.assign(ppm=(points["flux"] - 1.0) * 1e6)).mark_circle(
+        size=6, color="#BBBBBB", opacity=0.35,
+    ).encode(x=x, y=alt.Y("ppm:Q", axis=ppm))
+    profile = profile.assign(
+        ppm=(profile["flux"] - 1.0) * 1e6,
+        low=(profile["flux"] - profile["error"] - 1.0) * 1e6,
+        high=(profile["flux"] + profile["error"] - 1.0) * 1e6,
+    )
+    errors = alt.Chart(profile).mark_rule(color="#FFB347", opacity=0.6).encode(x=x, y="low:Q", y2="high:Q")
+    binned = alt.Chart(profile).mark_line(
+        color="#FFB347", point=alt.OverlayMarkDef(size=14, color="#FFB347"),
+    ).encode(x=x, y=alt.Y("ppm:Q", axis=ppm), tooltip=["hours:Q", "ppm:Q", "count:Q"])
+    return (window + raw + errors + binned).properties(height=280)
+
+
+def _phase_fold_panel(payload: dict):
+    """Phase-folded, binned light curve at the entered period and epoch, with the duration window shaded."""
+    curve = _phase_fold_source()
+    period, t0, duration = payload["period_days"], payload["t0"], payload["duration_hours"]
+    if curve is None or period <= 0 or duration <= 0:
+        return
+    profile, points, half = transit_view(curve.time, curve.flux, period, t0, duration)
+    st.markdown(f"**Phase-folded light curve** · {curve.source} · P = {period:g} d")
+    if profile.empty:
+        st.caption("No light-curve points near the entered epoch; is t0 in the light curve's time system?")
+        return
+    st.altair_chart(_phase_fold_chart(profile, points, half, duration), width="stretch")
+    st.caption(
+        f"{int(profile['count'].sum()):,} points within ±{half:.1f} h in {len(profile)} bins "
+        f"(dots: {len(points):,} of them)"
+    )
+
+
+def _drivers_html(attribution, count: int = 5) -> str:
+    """Third column of the verdict card: the fields that move the probability most, or nothing."""
+    if not attribution:
+        return ""
+    lines = []
+    for entry in attribution[:count]:
+        if not np.isfinite(entry["change"]) or abs(entry["change"]) < 5e-4:
+            break
+        arrow, color = ("▲", "#28a745") if entry["change"] >= 0 else ("▼", "#dc3545")
+        flag = " ⚠" if entry["flips"] else ""
+        lines.append(
+            f'<p style="margin: 2px; font-size: 0.85rem;">{FIELD_LABELS[entry["field"]]}: '
+            f'<b style="color: {color};">{arrow} {entry["change"] * 100:+.1f} pp</b>{flag}</p>'
+        )
+    if not lines:
+        lines.append(
+            f'<p style="margin: 2px; font-size: 0.85rem;">No single field moves the probability at ±{RELATIVE_STEP:.0%}.</p>'
+        )
+    return f"""
+            <div style="border-left: 1px solid rgba(255, 255, 255, 0.2); height: 100px; margin: auto 0;"></div>
+            <div style="flex-basis: 50%;">
+                <h5 style="margin-bottom: 5px; color: #A0C0FF;">Top Drivers</h5>
+                {"".join(lines)}
+            </div>"""
+
+
+def _attribution_table(attribution: list):
+    """Every field's finite-difference sensitivity, largest first."""
+    with st.expander("Why this verdict? Sensitivity of the probability to each field"):
+        st.caption(
+            f"Each field is moved by ±{RELATIVE_STEP:.0%} (a small fixed step for epoch and sky position) with the "
+            "others held fixed. ▲ means raising the field raises the probability; ⚠ marks fields whose "
+            "nudge alone crosses the decision threshold."
+        )
+        st.dataframe(
+            {
+                "field": [FIELD_LABELS[e["field"]] for e in attribution],
+                "value": [e["value"] for e in attribution],
+                "−δ": [e["low"] for e in attribution],
+                "+δ": [e["high"] for e in attribution],
+                "probability at −δ": [e["p_low"] for e in attribution],
+                "probability at +δ": [e["p_high"] for e in attribution],
+                "change (pp)": [e["change"] * 100 for e in attribution],
+                "crosses threshold": [e["flips"] for e in attribution],
+            },
+            hide_index=True,
+            width="stretch",
+        )
+
+
+DERIVED_LABELS = {
+    "mstar_msun": "Stellar mass (Solar masses)",
+    "a_AU": "Semi-major axis (AU)",
+    "period_days": "Orbital period (days)",
+    "transit_depth_ppm": "Transit depth (ppm)",
+    "S_earth": "Earth flux",
+    "duration_hours": "Transit duration (hours)",
+}
+
+
+def _uncertainty_panel(mc: dict):
+    """Monte Carlo summary: probability spread and verdict stability, then derived quantities with 1σ ranges."""
+    st.markdown(f"**Uncertainty** · {mc['draws']:,} Monte Carlo draws of {', '.join(mc['fields'])}")
+    probability = mc["probability"]
+    if probability:
+        cols = st.columns(3)
+        cols[0].metric("Probability (median)", f"{probability['median']:.1%}")
+        cols[1].metric("1σ range", f"{probability['low']:.1%} – {probability['high']:.1%}")
+        cols[2].metric("Draws above threshold", f"{probability['above_threshold']:.0%}",
+                       help=f"{probability['scored']:,} draws scored, {probability['failed']:,} failed")
+        histogram = alt.Chart(pd.DataFrame(probability["histogram"])).mark_bar(color="#A0C0FF").encode(
+            x=alt.X("start:Q", title="probability", scale=alt.Scale(domain=[0, 1])), x2="end:Q",
+            y=alt.Y("draws:Q", title="draws"),
+        )
+        st.altair_chart(histogram.properties(height=160), width="stretch")
+    elif mc.get("error"):
+        st.warning(mc["error"])
+    st.dataframe(
+        {
+            "quantity": [DERIVED_LABELS[k] for k in mc["derived"]],
+            "median": [v["median"] for v in mc["derived"].values()],
+            "−1σ": [v["median"] - v["low"] for v in mc["derived"].values()],
+            "+1σ": [v["high"] - v["median"] for v in mc["derived"].values()],
+            "valid draws": [f"{v['valid']:.0%}" for v in mc["derived"].values()],
+        },
+        hide_index=True,
+        width="stretch",
+    )
+
+
+@st.fragment(key="ds_results")
+def _results_panel():
+    payload = st.session_state.get("ds_payload")
+    if payload is None:
+        return
+    result = st.session_state.get("ds_result")
+    if result is None:
+        result = st.session_state["ds_result"] = _score_candidate(payload)
+
+    st.divider()
+    if result["known"]:
+        listed = ", ".join(f"{k['name']} ({k['kind']}, {k['sep_arcsec']:.1f}″)" for k in result["known"])
+        st.info(f"Already known within {CROSSMATCH_RADIUS_ARCSEC:g}″: {listed}")
+    else:
+        st.caption(f"No known planet or KOI within {CROSSMATCH_RADIUS_ARCSEC:g}″ of this position.")
+    if result["skipped"]:
+        st.error(f"Physically inconsistent, not sent to the model: {result['reasons']}.")
+        return
+    if result["reasons"]:
+        st.warning(f"Physical pre-screen: {result['reasons']}.")
+    if result["data"] is None:
+        st.error(result["error"])
+        if result["error"].startswith("API error"):
+            with st.expander("Payload sent)"):
+                st.json(payload)
+        return
+
+    data = result["data"]
+    # same rule as the batch verdicts and the attribution's "crosses threshold" flags
+    probability = float(data.get("probability", 0.0))
+    threshold = float(data.get("threshold", 0.5))
+    label = 1 if probability >= threshold else 0
+    echo = data.get("echo", {})
+
+    planet_radius = echo.get("radius_earth", "N/A")
+    eq_temp_k = echo.get("teq_K", "N/A")
+    orbital_period_days = echo.get("period_days", "N/A")
+    star_temp_k = echo.get("teff_star_K", "N/A")
+
+    eq_temp_c = eq_temp_k - 273.15 if isinstance(eq_temp_k, (int, float)) else "N/A"
+
+    star_type = "Unknown"
+    if isinstance(star_temp_k, (int, float)):
+        if star_temp_k >= 7500: star_type = "A-type (Hot, Blue-White)"
+        elif star_temp_k >= 6000: star_type = "F-type (White)"
+        elif star_temp_k >= 5200: star_type = "G-type (Sun-like, Yellow)"
+        elif star_temp_k >= 3700: star_type = "K-type (Orange Dwarf)"
+        else: star_type = "M-type (Red Dwarf)"
+
+    if label == 1:
+        verdict_text = "Promising Exoplanet"
+        verdict_color = "#28a745"
+        verdict_emoji = "✅"
+        explanation = (
+            "The model suggests this candidate has characteristics consistent with a potentially "
+            "viable exoplanet. The probability score is above the decision threshold."
+        )
+    else:
+        verdict_text = "Unlikely Exoplanet"
+        verdict_color = "#dc3545"
+        verdict_emoji = "❌"
+        explanation = (
+            "The model indicates a low probability for this candidate. Key factors might place it "
+            "outside the typical parameters for a viable exoplanet or habitable zone."
+        )
+
+    summary_html = f"""
+    <div style="
+        background: rgba(10, 20, 30, 0.5);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        border-radius: 10px;
+        padding: 20px;
+        margin: 1rem 0;
+        color: white;
+        backdrop-filter: blur(5px);
+    ">
+        <h3 style="color: {verdict_color}; text-align: center; margin-top:0;">
+            {verdict_emoji} AI/ML Verdict: {verdict_text}
+        </h3>
+        <p style="text-align: center; font-size: 0.9rem; color: #E0E0E0;">
+            {explanation}
+        </p>
+        <hr style="border-color: rgba(255, 255, 255, 0.2); margin: 15px 0;">
+        <div style="display: flex; justify-content: space-around; text-align: center;">
+            <div style="flex-basis: 50%;">
+                <h5 style="margin-bottom: 5px; color: #A0C0FF;">System Profile</h5>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Planet Radius:</b> {planet_radius:.2f} x Earth</p>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Eq. Temperature:</b> {eq_temp_k} K ({eq_temp_c:.1f}°C)</p>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Orbital Period:</b> {orbital_period_days} days</p>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Host Star (Est.):</b> {star_type}</p>
+            </div>
+            <div style="border-left: 1px solid rgba(255, 255, 255, 0.2); height: 100px; margin: auto 0;"></div>
+            <div style="flex-basis: 50%;">
+                <h5 style="margin-bottom: 5px; color: #A0C0FF;">Model Confidence</h5>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Probability Score:</b> {probability:.2%}</p>
+                <p style="margin: 2px; font-size: 0.95rem;"><b>Decision Threshold:</b> {threshold:.2%}</p>
+            </div>{_drivers_html(result["attribution"])}
+        </div>
+    </div>
+    """
+    st.markdown(summary_html, unsafe_allow_html=True)
+    if result["error"]:
+        st.caption(result["error"])
+    if result["attribution"]:
+        _attribution_table(result["attribution"])
+
+    _phase_fold_panel(payload)
+    if result["mc"]:
+        _uncertainty_panel(result["mc"])
+
+    derived = derive_quantities(payload)
+    with st.expander("Entered vs. derived from stellar parameters"):
+        st.dataframe(
+            {
+                "quantity": ["Orbital period (days)", "Transit depth (ppm)", "Earth flux", "Transit duration (hours)"],
+                "entered": [payload[k] for k in ("period_days", "transit_depth_ppm", "S_earth", "duration_hours")],
+                "derived": [float(derived[k]) for k in ("period_days", "transit_depth_ppm", "S_earth", "duration_hours")],
+            },
+            hide_index=True,
+            width="stretch",
+        )
+
+    with st.expander("Full JSON response"):
+        st.json(data)
+
+
 def show_datascientist_view():
     st.markdown(
         "<h2 style='color:white; text-align:center;'>Exoplanet Check</h2>",
@@ -103,177 +902,23 @@ def show_datascientist_view():
         unsafe_allow_html=True,
     )
 
-    API_URL = st.sidebar.text_input(
-        "Backend URL (Colab/Cloudflare)",
-        value="https://olympic-mathematics-fork-covers.trycloudflare.com"
-    ).strip()
-    API_TOKEN = st.sidebar.text_input("API token (optional)", type="password")
+    with st.sidebar:
+        _backend_controls()
 
-    if st.sidebar.button("Ping backend"):
-        try:
-            r = requests.get(f"{API_URL.rstrip('/')}/", timeout=10)
-            st.sidebar.success(f"Ping OK: {r.status_code}")
-        except Exception as e:
-            st.sidebar.error(f"Ping failed: {e}")
-
-    with st.form("exo_form", clear_on_submit=False):
-        cols = st.columns(2)
-
-        fields = [
-            ("Orbital period (days)",               dict(min_value=0.0, step=0.1,  format="%.5f", key="P_days")),
-            ("Transit epoch (e.g., BJD_TDB)",       dict(step=0.1,                 format="%.5f", key="t0")),
-            ("Transit duration (hours)",            dict(min_value=0.0, step=0.1,  format="%.5f", key="dur_hours")),
-            ("Transit depth (ppm)",                 dict(min_value=0.0, step=10.0, format="%.5f", key="depth_val")),
-            ("Planetary radius (Earth radii)",      dict(min_value=0.0, step=0.1,  format="%.5f", key="Rp_Re")),
-            ("Equilibrium temperature (K)",         dict(min_value=0.0, step=10.0, format="%.5f", key="Teq_K")),
-            ("Earth flux",                          dict(min_value=0.0, step=0.1,  format="%.5f", key="S_earth")),
-            ("Stellar effective temperature (K)",   dict(min_value=0.0, step=10.0, format="%.5f", key="Teff_K")),
-            ("Stellar surface gravity log g (cgs)", dict(min_value=0.0, step=0.01, format="%.5f", key="logg")),
-            ("Stellar radius (Solar radii)",        dict(min_value=0.0, step=0.01, format="%.5f", key="Rstar_Rsun")),
-            ("Right ascension (deg, 0–360)",        dict(min_value=0.0, max_value=360.0, step=0.1, format="%.5f", key="RA_deg")),
-            ("Declination (deg, -90–+90)",          dict(min_value=0.0, max_value=90.0, step=0.1, format="%.5f", key="Dec_deg")),
-        ]
-
-        for i, (label, kwargs) in enumerate(fields):
-            with cols[i % 2]:
-                st.number_input(label, **kwargs)
-
-        submitted = st.form_submit_button("Check parameters")
-
-    if not submitted:
-        st.divider()
-        if st.button("← Back to role selection"):
-            _go_home()
-        return
-
-    P_days       = st.session_state.get("P_days", 0.0)
-    t0           = st.session_state.get("t0", 0.0)
-    dur_hours    = st.session_state.get("dur_hours", 0.0)
-    depth_val    = st.session_state.get("depth_val", 0.0)
-    Rp_Re        = st.session_state.get("Rp_Re", 0.0)
-    Teq_K        = st.session_state.get("Teq_K", 0.0)
-    S_earth      = st.session_state.get("S_earth", 0.0)
-    Teff_K       = st.session_state.get("Teff_K", 0.0)
-    logg         = st.session_state.get("logg", 0.0)
-    Rstar_Rsun   = st.session_state.get("Rstar_Rsun", 0.0)
-    RA_deg       = st.session_state.get("RA_deg", 0.0)
-    Dec_deg      = st.session_state.get("Dec_deg", 0.0)
-
-    payload = {
-        "period_days": P_days,
-        "t0": t0,
-        "duration_hours": dur_hours,
-        "transit_depth_ppm": depth_val,
-        "radius_earth": Rp_Re,
-        "teq_K": Teq_K,
-        "S_earth": S_earth,
-        "teff_star_K": Teff_K,
-        "logg_cgs": logg,
-        "rstar_rsun": Rstar_Rsun,
-        "ra_deg": RA_deg,
-        "dec_deg": Dec_deg,
-    }
+    mode = st.radio("Mode", ["Single candidate", "Batch file", "Parameter sweep"], horizontal=True, key="ds_mode")
+    if mode == "Batch file":
+        _show_batch_mode()
+    elif mode == "Parameter sweep":
+        _sweep_panel()
+    else:
+        _light_curve_search()
+        _candidate_form()
+        _results_panel()
 
     st.divider()
-    if not API_URL:
-        st.error("Setează URL-ul backendului în sidebar.")
-        if st.button("← Back to role selection"):
-            _go_home()
-        return
-
-    headers = {"Content-Type": "application/json"}
-    if API_TOKEN:
-        headers["X-API-Key"] = API_TOKEN
-
-    try:
-        with st.spinner("Contacting backend…"):
-            print(payload)
-            resp = requests.post(f"{API_URL.rstrip('/')}/predict", json=payload, headers=headers, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-
-        probability = data.get("probability", 0.0) * 100
-        label = 0
-        if probability * 100 > 75.00:
-            label = 1
-        threshold = data.get("threshold", 0.5)
-        echo = data.get("echo", {})
-
-        planet_radius = echo.get("radius_earth", "N/A")
-        eq_temp_k = echo.get("teq_K", "N/A")
-        orbital_period_days = echo.get("period_days", "N/A")
-        star_temp_k = echo.get("teff_star_K", "N/A")
-
-        eq_temp_c = eq_temp_k - 273.15 if isinstance(eq_temp_k, (int, float)) else "N/A"
-
-        star_type = "Unknown"
-        if isinstance(star_temp_k, (int, float)):
-            if star_temp_k >= 7500: star_type = "A-type (Hot, Blue-White)"
-            elif star_temp_k >= 6000: star_type = "F-type (White)"
-            elif star_temp_k >= 5200: star_type = "G-type (Sun-like, Yellow)"
-            elif star_temp_k >= 3700: star_type = "K-type (Orange Dwarf)"
-            else: star_type = "M-type (Red Dwarf)"
-
-        if label == 1:
-            verdict_text = "Promising Exoplanet"
-            verdict_color = "#28a745"
-            verdict_emoji = "✅"
-            explanation = (
-                "The model suggests this candidate has characteristics consistent with a potentially "
-                "viable exoplanet. The probability score is above the decision threshold."
-            )
-        else:
-            verdict_text = "Unlikely Exoplanet"
-            verdict_color = "#dc3545"
-            verdict_emoji = "❌"
-            explanation = (
-                "The model indicates a low probability for this candidate. Key factors might place it "
-                "outside the typical parameters for a viable exoplanet or habitable zone."
-            )
-
-        summary_html = f"""
-        <div style="
-            background: rgba(10, 20, 30, 0.5);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 10px;
-            padding: 20px;
-            margin: 1rem 0;
-            color: white;
-            backdrop-filter: blur(5px);
-        ">
-            <h3 style="color: {verdict_color}; text-align: center; margin-top:0;">
-                {verdict_emoji} AI/ML Verdict: {verdict_text}
-            </h3>
-            <p style="text-align: center; font-size: 0.9rem; color: #E0E0E0;">
-                {explanation}
-            </p>
-            <hr style="border-color: rgba(255, 255, 255, 0.2); margin: 15px 0;">
-            <div style="display: flex; justify-content: space-around; text-align: center;">
-                <div style="flex-basis: 50%;">
-                    <h5 style="margin-bottom: 5px; color: #A0C0FF;">System Profile</h5>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Planet Radius:</b> {planet_radius:.2f} x Earth</p>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Eq. Temperature:</b> {eq_temp_k} K ({eq_temp_c:.1f}°C)</p>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Orbital Period:</b> {orbital_period_days} days</p>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Host Star (Est.):</b> {star_type}</p>
-                </div>
-                <div style="border-left: 1px solid rgba(255, 255, 255, 0.2); height: 100px; margin: auto 0;"></div>
-                <div style="flex-basis: 50%;">
-                    <h5 style="margin-bottom: 5px; color: #A0C0FF;">Model Confidence</h5>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Probability Score:</b> {probability:.2%}</p>
-                    <p style="margin: 2px; font-size: 0.95rem;"><b>Decision Threshold:</b> {threshold:.2%}</p>
-                </div>
-            </div>
-        </div>
-        """
-        st.markdown(summary_html, unsafe_allow_html=True)
-
-        with st.expander("Full JSON response"):
-            st.json(data)
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"API error: {e}")
-        with st.expander("Payload sent)"):
-            st.json(payload)
-
     if st.button("← Back to role selection"):
-        _go_home()
\ No newline at end of file
+        _go_home()
+
+    # Rendered last so a full run (e.g. after scoring a batch) shows fresh counts.
+    with st.sidebar:
+        _stats_panel()
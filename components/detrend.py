@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+
+# Streaming detrend for light curves: divide by a centred rolling median in
+# time, then drop upward outliers (flares, cosmic rays) beyond SIGMA_UPPER
+# robust standard deviations of the local scatter. Dips are kept by default,
+# since transits are dips. The window should be ~3x the longest transit
+# sought, or the median eats into the transit depth.
+DETREND_WINDOW_DAYS = 1.0
+SIGMA_UPPER = 3.0
+SIGMA_LOWER = None
+DETREND_CHUNK_POINTS = 262_144
+
+
+def _rolling_median(offsets: pd.TimedeltaIndex, values: np.ndarray, window: pd.Timedelta) -> np.ndarray:
+    return pd.Series(values, index=offsets).rolling(window, center=True, min_periods=1).median().to_numpy()
+
+
+def iter_detrended(time, flux, flux_err=None, window_days: float = DETREND_WINDOW_DAYS,
+                   sigma_upper: float = SIGMA_UPPER, sigma_lower: float = SIGMA_LOWER,
+                   chunk_points: int = DETREND_CHUNK_POINTS):
+    """
+    Detrend a time-sorted light curve in chunks of `chunk_points`, yielding
+    (start, stop, flux, flux_err, keep) for input rows [start, stop): flux
+    divided by its trend, flux_err scaled alike (None if not given) and the
+    mask of rows that survive clipping.
+
+    Every chunk is computed with one full window of neighbouring points on
+    either side -- half a window for the trend, half for the local scatter of
+    the points at its edge -- so the output is identical to processing the
+    whole series at once, while memory stays proportional to the chunk.
+    Inputs can be memory-mapped; only the chunk being processed is read.
+    """
+    n = len(time)
+    window = pd.Timedelta(days=window_days)
+    # every chunk converts times against the same origin, so identical points
+    # land on identical nanosecond offsets (BJD itself overflows int64 ns)
+    origin = float(np.floor(time[0])) if n else 0.0
+    for start in range(0, n, chunk_points):
+        stop = min(start + chunk_points, n)
+        lo = int(np.searchsorted(time, time[start] - window_days, side="left"))
+        hi = int(np.searchsorted(time, time[stop - 1] + window_days, side="right"))
+        t = np.asarray(time[lo:hi], dtype="float64")
+        f = np.asarray(flux[lo:hi], dtype="float64")
+        offsets = pd.to_timedelta(t - origin, unit="D")
+
+        trend = _rolling_median(offsets, f, window)
+        residual = f / trend - 1.0
+        scale = 1.4826 * _rolling_median(offsets, np.abs(residual), window)
+
+        inner = slice(start - lo, stop - lo)
+        residual, scale = residual[inner], scale[inner]
+        keep = np.isfinite(residual)
+        if sigma_upper is not None:
+            keep &= residual <= sigma_upper * scale
+        if sigma_lower is not None:
+            keep &= residual >= -sigma_lower * scale
+        err = None
+        if flux_err is not None:
+            err = np.asarray(flux_err[start:stop], dtype="float64") / trend[inner]
+        yield start, stop, residual + 1.0, err, keep
+
+
+def detrend(time, flux, flux_err=None, **kwargs):
+    """(time, flux, flux_err or None) of the detrended, clipped light curve; see iter_detrended."""
+    times, fluxes, errs = [], [], []
+    for start, stop, f, err, keep in iter_detrended(time, flux, flux_err, **kwargs):
+        times.append(np.asarray(time[start:stop])[keep])
+        fluxes.append(f[keep])
+        if err is not None:
+            errs.append(err[keep])
+    if not times:
+        return np.zeros(0), np.zeros(0), None
+    return np.concatenate(times), np.concatenate(fluxes), (np.concatenate(errs) if errs else None)
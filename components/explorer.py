@@ -1,37 +1,14 @@
+import html
+import math
+
 import streamlit as st
-import base64
 import streamlit.components.v1 as components
 
+from components.assets import picture_html
+from components.catalog import get_catalog, search
 
-def _inject_green_divider_css():
-    if st.session_state.get("_green_divider_css_injected"):
-        return
-    st.session_state["_green_divider_css_injected"] = True
-    st.markdown(
-        """
-        <style>
-        .exo-divider {
-          height: 3px;
-          border: 0;
-          margin: .25rem 0 1rem 0;
-          border-radius: 999px;
-          background: linear-gradient(
-            90deg,
-            rgba(16,185,129,0) 0%,
-            rgba(16,185,129,1) 15%,
-            rgba(5,150,105,1) 50%,
-            rgba(16,185,129,1) 85%,
-            rgba(16,185,129,0) 100%
-          );
-          box-shadow: 0 0 10px rgba(16,185,129,.35);
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
 
 def green_header(text: str, level: int = 2):
-    _inject_green_divider_css()
     tag = f"h{level}"
     st.markdown(
         f"<{tag} style='margin:0'>{text}</{tag}><div class='exo-divider'></div>",
@@ -39,166 +16,133 @@ def green_header(text: str, level: int = 2):
     )
 
 
-def _img_b64(path: str) -> str:
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+GALLERY_PAGE_SIZE = 24
+GALLERY_HEIGHT = 720
+
+GALLERY_CSS = """
+  body { margin: 0; font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #f5fff7; }
+  .exo-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(210px, 1fr));
+    gap: 14px;
+    padding: 6px;
+  }
+  .exo-card { border-radius: 14px; padding: 10px; cursor: pointer; }
+  .exo-card img, .exo-orb {
+    width: 100%;
+    aspect-ratio: 1;
+    object-fit: cover;
+    display: block;
+    border-radius: 12px;
+  }
+  .exo-orb { border-radius: 50%; width: 70%; margin: 15%; box-shadow: inset -14px -10px 30px rgba(0,0,0,0.55); }
+  .exo-name { margin-top: 6px; text-align: center; color: #cfeede; font-size: 0.95rem; }
+  .exo-panel {
+    display: none;
+    margin-top: 10px;
+    border-radius: 12px;
+    background: rgba(14, 17, 23, 0.30);
+    backdrop-filter: blur(12px) saturate(120%);
+    border: 1px solid rgba(255,255,255,0.18);
+    box-shadow: 0 16px 40px rgba(0,0,0,0.45);
+    padding: 12px 14px;
+    max-height: 40vh;
+    overflow: auto;
+    line-height: 1.6;
+    font-size: 0.9rem;
+    cursor: auto;
+  }
+  .exo-card.open .exo-panel { display: block; }
+  .exo-facts { color: #cfeede; font-size: 0.85rem; }
+"""
+
+# One listener for the whole grid instead of one per card.
+GALLERY_JS = """
+  document.querySelector(".exo-grid").addEventListener("click", function(e) {
+    var card = e.target.closest(".exo-card");
+    if (card && !e.target.closest(".exo-panel")) card.classList.toggle("open");
+  });
+"""
+
+
+def _orb_style(teq_k: float) -> str:
+    """Placeholder disc for planets without artwork, tinted from blue (cold) to red (hot)."""
+    hue = 200 if math.isnan(teq_k) else int(220 - min(max((teq_k - 150) / 1850, 0.0), 1.0) * 215)
+    return f"background: radial-gradient(circle at 35% 30%, hsl({hue},70%,70%), hsl({hue},60%,30%));"
+
+
+def _planet_card(row) -> str:
+    name = html.escape(row.name)
+    if row.image:
+        art = picture_html(row.image, alt=row.name, sizes="(max-width: 700px) 45vw, 240px")
+    else:
+        art = f'<div class="exo-orb" style="{_orb_style(row.teq_K)}"></div>'
+
+    year = "" if math.isnan(row.disc_year) else f"{row.disc_year:.0f}"
+    lines = []
+    if row.title:
+        lines.append(f"<b>{name} — {html.escape(row.title)}</b>")
+    if row.summary:
+        lines.append(f"<b>Discovered {year}:</b> {html.escape(row.summary)}" if year else html.escape(row.summary))
+        year = ""
+    facts = [
+        f"Host star: {html.escape(row.host)}" if row.host else "",
+        f"Discovered {year}" if year else "",
+        f"Method: {html.escape(row.method)}" if row.method else "",
+        "" if math.isnan(row.radius_earth) else f"Radius: {row.radius_earth:.2f} × Earth",
+        "" if math.isnan(row.period_days) else f"Orbital period: {row.period_days:.2f} days",
+        "" if math.isnan(row.teq_K) else f"Eq. temperature: {row.teq_K:.0f} K",
+    ]
+    lines.append(f'<span class="exo-facts">{" · ".join(f for f in facts if f)}</span>')
+
+    return (
+        f'<div class="exo-card">{art}<div class="exo-name">{name}</div>'
+        f'<div class="exo-panel">{"<br>".join(lines)}</div></div>'
+    )
+
+
+def _gallery_html(rows) -> str:
+    cards = "".join(_planet_card(row) for row in rows.itertuples(index=False))
+    return (
+        f"<style>{GALLERY_CSS}</style><div class='exo-grid'>{cards}</div>"
+        f"<script>(function() {{{GALLERY_JS}}})();</script>"
+    )
 
 
-def _anchored_modal_card(
-    name: str,
-    img_path: str,
-    body_html: str,
-    key: str,
-    height: int = 640,
-    img_scale: float = 0.75,
-    offset_px: int = 0
-):
-    """
-    Renders a card where clicking the image toggles a glass/blur 'modal-like' panel
-    that appears directly below the image (anchored to the card). The panel scrolls
-    internally so text never gets cut off by the card height.
-    """
-    b64 = _img_b64(img_path)
-    img_width_percent = int(img_scale * 100)
-    html_block = f"""
-    <div style="max-width: 720px; margin: 0 auto; margin-top:{offset_px}px;">
-      <style>
-        .card-{key} {{
-          position: relative;  /* anchor for the panel */
-          border-radius: 14px;
-          padding: 10px;
-        }}
-        .card-{key} img {{
-          width: {img_width_percent}%;
-          display: block;
-          border-radius: 12px;
-          cursor: pointer;
-          border: none;
-          margin: 0 auto;      
-          box-shadow: none;
-        }}
-        .hint-{key} {{
-          margin-top: 8px; text-align: center; color: #cfeede; font-size: 0.9rem;
-        }}
-
-        #panel-{key} {{
-          display: none;
-          margin-top: 10px;
-          border-radius: 12px;
-          background: rgba(14, 17, 23, 0.30);
-          backdrop-filter: blur(12px) saturate(120%);
-          color: #f5fff7;
-          border: 1px solid rgba(255,255,255,0.18);
-          box-shadow: 0 16px 40px rgba(0,0,0,0.45);
-          padding: 14px 16px 16px 16px;
-        }}
-
-        #panel-content-{key} {{
-          max-height: 50vh;
-          overflow: auto;
-          line-height: 1.6;
-        }}
-
-        .panel-close-{key} {{
-          position: sticky;
-          top: 0;
-          display: inline-block;
-          margin-left: auto;
-          float: right;
-          cursor: pointer;
-          color: #cfeede;
-          font-size: 22px;
-          padding: 2px 6px;
-          border-radius: 8px;
-        }}
-        .panel-close-{key}:hover {{
-          background: rgba(255,255,255,0.08);
-        }}
-
-        
-      </style>
-
-      <div class="card-{key}">
-        <img id="img-{key}" src="data:image/png;base64,{b64}" alt="{name}">
-        
-
-        <div id="panel-{key}">
-          <span class="panel-close-{key}" id="close-{key}" title="Close">✕</span>
-          <div class="panel-arrow-{key}"></div>
-          <div id="panel-content-{key}">
-            {body_html}
-          </div>
-        </div>
-      </div>
-
-      <script>
-        (function() {{
-          const img   = document.getElementById("img-{key}");
-          const panel = document.getElementById("panel-{key}");
-          const close = document.getElementById("close-{key}");
-
-          function togglePanel() {{
-            if (!panel) return;
-            panel.style.display = (panel.style.display === "none" || !panel.style.display) ? "block" : "none";
-          }}
-
-          if (img)   img.addEventListener("click", togglePanel);
-          if (close) close.addEventListener("click", () => panel.style.display = "none");
-        }})();
-      </script>
-    </div>
-    """
-    components.html(html_block, height=height, scrolling=False)
+def _reset_gallery_page():
+    st.session_state["gallery_page"] = 1
 
 
+@st.fragment
 def show_interactive_planets():
     """
-    Displays an interactive gallery of exoplanets.
-    Clicking the image opens a modal-like pop-up panel below the picture.
+    Planet gallery driven by the catalog (see components/catalog.py). Only the
+    current page of cards is rendered, all of them in one component, and card
+    images load lazily as they scroll into view. Searching or paging reruns
+    just this fragment.
     """
-
-    PLANET_DATA = {
-        "Kepler-22b": {
-            "image": "assets/explorer/planets/Kepler-22b.png",
-            "body": """
-                <b>Kepler-22 b — Possible water world</b><br>
-                <b>Discovered 2011:</b> A possible ocean world orbiting in the habitable zone—the region around a star
-                where the temperature is right for liquid water, a requirement for life on Earth.
-            """
-        },
-        "Kepler-452b": {
-            "image": "assets/explorer/planets/Kepler-452b.png",
-            "body": """
-                <b>Kepler-452 b — Earth's older cousin</b><br>
-                <b>Discovered 2015:</b> An "Earth-cousin" that orbits a star like our sun in the habitable zone,
-                where liquid water could exist.
-            """
-        },
-        "WASP-96b": {
-            "image": "assets/explorer/planets/WASP-96b.png",
-            "body": """
-                <b>WASP-96 b — Hot and puffy with a signature of water</b><br>
-                <b>Discovered 2014:</b> An international team found that WASP-96 b is a world with a sodium rich atmosphere.
-                The planet, located nearly 1,150 light-years from Earth, orbits its star every 3.4 days. It has about half
-                the mass of Jupiter, and its discovery was announced in 2014.
-            """
-        }
-    }
-
     green_header("Featured Exoplanets", level=2)
 
-    cols = st.columns(3)
-    idx = 0
-    for name, data in PLANET_DATA.items():
-        with cols[idx]:
-            _anchored_modal_card(
-                name=name,
-                img_path=data["image"],
-                body_html=data["body"],
-                key=name.replace(" ", "_"),
-                height=720,
-            )
-        idx = (idx + 1) % 3
+    catalog = get_catalog()
+    search_col, page_col = st.columns([3, 1])
+    with search_col:
+        query = st.text_input(
+            "Search planets or host stars", key="gallery_query", on_change=_reset_gallery_page
+        )
+    matches = search(catalog, query) if query.strip() else catalog
+    pages = max(1, math.ceil(len(matches) / GALLERY_PAGE_SIZE))
+    if st.session_state.get("gallery_page", 1) > pages:
+        st.session_state["gallery_page"] = pages
+    with page_col:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key="gallery_page")
+
+    start = (page - 1) * GALLERY_PAGE_SIZE
+    shown = matches.iloc[start:start + GALLERY_PAGE_SIZE]
+    if shown.empty:
+        st.caption("No planets match this search.")
+        return
+    st.caption(f"Showing {start + 1:,}–{start + len(shown):,} of {len(matches):,} planets · click a planet for details")
+    components.html(_gallery_html(shown), height=GALLERY_HEIGHT, scrolling=True)
 
 
 def show_explorer_view():
@@ -212,54 +156,6 @@ def show_explorer_view():
     def reveal_details():
         st.session_state.show_details = True
 
-    st.markdown(
-        """
-        <style>
-          .title-container {
-            height: 85vh;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            text-align: center;
-          }
-          .big-title {
-            font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            font-size: 3.5rem;
-            font-weight: 100;
-            letter-spacing: 2px;
-            color: white;
-            text-shadow: 0 2px 8px rgba(0,0,0,0.7);
-            margin: 0;
-            padding: 0;
-          }
-          .subtitle {
-            font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            font-size: 1.1rem;
-            font-weight: 300;
-            color: rgba(255, 255, 255, 0.8);
-            margin-top: 10px;
-            margin-bottom: 40px;
-          }
-          [data-testid="stExpander"] {
-            border: none;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-          }
-          [data-testid="stExpander"] > details > summary {
-            background-color: #1a1a2e;
-            color: #ffffff;
-            border-radius: 10px;
-          }
-          [data-testid="stExpander"] > details > div {
-            background-color: #0e1117;
-            border-radius: 0 0 10px 10px;
-            padding: 1rem;
-          }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
     if not st.session_state.show_details:
         st.markdown(
             """
@@ -273,7 +169,7 @@ def show_explorer_view():
 
         _, center_col, _ = st.columns([2, 1, 2])
         with center_col:
-            st.button("Let's find out", on_click=reveal_details, use_container_width=True)
+            st.button("Let's find out", on_click=reveal_details, width="stretch")
 
     else:
         green_header("The Importance of Exoplanets", level=2)
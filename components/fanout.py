@@ -0,0 +1,76 @@
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+FANOUT_CONCURRENCY = int(os.environ.get("EXODETECT_FANOUT_CONCURRENCY", "16"))
+FANOUT_TIMEOUT_SEC = 30.0
+
+_DONE = object()
+
+
+async def _run(fn, items, concurrency: int, timeout: float, on_result):
+    """
+    Drive fn(item) for every item with at most `concurrency` calls in flight.
+    Blocking calls run on a worker pool of the same size, so the event loop
+    only schedules and enforces the per-call timeout.
+    """
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="exo-fanout")
+
+    async def one(index, item):
+        async with sem:
+            try:
+                result = await asyncio.wait_for(loop.run_in_executor(pool, fn, item), timeout)
+            except asyncio.TimeoutError:
+                result = {"error": f"timed out after {timeout:g}s"}
+            except Exception as e:
+                result = {"error": str(e)}
+        on_result(index, result)
+
+    try:
+        await asyncio.gather(*(one(i, item) for i, item in enumerate(items)))
+    finally:
+        # Timed-out calls are abandoned rather than awaited; their own socket
+        # timeout reclaims the worker thread.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_concurrent(fn, items, concurrency: int = FANOUT_CONCURRENCY, timeout: float = FANOUT_TIMEOUT_SEC):
+    """
+    Yield (index, result) pairs as calls complete, in completion order.
+
+    The event loop lives on a background thread, so the Streamlit script
+    thread only drains a queue and can update progress between results.
+    Failed or timed-out calls yield {"error": "..."} instead of raising.
+    """
+    items = list(items)
+    if not items:
+        return
+    results = queue.Queue()
+
+    def worker():
+        try:
+            asyncio.run(_run(fn, items, max(1, concurrency), timeout, lambda i, r: results.put((i, r))))
+        finally:
+            results.put(_DONE)
+
+    threading.Thread(target=worker, name="exo-fanout-loop", daemon=True).start()
+    while True:
+        entry = results.get()
+        if entry is _DONE:
+            return
+        yield entry
+
+
+def map_concurrent(fn, items, concurrency: int = FANOUT_CONCURRENCY, timeout: float = FANOUT_TIMEOUT_SEC) -> list:
+    """Like iter_concurrent, but return all results in input order."""
+    items = list(items)
+    ordered = [None] * len(items)
+    for index, result in iter_concurrent(fn, items, concurrency, timeout):
+        ordered[index] = result
+    return ordered
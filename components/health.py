@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, perf_counter
+
+import numpy as np
+import requests
+import streamlit as st
+
+
+# Background health checks for the /predict replicas (Colab/tunnel copies of
+# the same backend). One thread per process probes every endpoint in use on a
+# fixed interval, so a session routing a call only reads the latest results
+# and never waits on a dead endpoint itself.
+BACKEND_URLS = [url.strip() for url in os.environ.get("EXODETECT_BACKEND_URLS", "").split(",") if url.strip()]
+HEALTH_INTERVAL_SEC = float(os.environ.get("EXODETECT_HEALTH_INTERVAL_SEC", "5"))
+HEALTH_TIMEOUT_SEC = 3.0
+HEALTH_WINDOW = 20  # probes kept per endpoint
+DEGRADED_ERROR_RATE = 0.2
+IDLE_FORGET_SEC = 600.0  # endpoints no session asked for in this long are no longer probed
+
+# best first; ties are broken by median probe latency
+STATES = ("up", "degraded", "unknown", "down")
+
+_log = logging.getLogger(__name__)
+
+
+def _normalize(url: str) -> str:
+    return url.strip().rstrip("/")
+
+
+class EndpointHealth:
+    """Rolling window of probe outcomes for one endpoint."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.samples = deque(maxlen=HEALTH_WINDOW)  # (ok, latency_sec)
+        self.checked = 0.0  # monotonic time of the last outcome
+        self.error = ""
+
+    def record(self, ok: bool, latency: float = np.nan, error: str = ""):
+        self.samples.append((ok, latency))
+        self.checked = monotonic()
+        self.error = "" if ok else error
+
+    @property
+    def error_rate(self) -> float:
+        return sum(not ok for ok, _ in self.samples) / len(self.samples) if self.samples else np.nan
+
+    @property
+    def latency_ms(self) -> float:
+        """Median latency of the successful probes in the window."""
+        latencies = [latency for ok, latency in self.samples if ok and np.isfinite(latency)]
+        return float(np.median(latencies)) * 1000 if latencies else np.nan
+
+    @property
+    def state(self) -> str:
+        if not self.samples:
+            return "unknown"
+        if not self.samples[-1][0]:
+            return "down"
+        return "degraded" if self.error_rate >= DEGRADED_ERROR_RATE else "up"
+
+    def rank(self) -> tuple:
+        latency = self.latency_ms
+        return STATES.index(self.state), latency if np.isfinite(latency) else np.inf
+
+
+class HealthMonitor:
+    """
+    Probes every watched endpoint each `interval` seconds (all at once, with
+    a short timeout and no retries) and ranks endpoints for routing. Calls
+    that fail in real use are recorded too, so a replica that dies between
+    probes is skipped from the next call on.
+    """
+
+    def __init__(self, urls=BACKEND_URLS, interval: float = HEALTH_INTERVAL_SEC, timeout: float = HEALTH_TIMEOUT_SEC):
+        self.interval = interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._endpoints = {}  # url -> EndpointHealth
+        self._wanted = {}  # url -> monotonic time a session last asked for it
+        self._pinned = {_normalize(url) for url in urls}
+        self._session = requests.Session()  # the shared pool retries; a probe measures one attempt
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="exo-health")
+        self.watch(self._pinned)
+        threading.Thread(target=self._loop, name="exo-health-loop", daemon=True).start()
+
+    def watch(self, urls):
+        """Start (or keep) probing these endpoints; new ones are probed right away."""
+        now = monotonic()
+        added = False
+        with self._lock:
+            for url in map(_normalize, urls):
+                if url not in self._endpoints:
+                    self._endpoints[url] = EndpointHealth(url)
+                    added = True
+                self._wanted[url] = now
+        if added:
+            self._wake.set()
+
+    def probe_now(self):
+        """Ask for an immediate round of probes without waiting for it."""
+        self._wake.set()
+
+    def record_failure(self, url: str, error: str):
+        """A real call to `url` failed: mark it down until a probe succeeds."""
+        with self._lock:
+            endpoint = self._endpoints.get(_normalize(url))
+            if endpoint is not None:
+                endpoint.record(False, error=error)
+                self._changed.notify_all()
+
+    def ranked(self, urls, wait: float = 0.0) -> list:
+        """
+        `urls` best first: up, then degraded, then not yet probed, then down;
+        faster first within each. While none is known to be up and some are
+        still unprobed (e.g. just after start), wait up to `wait` seconds for
+        the first probes rather than guess.
+        """
+        urls = list(dict.fromkeys(map(_normalize, urls)))
+        self.watch(urls)
+        deadline = monotonic() + wait
+        with self._changed:
+            while True:
+                states = {self._endpoints[url].state for url in urls}
+                remaining = deadline - monotonic()
+                if "unknown" not in states or states & {"up", "degraded"} or remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return sorted(urls, key=lambda url: self._endpoints[url].rank())
+
+    def snapshot(self, urls) -> list:
+        """Display rows for `urls`: url, state, median latency (ms), error rate, seconds since the last check, error."""
+        now = monotonic()
+        with self._lock:
+            endpoints = [self._endpoints.get(_normalize(url)) for url in urls]
+            return [
+                {
+                    "url": e.url, "state": e.state, "latency_ms": e.latency_ms, "error_rate": e.error_rate,
+                    "age_sec": now - e.checked if e.checked else np.nan, "error": e.error,
+                }
+                for e in endpoints if e is not None
+            ]
+
+    def _probe(self, url: str):
+        started = perf_counter()
+        try:
+            response = self._session.get(f"{url}/", timeout=self.timeout)
+            ok, error = response.status_code < 500, f"HTTP {response.status_code}"
+        except Exception as e:  # also malformed URLs (urllib3's LocationParseError is no RequestException)
+            ok, error = False, type(e).__name__
+        latency = perf_counter() - started
+        with self._lock:
+            endpoint = self._endpoints.get(url)  # None if forgotten while probing
+            if endpoint is not None:
+                endpoint.record(ok, latency, error)
+            self._changed.notify_all()
+
+    def _targets(self) -> list:
+        now = monotonic()
+        with self._lock:
+            for url, wanted in list(self._wanted.items()):
+                if url not in self._pinned and now - wanted > IDLE_FORGET_SEC:
+                    del self._wanted[url], self._endpoints[url]
+            return list(self._endpoints)
+
+    def _loop(self):
+        while True:
+            self._wake.clear()
+            try:
+                list(self._pool.map(self._probe, self._targets()))
+            except Exception:  # keep probing: every session's routing depends on this thread
+                _log.exception("health probe round failed")
+            self._wake.wait(self.interval)
+
+
+@st.cache_resource(show_spinner=False)
+def get_health_monitor() -> HealthMonitor:
+    """Process-wide monitor shared by every session."""
+    return HealthMonitor()
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import re
+import threading
+import time as _time
+
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+
+
+# Uploaded light curves, one uncompressed Arrow IPC file per target. Columns
+# are contiguous arrays, so a file is memory-mapped and read without copying:
+# every session inspecting a target shares the same pages of the OS cache
+# instead of holding its own copy of the series.
+LIGHT_CURVE_DIR = os.environ.get("EXODETECT_LIGHTCURVE_DIR", ".cache/lightcurves")
+# Each put prunes files older than the TTL, then the least recently written
+# ones until the directory fits in the size cap. Removing a file another
+# session has mapped is safe: its pages stay readable until unmapped.
+LIGHT_CURVE_TTL_SEC = float(os.environ.get("EXODETECT_LIGHTCURVE_TTL_SEC", str(30 * 24 * 3600)))
+LIGHT_CURVE_MAX_MB = float(os.environ.get("EXODETECT_LIGHTCURVE_MAX_MB", "2048"))
+# time needs float64 (BJD ~ 2.46e6 at sub-second resolution); float32 keeps
+# normalised flux to ~0.1 ppm
+COLUMN_TYPES = {"time": pa.float64(), "flux": pa.float32(), "flux_err": pa.float32()}
+
+
+def _file_name(target_id: str) -> str:
+    """Filesystem-safe, collision-free file name for a target ID."""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", target_id).strip("._")[:60] or "target"
+    return f"{slug}-{hashlib.sha256(target_id.encode()).hexdigest()[:10]}.arrow"
+
+
+class LightCurve:
+    """Read-only views of one stored light curve (sorted by time, flux normalised to ~1)."""
+
+    def __init__(self, target_id: str, time, flux, flux_err=None, source: str = "", meta: dict = None):
+        self.target_id = target_id
+        self.time = time
+        self.flux = flux
+        self.flux_err = flux_err
+        self.source = source
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.time)
+
+    def window(self, t_min: float, t_max: float) -> "LightCurve":
+        """The points with t_min <= time < t_max, as views into the same buffers."""
+        lo, hi = np.searchsorted(self.time, [t_min, t_max])
+        err = self.flux_err[lo:hi] if self.flux_err is not None else None
+        return LightCurve(self.target_id, self.time[lo:hi], self.flux[lo:hi], err, self.source, self.meta)
+
+
+class LightCurveStore:
+    """
+    Directory of memory-mapped light curves keyed by target ID. Opened files
+    are kept per process and reopened only when a target is written again.
+    The directory is capped by age (`ttl_sec`) and total size (`max_bytes`).
+    """
+
+    def __init__(self, root: str = LIGHT_CURVE_DIR, ttl_sec: float = LIGHT_CURVE_TTL_SEC,
+                 max_bytes: int = int(LIGHT_CURVE_MAX_MB * 1024 * 1024)):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._open = {}  # file name -> (mtime_ns, LightCurve)
+
+    def put(self, target_id: str, time, flux, flux_err=None, source: str = "", derived_from: str = "",
+            meta: dict = None) -> LightCurve:
+        """
+        Write (or replace) a target's light curve; readers of the old version
+        keep their mapping. Series computed from another target (e.g. its
+        detrended version) name it in `derived_from` and are not listed by
+        targets(); replacing a target removes the series derived from it.
+        `meta` adds string metadata.
+        """
+        columns = {"time": time, "flux": flux}
+        if flux_err is not None:
+            columns["flux_err"] = flux_err
+        table = pa.table(
+            {name: pa.array(np.asarray(values), type=COLUMN_TYPES[name]) for name, values in columns.items()},
+        ).replace_schema_metadata({
+            **(meta or {}), "target_id": target_id, "source": source, "derived_from": derived_from,
+            "written": str(_time.time_ns()),
+        })
+        path = os.path.join(self.root, _file_name(target_id))
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        with self._lock:
+            self._open.pop(_file_name(target_id), None)
+        self._prune(keep={target_id, derived_from}, replaced="" if derived_from else target_id)
+        return self.get(target_id)
+
+    def delete(self, target_id: str):
+        """Remove a target and the series derived from it; unknown targets are ignored."""
+        for entry in self._entries():
+            if target_id in (entry["target_id"], entry["derived_from"]):
+                self._remove(entry["name"])
+
+    def _remove(self, name: str):
+        with self._lock:
+            self._open.pop(name, None)
+        try:
+            os.remove(os.path.join(self.root, name))
+        except OSError:  # already gone, or still mapped on Windows
+            pass
+
+    def _prune(self, keep: set, replaced: str = ""):
+        """Drop series derived from `replaced`, expired files, then the oldest beyond the size cap."""
+        cutoff = _time.time_ns() - int(self.ttl_sec * 1e9)
+        total = 0
+        kept = []
+        for entry in self._entries():
+            if entry["target_id"] in keep:
+                total += entry["size"]
+            elif (replaced and entry["derived_from"] == replaced) or entry["mtime"] < cutoff:
+                self._remove(entry["name"])
+            else:
+                total += entry["size"]
+                kept.append(entry)
+        for entry in sorted(kept, key=lambda e: e["mtime"]):
+            if total <= self.max_bytes:
+                break
+            self._remove(entry["name"])
+            total -= entry["size"]
+
+    def _entries(self) -> list:
+        """Metadata of every readable stored file."""
+        entries = []
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith(".arrow"):
+                continue
+            try:
+                metadata = pa.ipc.open_file(pa.memory_map(entry.path, "r")).schema.metadata
+                stat = entry.stat()
+                entries.append({
+                    "name": entry.name, "target_id": metadata[b"target_id"].decode(),
+                    "derived_from": metadata.get(b"derived_from", b"").decode(),
+                    "mtime": stat.st_mtime_ns, "size": stat.st_size,
+                })
+            except (OSError, KeyError, TypeError, pa.ArrowInvalid):
+                continue
+        return entries
+
+    def get(self, target_id: str):
+        """
+        The target's LightCurve, or None when it isn't stored, including when
+        it was pruned or deleted after targets() listed it.
+        """
+        name = _file_name(target_id)
+        path = os.path.join(self.root, name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with self._lock:
+                cached = self._open.get(name)
+                if cached and cached[0] == mtime:
+                    return cached[1]
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        except OSError:
+            with self._lock:
+                self._open.pop(name, None)
+            return None
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        views = {
+            c: table.column(c).chunk(0).to_numpy(zero_copy_only=True) if table.num_rows else np.zeros(0)
+            for c in table.column_names
+        }
+        curve = LightCurve(meta.get("target_id", target_id), views["time"], views["flux"],
+                           views.get("flux_err"), meta.get("source", ""), meta)
+        with self._lock:
+            self._open[name] = (mtime, curve)
+        return curve
+
+    def __contains__(self, target_id: str) -> bool:
+        return os.path.exists(os.path.join(self.root, _file_name(target_id)))
+
+    def targets(self) -> list:
+        """Stored (not derived) target IDs, most recently written first."""
+        entries = [(e["mtime"], e["target_id"]) for e in self._entries() if not e["derived_from"]]
+        return [target for _, target in sorted(entries, reverse=True)]
+
+
+@st.cache_resource(show_spinner=False)
+def get_light_curve_store() -> LightCurveStore:
+    """Process-wide store shared by every session."""
+    return LightCurveStore()
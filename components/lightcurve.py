@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+# accepted column names (case-insensitive), in order of preference; the
+# uppercase ones are what Kepler/TESS light-curve products export
+TIME_COLUMNS = ("time", "bjd", "btjd", "bkjd")
+FLUX_COLUMNS = ("flux", "pdcsap_flux", "sap_flux")
+FLUX_ERR_COLUMNS = ("flux_err", "pdcsap_flux_err", "sap_flux_err")
+
+
+def _pick(columns: dict, names):
+    return next((columns[n] for n in names if n in columns), None)
+
+
+def read_light_curve(uploaded_file):
+    """
+    Read a light curve from CSV or Parquet with time (days), flux and an
+    optional flux_err column. Returns (time, flux, flux_err or None) sorted by
+    time, without non-finite rows, flux (and flux_err) divided by the median flux.
+    """
+    name = getattr(uploaded_file, "name", "") or ""
+    if name.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(uploaded_file)
+    else:
+        df = pd.read_csv(uploaded_file, comment="#")
+    columns = {c.lower(): c for c in df.columns}
+    time_col, flux_col = _pick(columns, TIME_COLUMNS), _pick(columns, FLUX_COLUMNS)
+    err_col = _pick(columns, FLUX_ERR_COLUMNS)
+    if time_col is None or flux_col is None:
+        raise ValueError("Light curve needs a time and a flux column (flux_err optional).")
+
+    time = pd.to_numeric(df[time_col], errors="coerce").to_numpy("float64")
+    flux = pd.to_numeric(df[flux_col], errors="coerce").to_numpy("float64")
+    flux_err = pd.to_numeric(df[err_col], errors="coerce").to_numpy("float64") if err_col else None
+    ok = np.isfinite(time) & np.isfinite(flux)
+    if flux_err is not None:
+        ok &= np.isfinite(flux_err) & (flux_err > 0)
+    order = np.argsort(time[ok], kind="stable")
+    time, flux = time[ok][order], flux[ok][order]
+    flux_err = flux_err[ok][order] if flux_err is not None else None
+    if len(time) == 0:
+        raise ValueError("Light curve has no valid rows.")
+
+    scale = np.median(flux)
+    if scale == 0:
+        raise ValueError("Median flux is zero; cannot normalise.")
+    return time, flux / scale, (flux_err / abs(scale) if flux_err is not None else None)
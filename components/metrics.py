@@ -0,0 +1,41 @@
+import threading
+from collections import defaultdict, deque
+
+import streamlit as st
+
+
+WINDOW = 500
+
+
+class Metrics:
+    """Rolling windows of recent measurements (e.g. timings in ms), shared by every session."""
+
+    def __init__(self, window: int = WINDOW):
+        self._lock = threading.Lock()
+        self._values = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, name: str, value: float):
+        with self._lock:
+            self._values[name].append(float(value))
+
+    def summary(self, name: str) -> dict:
+        """{"count", "last", "p50", "p95"} over the window, or {} if nothing was recorded."""
+        with self._lock:
+            values = list(self._values.get(name, ()))
+        if not values:
+            return {}
+        ordered = sorted(values)
+
+        def pick(q):
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return {"count": len(values), "last": values[-1], "p50": pick(0.50), "p95": pick(0.95)}
+
+    def names(self) -> list:
+        with self._lock:
+            return sorted(self._values)
+
+
+@st.cache_resource(show_spinner=False)
+def get_metrics() -> Metrics:
+    return Metrics()
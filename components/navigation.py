@@ -0,0 +1,73 @@
+import logging
+import time
+
+import streamlit as st
+
+from components.assets import background_css
+from components.metrics import get_metrics
+
+
+TRANSITION_DURATION_SEC = 0.85
+
+_log = logging.getLogger(__name__)
+
+
+def start_transition(target_role: str):
+    """
+    Button callback: switch to target_role on this very rerun. The zoom
+    plays in the browser on the destination page instead of the script
+    thread sleeping through it.
+    """
+    st.session_state.transition_target = target_role
+    st.session_state.play_transition = True
+    st.session_state.nav_started_at = time.perf_counter()
+
+
+def play_entry_transition():
+    """
+    On the first run after a role switch, cover the new page with the home
+    background and let the browser zoom it out of the way. The overlay
+    ignores pointer events, so the page underneath is usable right away.
+    It resolves to the same WebP variant the home page already loaded.
+    """
+    if not st.session_state.pop("play_transition", False):
+        return
+    try:
+        home_css = background_css("backgrounds/home.jpeg", ".stApp::after")
+    except OSError:
+        return
+    st.markdown(
+        f"""
+        <style>
+        .stApp::after {{
+            content: "";
+            position: fixed;
+            inset: 0;
+            z-index: 999999;
+            pointer-events: none;
+            transform-origin: center right;
+            animation: zoomRight {TRANSITION_DURATION_SEC}s ease forwards;
+        }}
+        {home_css}
+        @keyframes zoomRight {{
+            from {{ transform: scale(1) translateX(0); opacity: 1; }}
+            70% {{ opacity: 1; }}
+            to {{ transform: scale(2) translateX(4vw); opacity: 0; visibility: hidden; }}
+        }}
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def record_time_to_interactive():
+    """
+    Call at the end of a destination page's script. Records how long the
+    server took from the role button's click to a fully rendered page.
+    """
+    started = st.session_state.pop("nav_started_at", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    get_metrics().record("navigation.time_to_interactive_ms", elapsed_ms)
+    _log.info("Role navigation time-to-interactive: %.1f ms", elapsed_ms)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+
+# Phase-folded transit view: every point is folded at the candidate's period
+# and epoch, reduced to a binned profile with bincount, and only a fixed
+# budget of points is ever sent to the browser, whatever the light curve size.
+PROFILE_BINS = 120
+RAW_POINTS = 2500
+WINDOW_DURATIONS = 3.0  # half-width of the view, in transit durations
+
+
+def fold_hours(time, period_days: float, t0: float) -> np.ndarray:
+    """Time from the nearest mid-transit, in hours, for every point."""
+    cycles = (np.asarray(time, dtype="float64") - t0) / period_days + 0.5
+    cycles -= np.floor(cycles)
+    cycles -= 0.5
+    cycles *= period_days * 24.0
+    return cycles
+
+
+def transit_view(time, flux, period_days: float, t0: float, duration_hours: float,
+                 bins: int = PROFILE_BINS, raw_points: int = RAW_POINTS):
+    """
+    Fold a light curve and cut it to +-WINDOW_DURATIONS transit durations
+    (at most half a period). Returns (binned profile, downsampled points,
+    half-width in hours): the profile has one row per non-empty bin with
+    the mean flux, its standard error and the point count; the points are
+    an even stride through the window, at most `raw_points` of them.
+    """
+    half = min(WINDOW_DURATIONS * duration_hours, period_days * 12.0)
+    offset = fold_hours(time, period_days, t0)
+    inside = np.flatnonzero(np.abs(offset) < half)
+    offset = offset[inside]
+    flux = np.asarray(flux)[inside].astype("float64")
+    reference = float(flux.mean()) if len(flux) else 0.0
+    residual = flux - reference  # sums of squares of ~1.0 would cancel catastrophically
+
+    index = np.minimum(((offset + half) / (2.0 * half) * bins).astype("int64"), bins - 1)
+    count = np.bincount(index, minlength=bins)
+    total = np.bincount(index, weights=residual, minlength=bins)
+    squares = np.bincount(index, weights=residual * residual, minlength=bins)
+    filled = count > 0
+    mean = total[filled] / count[filled]
+    variance = np.maximum(squares[filled] / count[filled] - mean * mean, 0.0)
+    mean += reference
+    centre = (np.flatnonzero(filled) + 0.5) / bins * 2.0 * half - half
+    profile = pd.DataFrame({
+        "hours": centre,
+        "flux": mean,
+        "error": np.sqrt(variance / np.maximum(count[filled] - 1, 1)),
+        "count": count[filled],
+    })
+
+    step = max(1, -(-len(offset) // raw_points))
+    points = pd.DataFrame({"hours": offset[::step], "flux": flux[::step]})
+    return profile, points, half
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+G_cgs = 6.67430e-8             # cm^3 g^-1 s^-2
+R_sun_cm = 6.957e10            # cm
+R_sun_AU = 0.00465047          # AU
+R_earth_cm = 6371e5            # cm
+M_sun_g = 1.98847e33           # g
+sigma_sb_cgs = 5.670374419e-5  # erg cm^-2 s^-1 K^-4
+T_sun_K = 5772.0
+
+# Every helper takes scalars or arrays (whole candidate columns) and returns
+# float64 arrays. Inputs that are non-positive or non-finite, which is what an
+# untouched form field or a blank CSV cell looks like, give NaN in that row
+# instead of raising, so one bad row never stops a batch.
+
+
+def _positive(*arrays):
+    """Broadcast inputs to float64 and return them with a mask of rows where all are finite and > 0."""
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in arrays))
+    ok = np.ones(arrays[0].shape, dtype=bool)
+    for a in arrays:
+        ok &= np.isfinite(a) & (a > 0)
+    return arrays, ok
+
+
+def stellar_mass_from_logg_R(logg_cgs, R_solar):
+    """Return stellar mass in solar masses from log g (cgs) and radius in solar radii."""
+    (logg_cgs, R_solar), ok = _positive(logg_cgs, R_solar)
+    with np.errstate(over="ignore", invalid="ignore"):
+        g = np.power(10.0, logg_cgs)            # cm s^-2
+        M_g = g * (R_solar * R_sun_cm) ** 2 / G_cgs
+    return np.where(ok, M_g / M_sun_g, np.nan)
+
+
+def a_from_Teq_Teff_Rstar(Teq_K, Teff_K, R_solar):
+    """
+    Equilibrium temperature (A=0, full redistribution):
+    Teq = Teff * sqrt(R*/(2a))  => a = R*/[2*(Teq/Teff)^2]
+    Returns a in AU.
+    """
+    (Teq_K, Teff_K, R_solar), ok = _positive(Teq_K, Teff_K, R_solar)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = Teq_K / Teff_K
+        a_over_Rstar = 1.0 / (2.0 * ratio * ratio)   # a / R*
+    return np.where(ok, a_over_Rstar * (R_solar * R_sun_AU), np.nan)
+
+
+def period_from_kepler(a_AU, M_star_solar):
+    """Kepler's 3rd law in solar units: P[yr]^2 = a[AU]^3 / M[Msun]. Returns days."""
+    (a_AU, M_star_solar), ok = _positive(a_AU, M_star_solar)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        P_years = np.sqrt(a_AU ** 3 / M_star_solar)
+    return np.where(ok, P_years * 365.25, np.nan)
+
+
+def depth_from_radii(Rp_Re, Rstar_Rsun):
+    """Transit depth (fraction) ≈ (Rp/R*)^2 using Earth & Solar radii."""
+    (Rp_Re, Rstar_Rsun), ok = _positive(Rp_Re, Rstar_Rsun)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Rp_over_Rstar = (Rp_Re * (R_earth_cm / R_sun_cm)) / Rstar_Rsun
+    return np.where(ok, Rp_over_Rstar ** 2, np.nan)
+
+
+def flux_rel_earth(Teff_K, Rstar_Rsun, a_AU):
+    """S/S_earth = (L*/Lsun) / a^2 with L ∝ R^2 T^4."""
+    (Teff_K, Rstar_Rsun, a_AU), ok = _positive(Teff_K, Rstar_Rsun, a_AU)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        L_rel = Rstar_Rsun ** 2 * (Teff_K / T_sun_K) ** 4
+        S = L_rel / a_AU ** 2
+    return np.where(ok, S, np.nan)
+
+
+def central_transit_duration_hours(P_days, a_AU, Rstar_Rsun):
+    """
+    Approx central transit duration for b≈0, small Rp:
+    T ≈ (P/π) * arcsin(R*/a)  ~ (P/π)(R/a) for small angles.
+    Returns hours.
+    """
+    (P_days, a_AU, Rstar_Rsun), ok = _positive(P_days, a_AU, Rstar_Rsun)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.minimum(1.0, (Rstar_Rsun * R_sun_AU) / a_AU)
+        T_days = (P_days / np.pi) * np.arcsin(x)
+    return np.where(ok, T_days * 24.0, np.nan)
+
+
+def rel_err(x, y):
+    """|x - y| / |y|, or inf where either side is missing or y is zero."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.isfinite(x) & np.isfinite(y) & (y != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        err = np.abs(x - y) / np.abs(y)
+    return np.where(ok, err, np.inf)
+
+
+def derive_quantities(columns) -> dict:
+    """
+    Derive orbit and transit quantities for a whole table of candidates.
+    `columns` maps the /predict payload field names to scalars or arrays
+    (a dict of lists, a DataFrame, ...). Returns a dict of float64 arrays:
+    stellar mass, semi-major axis, and the period, depth (ppm), insolation
+    and central duration implied by the stellar and planetary parameters.
+    """
+    mass = stellar_mass_from_logg_R(columns["logg_cgs"], columns["rstar_rsun"])
+    a_AU = a_from_Teq_Teff_Rstar(columns["teq_K"], columns["teff_star_K"], columns["rstar_rsun"])
+    return {
+        "mstar_msun": mass,
+        "a_AU": a_AU,
+        "period_days": period_from_kepler(a_AU, mass),
+        "transit_depth_ppm": depth_from_radii(columns["radius_earth"], columns["rstar_rsun"]) * 1e6,
+        "S_earth": flux_rel_earth(columns["teff_star_K"], columns["rstar_rsun"], a_AU),
+        "duration_hours": central_transit_duration_hours(columns["period_days"], a_AU, columns["rstar_rsun"]),
+    }
@@ -0,0 +1,230 @@
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+import requests
+import streamlit as st
+
+from components.backend import PAYLOAD_FIELDS, build_headers, predict, predict_rows
+from components.breaker import CircuitOpenError, endpoint_failed, get_circuit_breakers
+from components.cache import MODEL_VERSION, get_prediction_cache, payload_key
+from components.health import HEALTH_TIMEOUT_SEC, get_health_monitor
+from components.ratelimit import RATE_LIMIT_WAIT_SEC, acquire
+
+
+# written by tools/train_local_model.py from the NASA KOI table
+LOCAL_MODEL_PATH = os.environ.get("EXODETECT_LOCAL_MODEL", "models/local_model.npz")
+
+
+class Predictor(ABC):
+    """
+    Something that scores /predict payloads. Every implementation answers
+    with the backend's response shape: {"probability", "threshold", "echo"}.
+    """
+
+    name = "predictor"
+
+    @abstractmethod
+    def predict(self, payload: dict) -> dict:
+        """Score one payload."""
+
+    def predict_rows(self, rows: list) -> list:
+        """Score many payloads; failures come back as {"error": "..."} entries."""
+        return [self.predict(row) for row in rows]
+
+    def lookup(self, rows: list) -> list:
+        """Already-known responses without scoring anything: one response or None per row."""
+        return [None] * len(rows)
+
+
+class HttpPredictor(Predictor):
+    """
+    The remote Colab/Cloudflare /predict backend, behind the shared pool,
+    cache and single-flight; every request it sends is counted by `breaker`.
+    """
+
+    def __init__(self, api_url: str, api_token: str = "", model_version: str = MODEL_VERSION,
+                 cache_scope: str = None, breaker=None):
+        self.api_url = api_url
+        self.headers = build_headers(api_token)
+        self.model_version = model_version
+        self.cache_scope = cache_scope or api_url
+        self.breaker = breaker
+        self.name = api_url
+
+    def predict(self, payload: dict) -> dict:
+        return predict(self.api_url, payload, self.headers, self.model_version, self.cache_scope, self.breaker)
+
+    def predict_rows(self, rows: list) -> list:
+        return predict_rows(self.api_url, rows, self.headers, self.model_version, self.cache_scope, self.breaker)
+
+    def lookup(self, rows: list) -> list:
+        keys = [payload_key(row, self.cache_scope, self.model_version) for row in rows]
+        return get_prediction_cache().get_many(keys)
+
+
+class RoutedPredictor(Predictor):
+    """
+    Replicas of the HTTP backend behind the process-wide health monitor:
+    each call goes to the healthiest, fastest replica and moves on to the
+    next one on a connection error, timeout or gateway error. Replicas serve
+    the same model, so they share cache entries.
+    """
+
+    def __init__(self, api_urls: list, api_token: str = "", model_version: str = MODEL_VERSION):
+        urls = list(dict.fromkeys(url.strip().rstrip("/") for url in api_urls if url.strip()))
+        self.monitor = get_health_monitor()
+        scope = urls[0] if len(urls) == 1 else ",".join(sorted(urls))
+        breakers = get_circuit_breakers()
+        self.replicas = {
+            url: HttpPredictor(url, api_token, model_version, cache_scope=scope, breaker=breakers.get(url))
+            for url in urls
+        }
+        self.name = self.monitor.ranked(urls)[0]
+
+    def _call(self, method: str, arg):
+        """
+        Try the replicas best first. Replicas whose circuit is open are
+        skipped without a request; the call fails fast with CircuitOpenError
+        when every circuit is open. Each replica's breaker counts the
+        requests it actually sends (one per row in the per-row fallback).
+        """
+        error = None
+        # ranked per call, so a replica that fails mid-batch is tried last from the next chunk on
+        for url in self.monitor.ranked(self.replicas, wait=HEALTH_TIMEOUT_SEC):
+            replica = self.replicas[url]
+            if replica.breaker.skip():
+                error = error or replica.breaker.open_error()
+                continue
+            try:
+                result = getattr(replica, method)(arg)
+            except CircuitOpenError as e:  # half-open, with another call's trial in flight
+                error = error or e
+                continue
+            except requests.exceptions.RequestException as e:
+                if not endpoint_failed(e):
+                    raise  # the backend answered; the request itself was refused
+                error = e
+            else:
+                self.name = url
+                return result
+            status = getattr(error.response, "status_code", None)
+            self.monitor.record_failure(url, f"HTTP {status}" if status else type(error).__name__)
+        raise error
+
+    def predict(self, payload: dict) -> dict:
+        return self._call("predict", payload)
+
+    def predict_rows(self, rows: list) -> list:
+        return self._call("predict_rows", rows)
+
+    def lookup(self, rows: list) -> list:
+        return next(iter(self.replicas.values())).lookup(rows)
+
+
+class LocalModel:
+    """
+    A small feed-forward classifier evaluated with NumPy.
+
+    Serialized as an .npz holding `mean`, `scale` (feature standardization in
+    PAYLOAD_FIELDS order), `log_mask` (features log10-transformed first),
+    `threshold`, and dense layers `W0, b0, W1, b1, ...`. Hidden layers use
+    ReLU and the last layer a sigmoid, so a single layer is plain logistic
+    regression.
+    """
+
+    def __init__(self, mean, scale, log_mask, layers, threshold: float):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.log_mask = np.asarray(log_mask, dtype=bool)
+        self.layers = [(np.asarray(W, dtype=np.float64), np.asarray(b, dtype=np.float64)) for W, b in layers]
+        self.threshold = float(threshold)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalModel":
+        with np.load(path) as data:
+            layers = []
+            while f"W{len(layers)}" in data:
+                i = len(layers)
+                layers.append((data[f"W{i}"], data[f"b{i}"]))
+            return cls(data["mean"], data["scale"], data["log_mask"], layers, float(data["threshold"]))
+
+    def save(self, path: str):
+        arrays = {"mean": self.mean, "scale": self.scale, "log_mask": self.log_mask,
+                  "threshold": np.float64(self.threshold)}
+        for i, (W, b) in enumerate(self.layers):
+            arrays[f"W{i}"] = W
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    def probabilities(self, X: np.ndarray) -> np.ndarray:
+        """Score an (n, 12) matrix of payload features in one pass."""
+        X = np.array(X, dtype=np.float64, copy=True)
+        X[:, self.log_mask] = np.log10(np.clip(X[:, self.log_mask], 1e-12, None))
+        h = (X - self.mean) / self.scale
+        for i, (W, b) in enumerate(self.layers):
+            h = h @ W + b
+            if i < len(self.layers) - 1:
+                h = np.maximum(h, 0.0)
+        return 1.0 / (1.0 + np.exp(-np.clip(h.reshape(-1), -500.0, 500.0)))
+
+
+@st.cache_resource(show_spinner=False)
+def load_local_model(path: str, mtime: float) -> LocalModel:
+    """Load the weights once per process (reloaded only when the file changes)."""
+    return LocalModel.load(path)
+
+
+class LocalPredictor(Predictor):
+    """In-process model: no network, the whole batch scored as one matrix."""
+
+    def __init__(self, path: str = LOCAL_MODEL_PATH):
+        self.model = load_local_model(path, os.path.getmtime(path))
+        self.name = f"local:{path}"
+
+    def predict(self, payload: dict) -> dict:
+        return self.predict_rows([payload])[0]
+
+    def predict_rows(self, rows: list) -> list:
+        if not rows:
+            return []
+        X = np.array([[float(row.get(f, 0.0)) for f in PAYLOAD_FIELDS] for row in rows], dtype=np.float64)
+        probabilities = self.model.probabilities(X)
+        return [
+            {"probability": float(p), "threshold": self.model.threshold, "echo": row}
+            for p, row in zip(probabilities, rows)
+        ]
+
+
+class RateLimitedPredictor(Predictor):
+    """
+    A predictor whose batches first take one token per uncached row from
+    every given bucket; cached rows are answered without touching the
+    limits. A batch that can't get its tokens within RATE_LIMIT_WAIT_SEC
+    comes back as {"error": "..."} rows without reaching the backend.
+    """
+
+    def __init__(self, predictor: Predictor, buckets: list, timeout: float = RATE_LIMIT_WAIT_SEC):
+        self.predictor = predictor
+        self.buckets = buckets
+        self.timeout = timeout
+        self.name = predictor.name
+
+    def predict(self, payload: dict) -> dict:
+        return self.predictor.predict(payload)
+
+    def predict_rows(self, rows: list) -> list:
+        results = self.predictor.lookup(rows)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        if not acquire(self.buckets, len(pending), self.timeout):
+            fresh = [{"error": "rate limited: too many rows sent to the backend, try again shortly"}] * len(pending)
+        else:
+            fresh = self.predictor.predict_rows([rows[i] for i in pending])
+        for i, response in zip(pending, fresh):
+            results[i] = response
+        return results
+
+    def lookup(self, rows: list) -> list:
+        return self.predictor.lookup(rows)
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import streamlit as st
+
+from components.physics import derive_quantities, rel_err
+
+
+# Maximum relative error |entered - derived| / derived per checked field.
+# Loose by default: the derivations assume circular orbits, zero albedo and
+# b = 0, so real candidates scatter well away from them.
+DEFAULT_TOLERANCES = {
+    "period_days": 0.75,
+    "transit_depth_ppm": 0.75,
+    "duration_hours": 1.0,
+    "S_earth": 0.75,
+}
+
+CHECK_LABELS = {
+    "period_days": "period",
+    "transit_depth_ppm": "depth",
+    "duration_hours": "duration",
+    "S_earth": "insolation",
+}
+
+PRESCREEN_MODES = ("Off", "Flag only", "Skip backend for inconsistent")
+
+
+def prescreen(columns, tolerances: dict = DEFAULT_TOLERANCES) -> dict:
+    """
+    Cross-check entered P, depth, duration and S_earth against the values the
+    physics helpers derive from the stellar and planetary parameters.
+
+    Works on whole columns. A field is only checked where both the entered and
+    derived values exist, so rows with missing inputs are never rejected.
+    Returns {"inconsistent": bool array, "failed": {field: bool array},
+    "rel_err": {field: array}, "derived": {...}}.
+    """
+    derived = derive_quantities(columns)
+    errors, failed = {}, {}
+    inconsistent = None
+    for field, tolerance in tolerances.items():
+        entered = np.asarray(columns[field], dtype=np.float64)
+        err = rel_err(entered, derived[field])
+        checkable = np.isfinite(derived[field]) & np.isfinite(entered) & (entered > 0)
+        errors[field] = err
+        failed[field] = checkable & (err > tolerance)
+        inconsistent = failed[field] if inconsistent is None else inconsistent | failed[field]
+    return {"inconsistent": inconsistent, "failed": failed, "rel_err": errors, "derived": derived}
+
+
+def describe(screen: dict, index=()) -> str:
+    """Human-readable list of the checks a row failed, e.g. 'period off by 240%'."""
+    parts = []
+    for field, failed in screen["failed"].items():
+        if failed[index]:
+            parts.append(f"{CHECK_LABELS[field]} off by {screen['rel_err'][field][index]:.0%}")
+    return ", ".join(parts)
+
+
+class PrescreenStats:
+    """Process-wide tally of screened candidates and backend calls avoided."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+
+    def record(self, checked: int, skipped: int):
+        with self._lock:
+            self.checked += checked
+            self.skipped += skipped
+
+
+@st.cache_resource(show_spinner=False)
+def get_prescreen_stats() -> PrescreenStats:
+    return PrescreenStats()
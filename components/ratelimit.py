@@ -0,0 +1,95 @@
+import os
+import threading
+from time import monotonic, sleep
+
+import streamlit as st
+
+
+# Token buckets bounding how many rows per second multi-row scoring (batch
+# file, parameter sweep, Monte Carlo draws, attribution) sends to the
+# backend: one bucket per session and one shared by the whole process. A
+# batch waits up to RATE_LIMIT_WAIT_SEC for tokens, then is rejected rather
+# than queued without bound.
+SESSION_ROWS_PER_SEC = float(os.environ.get("EXODETECT_SESSION_ROWS_PER_SEC", "500"))
+GLOBAL_ROWS_PER_SEC = float(os.environ.get("EXODETECT_GLOBAL_ROWS_PER_SEC", "2000"))
+BURST_SEC = 2.0  # bucket capacity, in seconds of the rate
+RATE_LIMIT_WAIT_SEC = 10.0
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second up to a capacity of `burst`. A request larger
+    than the capacity is granted once the bucket is full and leaves it in
+    debt, so the long-run rate holds for any request size.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate * BURST_SEC
+        self.granted = 0
+        self.rejected = 0
+        self._tokens = self.burst
+        self._stamp = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def try_acquire(self, n: float) -> float:
+        """Take n tokens and return 0.0, or take nothing and return the seconds until they'd be available."""
+        with self._lock:
+            self._refill()
+            needed = min(n, self.burst)
+            if self._tokens >= needed:
+                self._tokens -= n
+                self.granted += n
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+    def refund(self, n: float):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + n)
+            self.granted -= n
+
+    def reject(self, n: float):
+        with self._lock:
+            self.rejected += n
+
+
+def acquire(buckets: list, n: int, timeout: float = RATE_LIMIT_WAIT_SEC) -> bool:
+    """
+    Take n tokens from every bucket, or from none: waits while some bucket
+    is short, and gives up (counting the rejection on the bucket that was
+    short) when the wait would exceed `timeout`.
+    """
+    deadline = monotonic() + timeout
+    while True:
+        taken = []
+        for bucket in buckets:
+            wait = bucket.try_acquire(n)
+            if wait:
+                break
+            taken.append(bucket)
+        else:
+            return True
+        for other in taken:
+            other.refund(n)
+        if monotonic() + wait > deadline:
+            bucket.reject(n)
+            return False
+        sleep(wait)
+
+
+@st.cache_resource(show_spinner=False)
+def get_global_bucket() -> TokenBucket:
+    """Process-wide bucket shared by every session."""
+    return TokenBucket(GLOBAL_ROWS_PER_SEC)
+
+
+def get_session_bucket() -> TokenBucket:
+    """This session's bucket, kept in session state."""
+    if "rate_bucket" not in st.session_state:
+        st.session_state["rate_bucket"] = TokenBucket(SESSION_ROWS_PER_SEC)
+    return st.session_state["rate_bucket"]
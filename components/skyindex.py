@@ -0,0 +1,248 @@
+import bisect
+import hashlib
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from components.catalog import CATALOG_PATH
+
+
+# Known objects a candidate is cross-matched against: the planet catalog plus
+# an optional KOI table (columns kepoi_name, ra, dec and koi_disposition, as
+# in the NASA Exoplanet Archive "cumulative" KOI export).
+KOI_PATH = os.environ.get("EXODETECT_KOI_PATH", os.path.join("data", "koi.csv"))
+SKY_INDEX_PATH = os.environ.get("EXODETECT_SKY_INDEX_PATH", ".cache/sky_index.npz")
+CROSSMATCH_RADIUS_ARCSEC = float(os.environ.get("EXODETECT_CROSSMATCH_RADIUS_ARCSEC", "5"))
+ZONE_HEIGHT_DEG = 0.05
+_RA_MAX = np.nextafter(360.0, 0.0)
+
+
+def _unit_vectors(ra_deg, dec_deg) -> np.ndarray:
+    ra, dec = np.radians(ra_deg), np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    return np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+class SkyIndex:
+    """
+    Zones index over RA/Dec: objects are bucketed into declination strips of
+    ZONE_HEIGHT_DEG and sorted by (zone, RA), so a cone search is a handful
+    of binary searches per zone it overlaps followed by an exact angular
+    distance check on the few objects inside the RA window.
+    """
+
+    def __init__(self, names, kinds, ra_deg, dec_deg, zone_height: float = ZONE_HEIGHT_DEG, signature: str = ""):
+        ra = np.mod(np.asarray(ra_deg, dtype="float64"), 360.0)
+        dec = np.clip(np.asarray(dec_deg, dtype="float64"), -90.0, 90.0)
+        zones = self._zone(dec, zone_height)
+        order = np.lexsort((ra, zones))
+        self.zone_height = zone_height
+        self.signature = signature
+        self.names = np.asarray(names, dtype=str)[order]
+        self.kinds = np.asarray(kinds, dtype=str)[order]
+        self.ra = ra[order]
+        self.dec = dec[order]
+        self.zones = zones[order]
+        # Sort key that is monotone over (zone, RA): RA < 360 never spills into the next zone.
+        self.keys = self.zones * 360.0 + self.ra
+        self.xyz = _unit_vectors(self.ra, self.dec)
+        self._max_zone = int(self._zone(90.0, zone_height))
+        # plain-float copies for the scalar lookup path
+        self._key_list = self.keys.tolist()
+        self._ra_list = self.ra.tolist()
+        self._dec_list = self.dec.tolist()
+
+    @staticmethod
+    def _zone(dec, zone_height):
+        return np.floor((np.asarray(dec) + 90.0) / zone_height).astype("int64")
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, signature: str = "") -> "SkyIndex":
+        from components.catalog import get_catalog
+
+        catalog = get_catalog()
+        frames = [pd.DataFrame({
+            "name": catalog["name"], "kind": "planet", "ra": catalog["ra_deg"], "dec": catalog["dec_deg"],
+        })]
+        if os.path.exists(KOI_PATH):
+            koi = pd.read_csv(KOI_PATH, comment="#", low_memory=False)
+            kind = koi["koi_disposition"].fillna("KOI") if "koi_disposition" in koi else "KOI"
+            frames.append(pd.DataFrame({"name": koi["kepoi_name"], "kind": kind, "ra": koi["ra"], "dec": koi["dec"]}))
+        known = pd.concat(frames, ignore_index=True).dropna(subset=["ra", "dec"])
+        return cls(known["name"].astype(str), known["kind"].astype(str), known["ra"], known["dec"], signature=signature)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp, names=self.names, kinds=self.kinds, ra=self.ra, dec=self.dec,
+            zone_height=self.zone_height, signature=self.signature,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SkyIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["names"], data["kinds"], data["ra"], data["dec"],
+                zone_height=float(data["zone_height"]), signature=str(data["signature"]),
+            )
+
+    def _ranges(self, ra, dec, radius_deg):
+        """
+        [start, end) slices of the sorted arrays that may hold objects within
+        `radius_deg` of each (ra, dec), as (query index, start, end) arrays.
+        """
+        n_offsets = int(np.ceil(radius_deg / self.zone_height))
+        max_zone = self._max_zone
+        centre = self._zone(dec, self.zone_height)
+        # RA half-width of the cone; when it reaches a pole the whole zone is searched.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.sin(np.radians(radius_deg)) / np.cos(np.radians(dec))
+            half_width = np.degrees(np.arcsin(np.clip(ratio, 0.0, 1.0)))
+        full = (np.abs(dec) + radius_deg >= 90.0) | (half_width >= 90.0)
+        lo, hi = ra - half_width, ra + half_width
+
+        query = np.arange(len(ra))
+        out_q, out_start, out_end = [], [], []
+        for offset in range(-n_offsets, n_offsets + 1):
+            zone = centre + offset
+            ok = (zone >= 0) & (zone <= max_zone)
+            base = zone * 360.0
+            # main window clipped to [0, 360), plus the wrapped-around part on either side
+            windows = (
+                (np.where(full, 0.0, np.maximum(lo, 0.0)), np.where(full, _RA_MAX, np.minimum(hi, _RA_MAX)), ok),
+                (lo + 360.0, np.full_like(lo, _RA_MAX), ok & ~full & (lo < 0.0)),
+                (np.zeros_like(hi), hi - 360.0, ok & ~full & (hi > 360.0)),
+            )
+            for w_lo, w_hi, use in windows:
+                if not use.any():
+                    continue
+                start = np.searchsorted(self.keys, base[use] + w_lo[use], side="left")
+                end = np.searchsorted(self.keys, base[use] + w_hi[use], side="right")
+                out_q.append(query[use])
+                out_start.append(start)
+                out_end.append(end)
+        if not out_q:
+            empty = np.zeros(0, dtype="int64")
+            return empty, empty, empty
+        return np.concatenate(out_q), np.concatenate(out_start), np.concatenate(out_end)
+
+    def cross_match(self, ra_deg, dec_deg, radius_arcsec: float = CROSSMATCH_RADIUS_ARCSEC):
+        """
+        Every (query, object) pair closer than `radius_arcsec`, for arrays of
+        query positions. Returns (query index, object index, separation in
+        arcsec) arrays, sorted by query then separation.
+        """
+        ra = np.mod(np.atleast_1d(np.asarray(ra_deg, dtype="float64")), 360.0)
+        dec = np.clip(np.atleast_1d(np.asarray(dec_deg, dtype="float64")), -90.0, 90.0)
+        radius_deg = radius_arcsec / 3600.0
+        q, start, end = self._ranges(ra, dec, radius_deg)
+        counts = end - start
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype="int64"), np.zeros(0, dtype="int64"), np.zeros(0)
+
+        # expand every [start, end) slice into candidate pairs
+        pair_q = np.repeat(q, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_obj = np.repeat(start, counts) + offsets
+
+        chord = np.linalg.norm(_unit_vectors(ra, dec)[pair_q] - self.xyz[pair_obj], axis=1)
+        sep = np.degrees(2.0 * np.arcsin(np.minimum(chord / 2.0, 1.0))) * 3600.0
+        keep = sep <= radius_arcsec
+        pair_q, pair_obj, sep = pair_q[keep], pair_obj[keep], sep[keep]
+        order = np.lexsort((sep, pair_q))
+        return pair_q[order], pair_obj[order], sep[order]
+
+    def cone(self, ra_deg: float, dec_deg: float, radius_arcsec: float = CROSSMATCH_RADIUS_ARCSEC) -> list:
+        """
+        Known objects within `radius_arcsec` of one position, nearest first.
+        Scalar twin of cross_match: no temporary arrays, so a lookup costs
+        microseconds.
+        """
+        ra = float(ra_deg) % 360.0
+        dec = min(max(float(dec_deg), -90.0), 90.0)
+        radius = radius_arcsec / 3600.0
+        if abs(dec) + radius >= 90.0:
+            windows = [(0.0, _RA_MAX)]
+        else:
+            half_width = math.degrees(math.asin(min(math.sin(math.radians(radius)) / math.cos(math.radians(dec)), 1.0)))
+            lo, hi = ra - half_width, ra + half_width
+            windows = [(max(lo, 0.0), min(hi, _RA_MAX))]
+            if half_width >= 90.0:
+                windows = [(0.0, _RA_MAX)]
+            elif lo < 0.0:
+                windows.append((lo + 360.0, _RA_MAX))
+            elif hi > 360.0:
+                windows.append((0.0, hi - 360.0))
+
+        first = max(int((dec - radius + 90.0) // self.zone_height), 0)
+        last = min(int((dec + radius + 90.0) // self.zone_height), self._max_zone)
+        sin_dec, cos_dec = math.sin(math.radians(dec)), math.cos(math.radians(dec))
+        hits = []
+        for zone in range(first, last + 1):
+            base = zone * 360.0
+            for w_lo, w_hi in windows:
+                start = bisect.bisect_left(self._key_list, base + w_lo)
+                end = bisect.bisect_right(self._key_list, base + w_hi)
+                for i in range(start, end):
+                    o_dec = math.radians(self._dec_list[i])
+                    cos_sep = sin_dec * math.sin(o_dec) + cos_dec * math.cos(o_dec) * math.cos(
+                        math.radians(self._ra_list[i] - ra)
+                    )
+                    # acos only loses precision below ~10 mas, far under any match radius
+                    sep = math.degrees(math.acos(min(max(cos_sep, -1.0), 1.0))) * 3600.0
+                    if sep <= radius_arcsec:
+                        hits.append({
+                            "name": str(self.names[i]), "kind": str(self.kinds[i]),
+                            "ra_deg": self._ra_list[i], "dec_deg": self._dec_list[i], "sep_arcsec": sep,
+                        })
+        return sorted(hits, key=lambda hit: hit["sep_arcsec"])
+
+    def nearest_matches(self, ra_deg, dec_deg, radius_arcsec: float = CROSSMATCH_RADIUS_ARCSEC):
+        """Per query: the nearest known object's name ('' if none) and its separation in arcsec (NaN if none)."""
+        n = len(np.atleast_1d(ra_deg))
+        q, obj, sep = self.cross_match(ra_deg, dec_deg, radius_arcsec)
+        first = np.unique(q, return_index=True)[1]
+        names = np.full(n, "", dtype=object)
+        seps = np.full(n, np.nan)
+        names[q[first]] = self.names[obj[first]]
+        seps[q[first]] = sep[first]
+        return names, seps
+
+
+def _source_signature() -> str:
+    parts = [f"zone={ZONE_HEIGHT_DEG}"]
+    for path in (CATALOG_PATH, KOI_PATH):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+@st.cache_resource(show_spinner=False)
+def _load_sky_index(signature: str) -> SkyIndex:
+    try:
+        index = SkyIndex.load(SKY_INDEX_PATH)
+        if index.signature == signature:
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    index = SkyIndex.build(signature)
+    index.save(SKY_INDEX_PATH)
+    return index
+
+
+def get_sky_index() -> SkyIndex:
+    """
+    The cross-match index, built from the catalog (and KOI table) once and
+    persisted to disk; rebuilt only when one of the sources changes.
+    """
+    return _load_sky_index(_source_signature())
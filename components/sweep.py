@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from components.backend import PREDICT_TIMEOUT_SEC
+from components.cache import payload_key
+from components.fanout import iter_concurrent
+
+
+# Parameter sweep: one or two payload fields vary over a grid while the rest
+# stay at a base candidate. Grid points that round to the same cache key are
+# scored once, cached ones are answered without a request, and the rest go
+# out as SWEEP_CHUNK_ROWS-row batches with at most SWEEP_CONCURRENCY in flight.
+SWEEP_MAX_STEPS = 60
+SWEEP_CHUNK_ROWS = 100
+SWEEP_CONCURRENCY = int(os.environ.get("EXODETECT_SWEEP_CONCURRENCY", "4"))
+SWEEP_CHUNK_TIMEOUT_SEC = 4 * PREDICT_TIMEOUT_SEC
+
+
+class Sweep:
+    """
+    A grid of payloads around `base` and its model probabilities, filled in
+    by run(). Cells are row-major: y varies along axis 0, x along axis 1 (a
+    one-field sweep has a single row). Axis values must be strictly
+    increasing, so every cell has a positive width.
+    """
+
+    def __init__(self, base: dict, x_field: str, x_values, y_field: str = None, y_values=None):
+        self.base = dict(base)
+        self.x_field, self.x_values = x_field, np.asarray(x_values, dtype=np.float64)
+        self.y_field = y_field
+        self.y_values = np.asarray(y_values if y_field else [np.nan], dtype=np.float64)
+        for name, values in ((x_field, self.x_values), (y_field, self.y_values if y_field else None)):
+            if values is not None and np.any(np.diff(values) <= 0):
+                raise ValueError(f"{name} sweep values must be strictly increasing")
+        self.probability = np.full((len(self.y_values), len(self.x_values)), np.nan)
+        self.threshold = np.nan
+        self.cells = self.probability.size
+        self.unique = self.cached = self.scored = self.failed = 0
+        self.error = ""
+
+    def rows(self) -> list:
+        """The grid as /predict payload dicts, in cell order."""
+        rows = []
+        for y in self.y_values:
+            for x in self.x_values:
+                row = {**self.base, self.x_field: float(x)}
+                if self.y_field:
+                    row[self.y_field] = float(y)
+                rows.append(row)
+        return rows
+
+    @property
+    def done(self) -> int:
+        return self.cached + self.scored + self.failed
+
+    def _fill(self, cells: list, response: dict):
+        if "error" in response:
+            self.failed += 1
+            self.error = self.error or response["error"]
+            return
+        self.threshold = response.get("threshold", self.threshold)
+        self.probability.flat[cells] = response.get("probability", np.nan)
+
+    def run(self, predictor, chunk_rows: int = SWEEP_CHUNK_ROWS, concurrency: int = SWEEP_CONCURRENCY):
+        """
+        Score the grid, yielding after the cache pass and after every batch
+        so a caller can redraw the grid as it fills in.
+        """
+        owners = {}  # canonical key -> cells sharing that payload
+        unique_rows = []
+        for cell, row in enumerate(self.rows()):
+            key = payload_key(row, "")
+            if key not in owners:
+                owners[key] = []
+                unique_rows.append(row)
+            owners[key].append(cell)
+        cells = list(owners.values())
+        self.unique = len(unique_rows)
+
+        pending = []
+        for i, response in enumerate(predictor.lookup(unique_rows)):
+            if response is None:
+                pending.append(i)
+            else:
+                self.cached += 1
+                self._fill(cells[i], response)
+        yield self
+
+        chunks = [pending[start:start + chunk_rows] for start in range(0, len(pending), chunk_rows)]
+        batches = iter_concurrent(
+            lambda chunk: predictor.predict_rows([unique_rows[i] for i in chunk]),
+            chunks, concurrency, SWEEP_CHUNK_TIMEOUT_SEC,
+        )
+        for index, responses in batches:
+            if not isinstance(responses, list):  # the whole batch failed or timed out
+                responses = [responses] * len(chunks[index])
+            for i, response in zip(chunks[index], responses):
+                self._fill(cells[i], response)
+                self.scored += "error" not in response
+            yield self
+
+    def frame(self) -> pd.DataFrame:
+        """One row per cell: x, y (if any), probability and the cell edges for drawing a heatmap."""
+        x_half = np.diff(self.x_values).min() / 2 if len(self.x_values) > 1 else 0.5
+        frame = pd.DataFrame({
+            self.x_field: np.tile(self.x_values, len(self.y_values)),
+            "probability": self.probability.ravel(),
+        })
+        frame["x_low"], frame["x_high"] = frame[self.x_field] - x_half, frame[self.x_field] + x_half
+        if self.y_field:
+            y_half = np.diff(self.y_values).min() / 2 if len(self.y_values) > 1 else 0.5
+            frame[self.y_field] = np.repeat(self.y_values, len(self.x_values))
+            frame["y_low"], frame["y_high"] = frame[self.y_field] - y_half, frame[self.y_field] + y_half
+        return frame
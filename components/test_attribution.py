@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from components.attribution import attribute, field_step, perturbed_rows
+from components.backend import PAYLOAD_FIELDS
+
+PAYLOAD = {
+    "period_days": 12.4, "t0": 2455000.5, "duration_hours": 3.1, "transit_depth_ppm": 850.0, "radius_earth": 2.1,
+    "teq_K": 480.0, "S_earth": 9.0, "teff_star_K": 5600.0, "logg_cgs": 4.45, "rstar_rsun": 0.95,
+    "ra_deg": 359.995, "dec_deg": 0.0,
+}
+
+
+def _model(row: dict) -> dict:
+    """Probability rises with radius, falls with temperature; nothing else matters."""
+    return {"probability": 0.45 + 0.1 * (row["radius_earth"] - 2.1) - 0.001 * (row["teq_K"] - 480.0),
+            "threshold": 0.5}
+
+
+def test_perturbed_rows():
+    rows = perturbed_rows(PAYLOAD)
+    assert len(rows) == 2 * len(PAYLOAD_FIELDS)
+    for i, field in enumerate(PAYLOAD_FIELDS):
+        low, high = rows[2 * i], rows[2 * i + 1]
+        assert {k for k in PAYLOAD if low[k] != PAYLOAD[k] or high[k] != PAYLOAD[k]} == {field}
+        assert low[field] < PAYLOAD[field] < high[field] or field == "ra_deg"
+    assert field_step("radius_earth", 2.1) == pytest.approx(0.105)
+    assert field_step("t0", 2455000.5) == 0.01
+    # ends are clipped to the physical range
+    assert rows[2 * PAYLOAD_FIELDS.index("ra_deg") + 1]["ra_deg"] == 360.0
+    assert perturbed_rows({**PAYLOAD, "dec_deg": 90.0})[2 * PAYLOAD_FIELDS.index("dec_deg") + 1]["dec_deg"] == 90.0
+
+
+def test_signs_ranking_and_threshold_flags():
+    responses = [_model(row) for row in perturbed_rows(PAYLOAD)]
+    entries = attribute(PAYLOAD, responses, _model(PAYLOAD)["probability"], threshold=0.5)
+    by_field = {e["field"]: e for e in entries}
+    # radius: 0.1 per Earth radius over 2 x 0.105; temperature: -0.001 per K over 2 x 24 K
+    assert by_field["radius_earth"]["change"] == pytest.approx(0.021)
+    assert by_field["teq_K"]["change"] == pytest.approx(-0.048)
+    assert [e["field"] for e in entries[:2]] == ["teq_K", "radius_earth"]
+    assert all(e["change"] == pytest.approx(0.0) for e in entries[2:])
+    # at 0.45 neither end reaches 0.5; against 0.47, only cooling by δ (+0.024) crosses
+    assert not any(e["flips"] for e in entries)
+    entries = attribute(PAYLOAD, responses, 0.45, threshold=0.47)
+    assert {e["field"] for e in entries if e["flips"]} == {"teq_K"}
+
+
+def test_failed_payloads_sort_last():
+    responses = [_model(row) for row in perturbed_rows(PAYLOAD)]
+    radius = PAYLOAD_FIELDS.index("radius_earth")
+    responses[2 * radius] = {"error": "timed out"}
+    entries = attribute(PAYLOAD, responses, 0.45)
+    assert entries[-1]["field"] == "radius_earth"
+    assert np.isnan(entries[-1]["change"]) and not entries[-1]["flips"]
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from components.bls import bls_search
+
+
+def _light_curve(period=3.7, t0=1.2, duration_hours=3.0, depth=1000e-6, noise=200e-6, days=40.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(0.0, days, 10.0 / 1440.0)
+    t = t[rng.random(len(t)) > 0.05]  # gaps
+    flux = 1.0 + rng.normal(0.0, noise, len(t))
+    in_transit = np.abs(np.mod(t - t0 + period / 2, period) - period / 2) < duration_hours / 48.0
+    flux[in_transit] -= depth
+    return t, flux, np.full(len(t), noise)
+
+
+def test_recovers_injected_transit():
+    t, flux, flux_err = _light_curve()
+    fit = bls_search(t, flux, flux_err, coarse_budget=2e7)
+    assert fit["period_days"] == pytest.approx(3.7, rel=1e-3)
+    # epoch modulo the period, within a fraction of the duration
+    offset = (fit["t0"] - 1.2 + 3.7 / 2) % 3.7 - 3.7 / 2
+    assert abs(offset) < 0.5 / 24
+    assert fit["duration_hours"] == pytest.approx(3.0, rel=0.35)
+    assert fit["depth_ppm"] == pytest.approx(1000, rel=0.2)
+    assert fit["snr"] > 20
+    assert fit["n_transits"] >= 9
+
+
+def test_unsorted_input_without_errors():
+    t, flux, _ = _light_curve(seed=1)
+    order = np.random.default_rng(2).permutation(len(t))
+    fit = bls_search(t[order], flux[order], coarse_budget=2e7)
+    assert fit["period_days"] == pytest.approx(3.7, rel=1e-3)
+
+
+def test_rejects_too_few_points_or_too_short_a_baseline():
+    with pytest.raises(ValueError):
+        bls_search(np.arange(5.0), np.ones(5))
+    t = np.linspace(0.0, 1.0, 500)
+    with pytest.raises(ValueError):
+        bls_search(t, np.ones_like(t))
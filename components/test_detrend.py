@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from components.detrend import detrend
+
+
+def _light_curve(seed=0):
+    rng = np.random.default_rng(seed)
+    t = 2459000.0 + np.sort(rng.uniform(0.0, 20.0, 20000))  # BJD-sized times, uneven cadence
+    flux = (1.0 + 0.002 * np.sin(t / 5.0)) * (1.0 + rng.normal(0.0, 1e-4, len(t)))
+    flares = rng.choice(len(t), 40, replace=False)
+    flux[flares] *= 1.01
+    flux_err = np.full(len(t), 1e-4)
+    return t, flux, flux_err, flares
+
+
+@pytest.mark.parametrize("chunk_points", [997, 4096, 19999])
+def test_chunks_match_whole_series(chunk_points):
+    t, flux, flux_err, _ = _light_curve()
+    whole = detrend(t, flux, flux_err, window_days=0.5, chunk_points=len(t))
+    chunked = detrend(t, flux, flux_err, window_days=0.5, chunk_points=chunk_points)
+    for a, b in zip(whole, chunked):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_removes_trend_and_clips_flares_only():
+    t, flux, flux_err, flares = _light_curve()
+    dip = (t > t[0] + 10.0) & (t < t[0] + 10.1)
+    flux[dip] *= 1.0 - 1e-3
+    out_t, out_flux, out_err = detrend(t, flux, flux_err, window_days=0.5)
+    assert not np.isin(t[flares], out_t).any()
+    assert np.isin(t[dip], out_t).mean() > 0.95  # dips are not clipped (only the odd 3-sigma high point)
+    assert len(out_t) == len(out_flux) == len(out_err)
+    baseline = ~np.isin(out_t, t[dip])
+    assert abs(np.median(out_flux[baseline]) - 1.0) < 2e-5
+    assert np.std(out_flux[baseline]) < 2e-4
+    assert np.median(out_flux[~baseline]) == pytest.approx(1.0 - 1e-3, abs=1e-4)
+
+
+def test_empty_and_no_errors():
+    t, flux, flux_err = detrend(np.zeros(0), np.zeros(0))
+    assert len(t) == len(flux) == 0 and flux_err is None
+    t, flux, _, _ = _light_curve(seed=1)
+    assert detrend(t, flux)[2] is None
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from components.skyindex import SkyIndex, _unit_vectors
+
+
+def _brute_force(index, ra, dec, radius_arcsec):
+    """Every (query, object) pair within the radius, by exact angular distance."""
+    chord = np.linalg.norm(_unit_vectors(ra, dec)[:, None, :] - index.xyz[None, :, :], axis=2)
+    sep = np.degrees(2.0 * np.arcsin(np.minimum(chord / 2.0, 1.0))) * 3600.0
+    q, obj = np.nonzero(sep <= radius_arcsec)
+    return set(zip(q.tolist(), index.names[obj].tolist()))
+
+
+@pytest.fixture(scope="module")
+def index():
+    rng = np.random.default_rng(0)
+    # a random sky plus clumps at the RA seam and both poles, where the zone windows wrap
+    ra = np.concatenate([rng.uniform(0, 360, 3000), rng.uniform(359.99, 360.01, 200) % 360,
+                         rng.uniform(0, 360, 200), rng.uniform(0, 360, 200)])
+    dec = np.concatenate([np.degrees(np.arcsin(rng.uniform(-1, 1, 3000))), rng.uniform(-0.01, 0.01, 200),
+                          rng.uniform(89.99, 90.0, 200), rng.uniform(-90.0, -89.99, 200)])
+    return SkyIndex([f"obj{i}" for i in range(len(ra))], ["planet"] * len(ra), ra, dec)
+
+
+def test_cross_match_agrees_with_brute_force(index):
+    rng = np.random.default_rng(1)
+    ra = np.concatenate([rng.uniform(0, 360, 50), [0.0, 359.999, 0.001, 10.0, 190.0]])
+    dec = np.concatenate([rng.uniform(-90, 90, 50), [0.0, 0.0, 0.0, 89.998, -89.998]])
+    q, obj, _ = index.cross_match(ra, dec, radius_arcsec=60.0)
+    assert set(zip(q.tolist(), index.names[obj].tolist())) == _brute_force(index, ra, dec, 60.0)
+
+
+def test_cone_matches_cross_match(index):
+    for ra, dec in [(0.0, 0.0), (359.9995, 0.003), (123.4, 89.999), (321.0, -89.9995)]:
+        q, obj, sep = index.cross_match([ra], [dec], radius_arcsec=30.0)
+        hits = index.cone(ra, dec, radius_arcsec=30.0)
+        assert [h["name"] for h in hits] == index.names[obj].tolist()
+        assert [h["sep_arcsec"] for h in hits] == pytest.approx(sep.tolist(), abs=1e-3)
+
+
+def test_ra_wrap():
+    index = SkyIndex(["east", "west"], ["planet", "planet"], [359.9995, 0.0005], [0.0, 0.0])
+    hits = index.cone(0.0, 0.0, radius_arcsec=5.0)
+    assert sorted(h["name"] for h in hits) == ["east", "west"]
+    assert all(h["sep_arcsec"] == pytest.approx(1.8, abs=1e-3) for h in hits)
+    names, seps = index.nearest_matches([359.9999], [0.0], radius_arcsec=5.0)
+    assert names[0] == "east" and seps[0] == pytest.approx(1.44, abs=1e-3)
+
+
+def test_across_the_pole():
+    # 0.0005 deg from the north pole on opposite meridians: 0.001 deg = 3.6 arcsec apart
+    index = SkyIndex(["a"], ["koi"], [10.0], [89.9995])
+    hits = index.cone(190.0, 89.9995, radius_arcsec=5.0)
+    assert [h["name"] for h in hits] == ["a"]
+    assert hits[0]["sep_arcsec"] == pytest.approx(3.6, abs=1e-3)
+    assert index.cone(190.0, 89.9995, radius_arcsec=3.0) == []
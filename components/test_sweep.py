@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from components.predictors import Predictor
+from components.sweep import Sweep
+
+BASE = {"radius_earth": 2.0, "teq_K": 500.0, "period_days": 10.0}
+
+
+class LinearModel(Predictor):
+    """probability = radius / 10 (teq ignored); rows with radius 3 are "cached", radius 4 fails."""
+
+    def __init__(self):
+        self.sent = []
+
+    def predict(self, payload: dict) -> dict:
+        if payload["radius_earth"] == 4.0:
+            return {"error": "backend down"}
+        return {"probability": payload["radius_earth"] / 10, "threshold": 0.35}
+
+    def predict_rows(self, rows: list) -> list:
+        self.sent.extend(rows)
+        return super().predict_rows(rows)
+
+    def lookup(self, rows: list) -> list:
+        return [self.predict(row) if row["radius_earth"] == 3.0 else None for row in rows]
+
+
+def _run(sweep, predictor):
+    for _ in sweep.run(predictor, chunk_rows=2, concurrency=2):
+        pass
+    return sweep
+
+
+def test_grid_is_scored_in_cell_order():
+    predictor = LinearModel()
+    sweep = _run(Sweep(BASE, "radius_earth", [1.0, 2.0, 3.0, 4.0, 5.0], "teq_K", [400.0, 600.0]), predictor)
+    assert sweep.cells == sweep.unique == 10
+    assert (sweep.cached, sweep.scored, sweep.failed) == (2, 6, 2)
+    assert sweep.error == "backend down"
+    expected = [0.1, 0.2, 0.3, np.nan, 0.5]
+    np.testing.assert_allclose(sweep.probability, [expected, expected])
+    assert sweep.threshold == 0.35
+    assert len(predictor.sent) == 8  # cached rows never go out
+
+
+def test_duplicate_payloads_are_scored_once():
+    # 2.000001 and 2.000004 round to the same cache key
+    predictor = LinearModel()
+    sweep = _run(Sweep(BASE, "radius_earth", [1.0, 2.000001, 2.000004]), predictor)
+    assert (sweep.cells, sweep.unique) == (3, 2)
+    assert len(predictor.sent) == 2
+    assert sweep.probability[0, 2] == sweep.probability[0, 1]
+
+
+def test_frame_cells_have_positive_width():
+    frame = Sweep(BASE, "radius_earth", [1.0, 2.0, 4.0], "teq_K", [400.0, 500.0]).frame()
+    assert len(frame) == 6
+    assert ((frame["x_high"] - frame["x_low"]) == 1.0).all()
+    assert ((frame["y_high"] - frame["y_low"]) == 100.0).all()
+
+
+@pytest.mark.parametrize("values", [[3.0, 2.0, 1.0], [2.0, 2.0]])
+def test_rejects_axes_that_are_not_increasing(values):
+    with pytest.raises(ValueError):
+        Sweep(BASE, "radius_earth", [1.0, 2.0], "teq_K", values)
+    with pytest.raises(ValueError):
+        Sweep(BASE, "radius_earth", values)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from components.backend import PAYLOAD_FIELDS
+from components.uncertainty import draw_samples, probability_distribution, sample_rows
+
+PAYLOAD = {
+    "period_days": 12.4, "t0": 2455000.5, "duration_hours": 3.1, "transit_depth_ppm": 850.0, "radius_earth": 2.1,
+    "teq_K": 480.0, "S_earth": 9.0, "teff_star_K": 5600.0, "logg_cgs": 4.45, "rstar_rsun": 0.95,
+    "ra_deg": 359.9, "dec_deg": 89.8,
+}
+
+
+def test_draws_stay_in_physical_bounds():
+    # sigmas far wider than the allowed ranges force the truncation
+    sigmas = {"radius_earth": 5.0, "transit_depth_ppm": 2000.0, "ra_deg": 1.0, "dec_deg": 1.0, "t0": 0.1}
+    samples = draw_samples(PAYLOAD, sigmas, draws=5000)
+    assert set(samples) == set(PAYLOAD_FIELDS)
+    assert all(len(values) == 5000 for values in samples.values())
+    assert samples["radius_earth"].min() >= 0.0 and samples["transit_depth_ppm"].min() >= 0.0
+    assert 0.0 <= samples["ra_deg"].min() and samples["ra_deg"].max() <= 360.0
+    assert -90.0 <= samples["dec_deg"].min() and samples["dec_deg"].max() <= 90.0
+    assert samples["t0"].std() == pytest.approx(0.1, rel=0.1)  # unbounded: a plain normal
+
+
+def test_fields_without_sigma_are_fixed_and_draws_repeat():
+    sigmas = {"period_days": 0.1, "teq_K": 0.0}
+    first = draw_samples(PAYLOAD, sigmas, draws=1000)
+    second = draw_samples(PAYLOAD, sigmas, draws=1000)
+    for field in PAYLOAD_FIELDS:
+        np.testing.assert_array_equal(first[field], second[field])
+        if field != "period_days":
+            assert (first[field] == PAYLOAD[field]).all()
+    assert first["period_days"].mean() == pytest.approx(12.4, abs=0.01)
+    rows = sample_rows(first)
+    assert len(rows) == 1000 and rows[0] == {field: first[field][0] for field in PAYLOAD_FIELDS}
+
+
+def test_probability_distribution():
+    responses = [{"probability": p, "threshold": 0.5} for p in np.linspace(0.0, 1.0, 101)] + [{"error": "down"}] * 9
+    summary = probability_distribution(responses)
+    assert summary["scored"] == 101 and summary["failed"] == 9
+    assert summary["median"] == pytest.approx(0.5)
+    assert summary["above_threshold"] == pytest.approx(51 / 101)
+    assert sum(summary["histogram"]["draws"]) == 101
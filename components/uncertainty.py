@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+import numpy as np
+
+from components.backend import PAYLOAD_FIELDS
+from components.physics import derive_quantities
+
+
+# Monte Carlo propagation of per-field 1-sigma uncertainties: every field
+# with an error bar is drawn from a normal distribution truncated to its
+# physical range, all draws at once as arrays.
+MC_DRAWS = 2000
+MC_MAX_DRAWS = 20000
+PROBABILITY_BINS = 20
+
+# payload field -> (low, high) allowed range of a draw
+FIELD_BOUNDS = {field: (0.0, np.inf) for field in PAYLOAD_FIELDS}
+FIELD_BOUNDS.update({"t0": (-np.inf, np.inf), "ra_deg": (0.0, 360.0), "dec_deg": (-90.0, 90.0)})
+
+
+def _seed(payload: dict, sigmas: dict, draws: int) -> int:
+    """
+    Seed derived from the inputs, so the same analysis draws the same
+    samples and a repeat is answered from the prediction cache.
+    """
+    blob = json.dumps([payload, sigmas, draws], sort_keys=True, default=float)
+    return int.from_bytes(hashlib.sha256(blob.encode()).digest()[:8], "little")
+
+
+def _truncated_normal(rng, mean: float, sigma: float, low: float, high: float, n: int) -> np.ndarray:
+    """Normal draws redrawn until they fall inside [low, high] (clipped if that takes too long)."""
+    values = rng.normal(mean, sigma, n)
+    for _ in range(20):
+        bad = (values < low) | (values > high)
+        if not bad.any():
+            return values
+        values[bad] = rng.normal(mean, sigma, int(bad.sum()))
+    return np.clip(values, low, high)
+
+
+def draw_samples(payload: dict, sigmas: dict, draws: int = MC_DRAWS) -> dict:
+    """
+    `draws` payload columns: fields with a positive sigma are sampled, the
+    rest repeat the point estimate. Returns field -> float64 array.
+    """
+    rng = np.random.default_rng(_seed(payload, sigmas, draws))
+    samples = {}
+    for field in PAYLOAD_FIELDS:
+        value, sigma = float(payload[field]), float(sigmas.get(field, 0.0))
+        if sigma > 0:
+            samples[field] = _truncated_normal(rng, value, sigma, *FIELD_BOUNDS[field], draws)
+        else:
+            samples[field] = np.full(draws, value)
+    return samples
+
+
+def summarize(values) -> dict:
+    """Median, 16th/84th percentiles and the share of finite draws."""
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return {"median": np.nan, "low": np.nan, "high": np.nan, "valid": 0.0}
+    low, median, high = np.percentile(finite, [15.865, 50.0, 84.135])
+    return {"median": median, "low": low, "high": high, "valid": len(finite) / len(values)}
+
+
+def propagate(samples: dict) -> dict:
+    """Physics-derived quantities for every draw, summarised per quantity."""
+    return {name: summarize(values) for name, values in derive_quantities(samples).items()}
+
+
+def sample_rows(samples: dict) -> list:
+    """The draws as /predict payload dicts, for one batched scoring call."""
+    columns = [samples[field].tolist() for field in PAYLOAD_FIELDS]
+    return [dict(zip(PAYLOAD_FIELDS, row)) for row in zip(*columns)]
+
+
+def probability_distribution(responses: list) -> dict:
+    """
+    Summary of the model probability over scored draws: percentiles, the
+    share of draws on the positive side of the threshold and a histogram.
+    """
+    scored = [r for r in responses if "error" not in r]
+    probabilities = np.array([r.get("probability", np.nan) for r in scored], dtype=np.float64)
+    thresholds = np.array([r.get("threshold", 0.5) for r in scored], dtype=np.float64)
+    counts, edges = np.histogram(probabilities[np.isfinite(probabilities)], bins=PROBABILITY_BINS, range=(0.0, 1.0))
+    return {
+        **summarize(probabilities),
+        "above_threshold": float(np.mean(probabilities >= thresholds)) if len(scored) else np.nan,
+        "scored": len(scored),
+        "failed": len(responses) - len(scored),
+        "histogram": {"start": edges[:-1].tolist(), "end": edges[1:].tolist(), "draws": counts.tolist()},
+    }
@@ -0,0 +1,2 @@
+# Lets pytest import `components` from the repository root; the module tests
+# live next to the modules they cover (components/test_*.py).
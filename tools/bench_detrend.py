@@ -0,0 +1,89 @@
+"""
+Throughput and memory of the streaming light-curve detrend
+(components/detrend.py). A synthetic Kepler-like series (30-minute cadence
+with gaps, a slow trend, flares and transits) is written to a memory-mapped
+.npy file, detrended chunk by chunk into another memory-mapped file, and the
+samples/s and peak resident memory are reported. Before timing, the chunked
+output on the first points is checked to be identical to one-chunk output:
+
+  python tools/bench_detrend.py
+  python tools/bench_detrend.py --points 20000000 --chunk 65536 --window 0.5
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from components.detrend import DETREND_CHUNK_POINTS, DETREND_WINDOW_DAYS, iter_detrended  # noqa: E402
+
+CADENCE_DAYS = 0.0204
+
+
+def synthetic(directory: str, n: int, seed: int = 0):
+    """Memory-mapped (time, flux) of n points, generated in blocks so the generator itself stays small."""
+    rng = np.random.default_rng(seed)
+    time = np.lib.format.open_memmap(os.path.join(directory, "time.npy"), "w+", "float64", (n,))
+    flux = np.lib.format.open_memmap(os.path.join(directory, "flux.npy"), "w+", "float32", (n,))
+    t_next = 2454833.0
+    for start in range(0, n, 1_000_000):
+        m = min(1_000_000, n - start)
+        step = np.where(rng.random(m) < 1e-4, rng.uniform(1, 5, m), CADENCE_DAYS)  # occasional gaps
+        t = t_next + np.cumsum(step)
+        t_next = t[-1]
+        f = 1.0 + 2e-3 * np.sin(t / 7.3) + rng.normal(0, 1e-4, m)
+        f[np.abs(np.mod(t, 11.7) - 5.0) < 0.06] -= 5e-4
+        f[rng.random(m) < 1e-3] += rng.uniform(1e-3, 1e-2)
+        time[start:start + m], flux[start:start + m] = t, f
+    time.flush()
+    flux.flush()
+    return time, flux
+
+
+def check_boundaries(time, flux, window: float, chunk: int, points: int):
+    """Chunked and single-chunk results on the first `points` rows must match bit for bit."""
+    t, f = time[:points], flux[:points]
+    whole = next(iter_detrended(t, f, window_days=window, chunk_points=points))
+    for lo, hi, out, _, keep in iter_detrended(t, f, window_days=window, chunk_points=chunk):
+        if not (np.array_equal(out, whole[2][lo:hi]) and np.array_equal(keep, whole[4][lo:hi])):
+            raise SystemExit(f"chunked output differs from whole-series output in rows {lo}:{hi}")
+    return len(t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=5_000_000)
+    parser.add_argument("--chunk", type=int, default=DETREND_CHUNK_POINTS)
+    parser.add_argument("--window", type=float, default=DETREND_WINDOW_DAYS, help="rolling median window (days)")
+    parser.add_argument("--check-points", type=int, default=200_000, help="rows compared against one-chunk output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        time, flux = synthetic(directory, args.points)
+        checked = check_boundaries(time, flux, args.window, max(1000, args.chunk // 16), min(args.check_points, args.points))
+        print(f"chunk boundaries: {checked:,} rows identical to single-chunk output")
+
+        out = np.lib.format.open_memmap(os.path.join(directory, "detrended.npy"), "w+", "float32", (args.points,))
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        kept = 0
+        started = perf_counter()
+        for start, stop, f, _, keep in iter_detrended(time, flux, window_days=args.window, chunk_points=args.chunk):
+            out[start:stop] = np.where(keep, f, np.nan)
+            kept += int(keep.sum())
+        elapsed = perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"{args.points:,} points in {elapsed:.2f} s: {args.points / elapsed:,.0f} samples/s")
+    print(f"clipped {args.points - kept:,} points ({(args.points - kept) / args.points:.2%})")
+    print(f"peak RSS {rss_after:.0f} MB (before detrending {rss_before:.0f} MB; series on disk "
+          f"{args.points * 12 / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Build resized WebP/AVIF variants of every image under static/.
+
+Variants are written to static/_build/ named by content hash, and listed in
+static/_build/manifest.json for the runtime resolver in components/assets.py.
+Unchanged images are skipped, so this is cheap to run on every deploy. The
+app also builds missing variants on its own in the background at startup.
+
+  python tools/build_assets.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    os.chdir(ROOT)
+    from components.asset_pipeline import build_all
+
+    manifest = build_all()
+    for name, entry in sorted(manifest.items()):
+        original = os.path.getsize(os.path.join("static", name))
+        smallest = min(v["bytes"] for v in entry["variants"])
+        largest = max(v["bytes"] for v in entry["variants"] if v["width"] == entry["width"])
+        print(f"{name:42} {original / 1024:7.0f} KB -> {smallest / 1024:5.0f}-{largest / 1024:.0f} KB "
+              f"({len(entry['variants'])} variants)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Build the Explorer gallery catalog (data/planets.csv) from a NASA Exoplanet
+Archive export, keeping the hand-written featured entries (artwork and
+summaries) from the current catalog at the top:
+
+  # https://exoplanetarchive.ipac.caltech.edu -> Planetary Systems Composite Data -> CSV
+  python tools/import_catalog.py PSCompPars.csv
+
+--synthetic N writes N made-up planets instead, for exercising the gallery
+at catalog scale without a download:
+
+  python tools/import_catalog.py --synthetic 6000 --out /tmp/planets.csv
+  EXODETECT_CATALOG_PATH=/tmp/planets.csv streamlit run app.py
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from components.catalog import CATALOG_COLUMNS, CATALOG_PATH  # noqa: E402
+
+# archive column -> catalog column
+ARCHIVE_COLUMNS = {
+    "pl_name": "name",
+    "hostname": "host",
+    "disc_year": "disc_year",
+    "discoverymethod": "method",
+    "pl_rade": "radius_earth",
+    "pl_orbper": "period_days",
+    "pl_eqt": "teq_K",
+    "ra": "ra_deg",
+    "dec": "dec_deg",
+}
+
+
+def from_archive(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, comment="#", usecols=list(ARCHIVE_COLUMNS), low_memory=False)
+    return df.rename(columns=ARCHIVE_COLUMNS).sort_values("name", kind="stable")
+
+
+def synthetic(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    hosts = np.array([f"SYN-{i:05d}" for i in rng.integers(0, max(1, n // 2), n)])
+    letters = np.array(list("bcdefgh"))[rng.integers(0, 7, n)]
+    return pd.DataFrame({
+        "name": np.char.add(np.char.add(hosts, " "), letters),
+        "host": hosts,
+        "disc_year": rng.integers(1995, 2026, n),
+        "method": rng.choice(["Transit", "Radial Velocity", "Microlensing", "Imaging"], n, p=[0.75, 0.2, 0.03, 0.02]),
+        "radius_earth": np.round(rng.lognormal(1.0, 0.8, n), 2),
+        "period_days": np.round(rng.lognormal(2.5, 1.5, n), 4),
+        "teq_K": np.round(rng.uniform(150, 2500, n)),
+        "ra_deg": np.round(rng.uniform(0, 360, n), 5),
+        "dec_deg": np.round(np.degrees(np.arcsin(rng.uniform(-1, 1, n))), 5),
+    }).drop_duplicates("name")
+
+
+def merge_featured(planets: pd.DataFrame, current_path: str) -> pd.DataFrame:
+    """Put the current catalog's featured rows (those with artwork or a summary) first, replacing duplicates."""
+    if not os.path.exists(current_path):
+        return planets
+    current = pd.read_csv(current_path, dtype=str, keep_default_na=False)
+    featured = current[(current["image"] != "") | (current["summary"] != "")]
+    rest = planets[~planets["name"].isin(featured["name"])]
+    return pd.concat([featured, rest.astype(str).replace("nan", "")], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archive_csv", nargs="?", help="NASA Exoplanet Archive CSV export")
+    parser.add_argument("--synthetic", type=int, default=0, help="generate this many made-up planets instead")
+    parser.add_argument("--out", default=os.path.join(ROOT, CATALOG_PATH))
+    args = parser.parse_args()
+    if not args.archive_csv and not args.synthetic:
+        parser.error("give an archive CSV or --synthetic N")
+
+    planets = synthetic(args.synthetic) if args.synthetic else from_archive(args.archive_csv)
+    catalog = merge_featured(planets, os.path.join(ROOT, CATALOG_PATH))
+    for column in CATALOG_COLUMNS:
+        if column not in catalog:
+            catalog[column] = ""
+    tmp = f"{args.out}.tmp"
+    catalog[list(CATALOG_COLUMNS)].to_csv(tmp, index=False)
+    os.replace(tmp, args.out)
+    print(f"wrote {len(catalog):,} planets to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
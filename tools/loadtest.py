@@ -0,0 +1,136 @@
+"""
+End-to-end load test of the Data Scientist submit path.
+
+Drives N simulated Streamlit sessions (streamlit.testing AppTest, one per
+thread) against a backend URL, each filling the form and pressing "Check
+parameters" M times, and reports submit latency percentiles and throughput.
+By default a local mock backend is started in-process:
+
+  python tools/loadtest.py --sessions 20 --submits 10 --latency-ms 80
+  python tools/loadtest.py --url http://127.0.0.1:8000 --sessions 50 --distinct
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+PAGE = os.path.join(ROOT, "pages", "2_Data_Scientist.py")
+
+BASE_FORM = {
+    "P_days": 12.4, "t0": 2455000.5, "dur_hours": 3.1, "depth_val": 850.0, "Rp_Re": 2.1, "Teq_K": 480.0,
+    "S_earth": 9.0, "Teff_K": 5600.0, "logg": 4.45, "Rstar_Rsun": 0.95, "RA_deg": 291.0, "Dec_deg": 44.0,
+}
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _share_runtime_across_threads():
+    """
+    AppTest installs a mock Runtime singleton for each run and clears it when
+    the run ends, which races when sessions run on parallel threads. Fall
+    back to the last installed mock instead of raising.
+    """
+    from streamlit.runtime.runtime import Runtime
+
+    original = Runtime.instance.__func__
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" in last:
+            return last["runtime"]
+        return original(cls)
+
+    Runtime.instance = classmethod(instance)
+
+
+def run_session(session_id: int, url: str, submits: int, distinct: bool, latencies: list, failures: list, lock):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGE, default_timeout=120).run()
+    at.sidebar.text_input[0].set_value(url)
+    # Submitting reruns only the results fragment, whose tree no longer holds
+    # the form, so keep the widgets from the full run and drive those.
+    inputs = {key: at.number_input(key=key) for key in BASE_FORM}
+    button = next(b for b in at.button if b.label == "Check parameters")
+    rng = random.Random(session_id)
+    for _ in range(submits):
+        for key, value in BASE_FORM.items():
+            if distinct:
+                value = value * rng.uniform(0.9, 1.1)
+            inputs[key].set_value(value)
+        start = time.perf_counter()
+        button.click().run()
+        elapsed = time.perf_counter() - start
+        ok = not at.exception and not at.error
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                failures.append([e.value for e in at.error] or [e.value for e in at.exception])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="backend to hit; omitted = start tools/mock_backend.py in-process")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--submits", type=int, default=5, help="submits per session")
+    parser.add_argument("--distinct", action="store_true", help="jitter every payload so the cache can't answer")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mock backend latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="mock backend jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock backend error rate")
+    parser.add_argument("--port", type=int, default=0, help="mock backend port (0 = any free port)")
+    args = parser.parse_args()
+
+    # Keep the run's prediction cache away from the app's real one.
+    os.environ.setdefault("EXODETECT_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "loadtest.sqlite3"))
+    os.chdir(ROOT)
+
+    url = args.url
+    if not url:
+        from mock_backend import serve
+
+        server = serve(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                       error_rate=args.error_rate, background=True)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    _share_runtime_across_threads()
+    latencies, failures, lock = [], [], threading.Lock()
+    threads = [
+        threading.Thread(target=run_session, args=(i, url, args.submits, args.distinct, latencies, failures, lock))
+        for i in range(args.sessions)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"backend      {url}")
+    print(f"sessions     {args.sessions} x {args.submits} submits ({'distinct' if args.distinct else 'repeated'} payloads)")
+    print(f"submits      {len(latencies)} ({len(failures)} failed)")
+    print(f"throughput   {len(latencies) / wall:.1f} submits/s over {wall:.2f}s")
+    for q in (0.50, 0.95, 0.99):
+        print(f"p{int(q * 100):<11} {percentile(latencies, q) * 1000:.1f} ms")
+    if failures:
+        print(f"first failure: {failures[0]}")
+
+
+if __name__ == "__main__":
+    main()
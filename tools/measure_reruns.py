@@ -0,0 +1,195 @@
+"""
+Per-interaction cost of the Data Scientist page, measured the way a browser
+sees it: a real `streamlit run` server is started, a websocket client plays
+a fixed sequence of interactions, and for each one it reports the script
+execution time the server measured (summed over every full or fragment run
+the interaction caused), the round trip until the last run finished, and
+the bytes of ForwardMsgs sent back. A local mock backend is started for
+health probes and /predict:
+
+  python tools/measure_reruns.py
+  python tools/measure_reruns.py --repeat 20 --latency-ms 50
+
+The client does not advertise a message cache, so reported bytes are an
+upper bound of what a browser with a warm cache would receive. Usage stats
+are switched on in the server only because that is what makes it report
+per-run timings (page_profile messages, left out of the byte counts).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+BASE_FORM = {
+    "P_days": 12.4, "t0": 2455000.5, "dur_hours": 3.1, "depth_val": 850.0, "Rp_Re": 2.1, "Teq_K": 480.0,
+    "S_earth": 9.0, "Teff_K": 5600.0, "logg": 4.45, "Rstar_Rsun": 0.95, "RA_deg": 291.0, "Dec_deg": 44.0,
+}
+PAGE_NAME = "Data_Scientist"
+URL_KEY = "api_url"
+PING_KEY = "ping_backend"  # in the ds_health fragment; probes in the background
+SUBMIT_LABEL = "Check parameters"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+        "--browser.gatherUsageStats", "true", "--server.fileWatcherType", "none",
+    ]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+class Session:
+    """Minimal Streamlit websocket client that tracks widgets and their fragments."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.page_hash = ""
+        self.widgets = {}  # id -> (label, element type, fragment id)
+        self.values = {}  # id -> WidgetState
+
+    def find(self, label: str = None, key: str = None) -> str:
+        for wid, (wlabel, _, _) in self.widgets.items():
+            if (label is not None and wlabel == label) or (key is not None and wid.endswith(f"-{key}")):
+                return wid
+        raise KeyError(label or key)
+
+    def _track(self, msg):
+        if msg.HasField("new_session"):
+            for page in msg.new_session.app_pages:
+                if page.url_pathname.replace(" ", "_") == PAGE_NAME:
+                    self.page_hash = page.page_script_hash
+        if not msg.HasField("delta") or not msg.delta.HasField("new_element"):
+            return
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        proto = getattr(element, kind, None) if kind else None
+        if proto is not None and hasattr(proto, "id") and hasattr(proto, "label") and proto.id:
+            self.widgets[proto.id] = (proto.label, kind, msg.delta.fragment_id)
+
+    async def interact(self, states: list = (), fragment_id: str = "", quiet: float = 0.25):
+        """Send one rerun request; return (script seconds, round-trip seconds, bytes, messages)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        client = back.rerun_script
+        client.page_script_hash = self.page_hash
+        client.page_name = PAGE_NAME
+        client.fragment_id = fragment_id
+        triggers = {s.id for s in states if s.WhichOneof("value") == "trigger_value"}
+        for state in states:
+            if state.id not in triggers:
+                self.values[state.id] = state
+        client.widget_states.widgets.extend(list(self.values.values()) + [s for s in states if s.id in triggers])
+
+        started = time.perf_counter()
+        await self.ws.send(back.SerializeToString())
+        finished_at, exec_us, received, count = None, 0, 0, 0
+        while True:
+            timeout = 30 if finished_at is None else quiet
+            try:
+                raw = await asyncio.wait_for(self.ws.recv(), timeout)
+            except asyncio.TimeoutError:
+                break
+            msg = ForwardMsg.FromString(raw)
+            if msg.HasField("page_profile"):
+                exec_us += msg.page_profile.exec_time
+                continue
+            received += len(raw)
+            count += 1
+            self._track(msg)
+            if msg.HasField("script_finished"):
+                finished_at = time.perf_counter()
+        return exec_us / 1e6, (finished_at or time.perf_counter()) - started, received, count
+
+
+def _state(wid: str, **value):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    state = WidgetState(id=wid)
+    for field, v in value.items():
+        setattr(state, field, v)
+    return state
+
+
+async def _measure(port: int, backend_url: str, repeat: int) -> dict:
+    from websockets.asyncio.client import connect
+
+    ws = await connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=64 << 20)
+    session = Session(ws)
+    results = {}
+
+    def record(name, sample):
+        results.setdefault(name, []).append(sample)
+
+    record("page load", await session.interact())
+
+    url_id = session.find(key=URL_KEY)
+    url_fragment = session.widgets[url_id][2]
+    record("edit backend URL", await session.interact([_state(url_id, string_value=backend_url)], url_fragment))
+
+    form_states = [_state(session.find(key=k), double_value=v) for k, v in BASE_FORM.items()]
+    for i in range(repeat):
+        ping_id = session.find(key=PING_KEY)
+        record("ping backend", await session.interact([_state(ping_id, trigger_value=True)], session.widgets[ping_id][2]))
+
+        submit_id = session.find(label=SUBMIT_LABEL)
+        states = [_state(s.id, double_value=s.double_value + i * 0.01) for s in form_states]
+        record(
+            "submit form",
+            await session.interact(states + [_state(submit_id, trigger_value=True)], session.widgets[submit_id][2]),
+        )
+    await ws.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="ping/submit rounds to average over")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mock backend latency")
+    args = parser.parse_args()
+
+    from mock_backend import serve
+
+    backend = serve("127.0.0.1", 0, latency_ms=args.latency_ms, background=True)
+    backend_url = "http://127.0.0.1:%d" % backend.server_address[1]
+    port = _free_port()
+    server = _start_server(port)
+    try:
+        results = asyncio.run(_measure(port, backend_url, args.repeat))
+    finally:
+        server.terminate()
+        server.wait()
+        backend.shutdown()
+
+    print(f"{'interaction':<18}{'runs':>5}{'script ms':>11}{'round trip ms':>15}{'bytes':>9}{'msgs':>6}   (medians)")
+    for name, samples in results.items():
+        script, trip, size, msgs = (statistics.median(column) for column in zip(*samples))
+        print(f"{name:<18}{len(samples):>5}{script * 1000:>11.1f}{trip * 1000:>15.1f}{size:>9,.0f}{msgs:>6.0f}")
+
+if __name__ == "__main__":
+    main()
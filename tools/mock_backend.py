@@ -0,0 +1,118 @@
+"""
+Local stand-in for the Colab/Cloudflare model backend.
+
+Serves the same JSON contract as the real tunnel:
+  GET  /               -> {"status": "ok"}
+  POST /predict        -> {"probability", "threshold", "echo"}
+  POST /predict_batch  -> {"results": [...]}   (disable with --no-batch)
+
+with configurable latency and error injection, so the Data Scientist path
+can be exercised and benchmarked without a live tunnel:
+
+  python tools/mock_backend.py --port 8000 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def score(payload: dict) -> float:
+    """Deterministic toy score: favours small, temperate planets with a sane depth."""
+    radius = float(payload.get("radius_earth", 0.0) or 0.0)
+    teq = float(payload.get("teq_K", 0.0) or 0.0)
+    depth = float(payload.get("transit_depth_ppm", 0.0) or 0.0)
+    z = 2.0 - 0.35 * abs(radius - 1.5) - abs(teq - 290.0) / 250.0 + (0.5 if 50.0 < depth < 20000.0 else -0.5)
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real tunnel
+    latency_ms = 0.0
+    jitter_ms = 0.0
+    error_rate = 0.0
+    batch = True
+    threshold = 0.5
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _delay(self):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _echo(self, row: dict) -> dict:
+        return {"probability": score(row), "threshold": self.threshold, "echo": row}
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(422, {"detail": "invalid JSON"})
+            return
+
+        self._delay()
+        if random.random() < self.error_rate:
+            self._send(503, {"detail": "injected error"})
+            return
+
+        if self.path == "/predict":
+            self._send(200, self._echo(body))
+        elif self.path == "/predict_batch" and self.batch:
+            self._send(200, {"results": [self._echo(row) for row in body.get("rows", [])]})
+        else:
+            self._send(404, {"detail": "Not Found"})
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+          error_rate: float = 0.0, batch: bool = True, background: bool = False) -> ThreadingHTTPServer:
+    """Start the mock backend; with background=True it runs on a daemon thread and the server is returned."""
+    handler = type("ConfiguredMockBackendHandler", (MockBackendHandler,), {
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "error_rate": error_rate,
+        "batch": batch,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, name="mock-backend", daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="base latency added to every POST")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter around the base latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of POSTs answered with 503")
+    parser.add_argument("--no-batch", action="store_true", help="404 on /predict_batch, like the current backend")
+    args = parser.parse_args()
+    print(f"Mock backend on http://{args.host}:{args.port}")
+    serve(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, batch=not args.no_batch)
+
+
+if __name__ == "__main__":
+    main()
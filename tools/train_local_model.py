@@ -0,0 +1,142 @@
+"""
+Train the in-process "Local model" (components/predictors.py: LocalModel)
+from the NASA Exoplanet Archive KOI table and write its weights to
+models/local_model.npz (EXODETECT_LOCAL_MODEL), where the Data Scientist
+view's "Local model" predictor loads them:
+
+  # https://exoplanetarchive.ipac.caltech.edu -> KOI Table (Cumulative) -> CSV
+  python tools/train_local_model.py cumulative.csv
+  python tools/train_local_model.py cumulative.csv --hidden 0 --out /tmp/logistic.npz
+
+CONFIRMED and CANDIDATE KOIs are positives, FALSE POSITIVEs negatives.
+Features are the 12 /predict payload fields; heavy-tailed positive ones are
+log10-transformed. The model is one ReLU hidden layer (--hidden 0: plain
+logistic regression) trained full-batch with Adam. The decision threshold
+maximises F1 on a held-out fifth of the rows, whose scores are reported.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from components.backend import PAYLOAD_FIELDS  # noqa: E402
+from components.predictors import LOCAL_MODEL_PATH, LocalModel  # noqa: E402
+
+# KOI column -> payload field
+KOI_COLUMNS = {
+    "koi_period": "period_days",
+    "koi_time0bk": "t0",
+    "koi_duration": "duration_hours",
+    "koi_depth": "transit_depth_ppm",
+    "koi_prad": "radius_earth",
+    "koi_teq": "teq_K",
+    "koi_insol": "S_earth",
+    "koi_steff": "teff_star_K",
+    "koi_slogg": "logg_cgs",
+    "koi_srad": "rstar_rsun",
+    "ra": "ra_deg",
+    "dec": "dec_deg",
+}
+LOG_FIELDS = {"period_days", "duration_hours", "transit_depth_ppm", "radius_earth", "teq_K", "S_earth", "rstar_rsun"}
+POSITIVE = {"CONFIRMED", "CANDIDATE"}
+
+
+def load_koi(path: str):
+    """(X, y): payload-ordered features and 0/1 labels of the KOIs with every field present."""
+    koi = pd.read_csv(path, comment="#", usecols=[*KOI_COLUMNS, "koi_disposition"], low_memory=False)
+    koi = koi.rename(columns=KOI_COLUMNS).dropna()
+    X = koi[list(PAYLOAD_FIELDS)].to_numpy(dtype=np.float64)
+    y = koi["koi_disposition"].isin(POSITIVE).to_numpy(dtype=np.float64)
+    return X, y
+
+
+def _forward(layers, h):
+    activations = [h]
+    for i, (W, b) in enumerate(layers):
+        h = h @ W + b
+        if i < len(layers) - 1:
+            h = np.maximum(h, 0.0)
+        activations.append(h)
+    return activations
+
+
+def train(X, y, hidden: int = 16, epochs: int = 2000, lr: float = 0.01, l2: float = 1e-4, seed: int = 0):
+    """Layers [(W, b), ...] fitted to standardized X by full-batch Adam on the L2-regularized log loss."""
+    rng = np.random.default_rng(seed)
+    sizes = [X.shape[1], *([hidden] if hidden else []), 1]
+    layers = [
+        (rng.normal(0.0, np.sqrt(2.0 / n_in), (n_in, n_out)), np.zeros(n_out))
+        for n_in, n_out in zip(sizes[:-1], sizes[1:])
+    ]
+    params = [p for layer in layers for p in layer]
+    m = [np.zeros_like(p) for p in params]
+    v = [np.zeros_like(p) for p in params]
+    for step in range(1, epochs + 1):
+        activations = _forward(layers, X)
+        p = 1.0 / (1.0 + np.exp(-np.clip(activations[-1][:, 0], -500.0, 500.0)))
+        delta = ((p - y) / len(y))[:, None]
+        grads = []
+        for i in range(len(layers) - 1, -1, -1):
+            W, _ = layers[i]
+            grads[:0] = [activations[i].T @ delta + l2 * W, delta.sum(axis=0)]
+            if i:
+                delta = (delta @ W.T) * (activations[i] > 0)
+        for j, (param, grad) in enumerate(zip(params, grads)):
+            m[j] = 0.9 * m[j] + 0.1 * grad
+            v[j] = 0.999 * v[j] + 0.001 * grad * grad
+            param -= lr * (m[j] / (1 - 0.9 ** step)) / (np.sqrt(v[j] / (1 - 0.999 ** step)) + 1e-8)
+    return layers
+
+
+def best_threshold(p, y) -> float:
+    """The score cut with the highest F1."""
+    best, best_f1 = 0.5, -1.0
+    for cut in np.linspace(0.05, 0.95, 91):
+        predicted = p >= cut
+        tp = float(np.sum(predicted & (y == 1)))
+        f1 = 2 * tp / max(float(predicted.sum() + y.sum()), 1.0)
+        if f1 > best_f1:
+            best, best_f1 = float(cut), f1
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("koi_csv", help="NASA Exoplanet Archive cumulative KOI table (CSV)")
+    parser.add_argument("--out", default=os.path.join(ROOT, LOCAL_MODEL_PATH))
+    parser.add_argument("--hidden", type=int, default=16, help="hidden units (0: logistic regression)")
+    parser.add_argument("--epochs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    X, y = load_koi(args.koi_csv)
+    if len(y) < 50 or y.min() == y.max():
+        raise SystemExit(f"need both dispositions and at least 50 complete rows, got {len(y)}")
+    log_mask = np.array([field in LOG_FIELDS for field in PAYLOAD_FIELDS])
+    features = X.copy()
+    features[:, log_mask] = np.log10(np.clip(features[:, log_mask], 1e-12, None))
+    mean, scale = features.mean(axis=0), features.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    order = np.random.default_rng(args.seed).permutation(len(y))
+    held_out, fit = order[:len(y) // 5], order[len(y) // 5:]
+    layers = train((features[fit] - mean) / scale, y[fit], args.hidden, args.epochs, seed=args.seed)
+    model = LocalModel(mean, scale, log_mask, layers, threshold=0.5)
+    p = model.probabilities(X[held_out])
+    model.threshold = best_threshold(p, y[held_out])
+    accuracy = float(np.mean((p >= model.threshold) == (y[held_out] == 1)))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    model.save(args.out)
+    print(f"trained on {len(fit):,} KOIs ({y[fit].mean():.0%} positive), held out {len(held_out):,}")
+    print(f"held-out accuracy {accuracy:.1%} at threshold {model.threshold:.2f}")
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()